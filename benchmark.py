@@ -0,0 +1,331 @@
+import argparse
+import json
+import logging
+import sys
+import time
+
+import numpy as np
+
+from card_detector import CardDetector
+from synthetic_scenes import BACKGROUNDS, SyntheticSceneSource, compose_scene, load_templates
+
+# Karşılaştırılan CardDetector yapılandırmaları
+CONFIGURATIONS = {
+    "spatial": {},
+    "fft": {'match_engine': "fft"},
+    "pyramid1": {'pyramid_levels': 1},
+    "pyramid2": {'pyramid_levels': 2},
+    "glyph": {'detection_mode': "glyph"},
+    "localize": {'localize_cards': True},
+    "descriptor": {'localize_cards': True, 'use_descriptor_index': True},
+    "incremental": {'incremental': True},
+    "process": {'backend': "process"},
+    "gray": {'color_mode': "gray"},
+    "green": {'color_mode': "green"},
+    "noprefilter": {'template_prefilter': False},
+}
+
+# Seçim alanı boyutları (yükseklik, genişlik)
+SIZES = {
+    "small": (137, 298),
+    "medium": (240, 480),
+    "large": (360, 720),
+}
+
+LOCATION_TOLERANCE = 3  # Tespit konumunun gerçek konuma en fazla uzaklığı (piksel)
+
+
+def build_scenes(cards_folder, seed, scenes_per_combo, sizes, backgrounds, max_cards=6):
+    """Her boyut ve arka plan için tekrarlanabilir sahneler üret"""
+    templates = load_templates(cards_folder)
+    rng = np.random.default_rng(seed)
+    scenes = []
+    for size_name in sizes:
+        for background in backgrounds:
+            for _ in range(scenes_per_combo):
+                card_count = int(rng.integers(0, max_cards + 1))
+                frame, truth = compose_scene(templates, rng, SIZES[size_name], card_count, background)
+                scenes.append({'size': size_name, 'background': background, 'frame': frame, 'truth': truth})
+    return scenes
+
+
+def evaluate(detections, truth):
+    """Tespitleri gerçek değerlerle karşılaştır, (doğru, yanlış, kaçan) döndür.
+
+    Tamamen görünen kartların bulunması beklenir; kısmen kapalı bir kart
+    doğru konumda bulunursa doğru sayılır ama bulunmaması kaçan sayılmaz.
+    """
+    true_positives = 0
+    false_positives = 0
+    matched = set()
+    for card in detections:
+        x, y = card['location']
+        hit = None
+        for item in truth:
+            tx, ty = item['location']
+            if (item['name'] == card['name'] and item['name'] not in matched and
+                    abs(x - tx) <= LOCATION_TOLERANCE and abs(y - ty) <= LOCATION_TOLERANCE):
+                hit = item
+                break
+        if hit is None:
+            false_positives += 1
+        else:
+            true_positives += 1
+            matched.add(hit['name'])
+    false_negatives = sum(1 for item in truth if item['fully_visible'] and item['name'] not in matched)
+    return true_positives, false_positives, false_negatives
+
+
+def run_scene(card_detector, scene, max_passes):
+    """Aynı sahneyi, kart bulunmayan bir tarama olana kadar tekrar besle.
+
+    Uygulamada sahne birkaç frame boyunca ekranda kalır; her tarama eşiği
+    geçen tüm eşleşmeleri toplayıp NMS ile birleştirir ve bir sonraki
+    tarama yalnızca henüz bulunmamış kartları arar. Son olarak değişmeyen
+    bir frame daha verilerek atlama yolunun maliyeti ölçülür.
+    """
+    card_detector.reset_detection_state()
+    detections = []
+    scans = []
+    skips = []
+    for _ in range(max_passes + 1):
+        started = time.perf_counter()
+        cards = card_detector.detect_cards(scene['frame'])
+        latency = time.perf_counter() - started
+        stats = dict(card_detector.last_frame_stats)
+        if stats['skipped']:
+            skips.append(latency)
+            break
+        # Kart bulunmayan tarama frame'i referans yapar; sonraki tur atlama yolunu ölçer
+        scans.append((latency, stats['templates_evaluated']))
+        detections.extend(cards)
+    return detections, scans, skips
+
+
+def percentiles(values):
+    """p50/p95/p99 (milisaniye)"""
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None}
+    p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+    return {'p50': round(float(p50), 3), 'p95': round(float(p95), 3), 'p99': round(float(p99), 3)}
+
+
+def benchmark_configuration(name, options, scenes, args, thread_count=None):
+    """Bir yapılandırmayı tüm sahnelerde çalıştır ve özetle"""
+    card_detector = CardDetector(cards_folder=args.cards_folder, template_bank_path=args.template_bank,
+                                 thread_count=thread_count, **options)
+    try:
+        # Isınma: önbellekler (FFT spektrumları, worker'lar) ölçüme karışmasın
+        card_detector.detect_cards(scenes[0]['frame'])
+
+        scan_latencies = []
+        skip_latencies = []
+        templates_evaluated = []
+        passes = []
+        by_size = {}
+        totals = [0, 0, 0]
+        for scene in scenes:
+            detections, scans, skips = run_scene(card_detector, scene, args.max_passes)
+            scan_latencies.extend(latency for latency, _ in scans)
+            templates_evaluated.extend(count for _, count in scans)
+            skip_latencies.extend(skips)
+            passes.append(len(scans))
+            by_size.setdefault(scene['size'], []).extend(latency for latency, _ in scans)
+            for i, value in enumerate(evaluate(detections, scene['truth'])):
+                totals[i] += value
+    finally:
+        card_detector.shutdown()
+
+    true_positives, false_positives, false_negatives = totals
+    return {
+        'configuration': name,
+        'threads': thread_count,
+        'scanned_frames': len(scan_latencies),
+        'scan_latency_ms': percentiles(scan_latencies),
+        'skipped_frames': len(skip_latencies),
+        'skip_latency_ms': percentiles(skip_latencies),
+        'templates_evaluated': round(float(np.mean(templates_evaluated)), 1) if templates_evaluated else 0.0,
+        'passes_per_scene': round(float(np.mean(passes)), 2),
+        'p50_by_size_ms': {size: percentiles(values)['p50'] for size, values in by_size.items()},
+        'precision': round(true_positives / (true_positives + false_positives), 4) if true_positives + false_positives else 1.0,
+        'recall': round(true_positives / (true_positives + false_negatives), 4) if true_positives + false_negatives else 1.0,
+    }
+
+
+def run_stream(card_detector, args):
+    """SyntheticSceneSource frame'lerini sırayla besle, frame başına raporlanan kartları döndür.
+
+    Statik sahnelerin aksine frame'ler bir öncekinden türer; değişiklik
+    kontrolünün yeni bir kartı atlaması burada kart gecikmesi olarak görünür.
+    Yeni oyunda detektör RESET'e basılmış gibi sıfırlanır.
+    """
+    card_detector.reset_detection_state()
+    source = SyntheticSceneSource(cards_folder=args.cards_folder, seed=args.seed)
+    games = source.games
+    per_frame = []
+    for frame, _ in source.frames(args.stream_frames):
+        if source.games != games:
+            games = source.games
+            card_detector.reset_detection_state()
+        cards = card_detector.detect_cards(frame)
+        per_frame.append(sorted((card['name'], int(card['location'][0]), int(card['location'][1]))
+                                for card in cards))
+    return per_frame
+
+
+def validate_color_mode(mode, scenes, args):
+    """Tek kanallı modun renkli (bgr) modla aynı kararları verip vermediğini karşılaştır.
+
+    Karar: sahnede raporlanan (kart adı, konum) kümesi; ayrıca sentetik frame
+    akışında her frame'de raporlanan kartlar. Farklı sahne/frame'lerin
+    listesini ve her modun tarama süreleriyle doğruluk sayılarını döndürür.
+    """
+    decisions = {}
+    stream_decisions = {}
+    summary = {}
+    for color_mode in ("bgr", mode):
+        card_detector = CardDetector(cards_folder=args.cards_folder, template_bank_path=args.template_bank,
+                                     color_mode=color_mode)
+        per_scene = []
+        latencies = []
+        totals = [0, 0, 0]
+        try:
+            for scene in scenes:
+                detections, scans, _ = run_scene(card_detector, scene, args.max_passes)
+                per_scene.append(sorted((card['name'], int(card['location'][0]), int(card['location'][1]))
+                                        for card in detections))
+                latencies.extend(latency for latency, _ in scans)
+                for i, value in enumerate(evaluate(detections, scene['truth'])):
+                    totals[i] += value
+            stream_decisions[color_mode] = run_stream(card_detector, args)
+        finally:
+            card_detector.shutdown()
+        decisions[color_mode] = per_scene
+        summary[color_mode] = {'scan_latency_ms': percentiles(latencies), 'tp_fp_fn': totals,
+                               'stream_cards': sum(len(cards) for cards in stream_decisions[color_mode])}
+
+    mismatches = [
+        {'scene': index, 'size': scene['size'], 'background': scene['background'],
+         'bgr': decisions["bgr"][index], mode: decisions[mode][index]}
+        for index, scene in enumerate(scenes)
+        if decisions["bgr"][index] != decisions[mode][index]
+    ]
+    mismatches.extend(
+        {'frame': index, 'bgr': bgr_cards, mode: mode_cards}
+        for index, (bgr_cards, mode_cards) in enumerate(zip(stream_decisions["bgr"], stream_decisions[mode]))
+        if bgr_cards != mode_cards
+    )
+    return mismatches, summary
+
+
+def format_validation(mode, scenes, mismatches, summary):
+    """Doğrulama sonucunu konsol metni olarak biçimlendir"""
+    lines = [f"Renk modu doğrulaması: bgr - {mode}: {len(scenes)} sahne + sentetik frame akışı, "
+             f"{len(mismatches)} farklı karar"]
+    for color_mode, values in summary.items():
+        scan = values['scan_latency_ms']
+        true_positives, false_positives, false_negatives = values['tp_fp_fn']
+        lines.append(f"  {color_mode:<6} tarama p50 {scan['p50'] or 0:.2f} ms, p95 {scan['p95'] or 0:.2f} ms - "
+                     f"doğru {true_positives}, yanlış {false_positives}, kaçan {false_negatives} - "
+                     f"akışta {values['stream_cards']} kart")
+    for mismatch in mismatches:
+        if 'frame' in mismatch:
+            lines.append(f"  Akış frame {mismatch['frame']}: bgr={mismatch['bgr']} {mode}={mismatch[mode]}")
+        else:
+            lines.append(f"  Sahne {mismatch['scene']} ({mismatch['size']}/{mismatch['background']}): "
+                         f"bgr={mismatch['bgr']} {mode}={mismatch[mode]}")
+    return "\n".join(lines)
+
+
+def format_table(results):
+    """Sonuçları konsol tablosu olarak biçimlendir"""
+    header = (f"{'Yapılandırma':<14}{'Thread':>7}{'Tarama':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+              f"{'Atlama':>8}{'Atl.p50':>9}{'Şablon':>8}{'Geçiş':>7}{'Kesinlik':>10}{'Duyarlılık':>11}")
+    lines = [header, "-" * len(header)]
+    for result in results:
+        scan = result['scan_latency_ms']
+        skip = result['skip_latency_ms']
+        lines.append(
+            f"{result['configuration']:<14}{str(result['threads'] or '-'):>7}{result['scanned_frames']:>8}"
+            f"{scan['p50'] or 0:>9.2f}{scan['p95'] or 0:>9.2f}{scan['p99'] or 0:>9.2f}"
+            f"{result['skipped_frames']:>8}{skip['p50'] or 0:>9.3f}{result['templates_evaluated']:>8.1f}"
+            f"{result['passes_per_scene']:>7.2f}{result['precision']:>10.3f}{result['recall']:>11.3f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik sahnelerle CardDetector performans karşılaştırması")
+    parser.add_argument("--configs", default=",".join(CONFIGURATIONS),
+                        help=f"Virgülle ayrılmış yapılandırmalar (varsayılan: hepsi: {', '.join(CONFIGURATIONS)})")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="Seçim alanı boyutları: small, medium, large")
+    parser.add_argument("--backgrounds", default=",".join(BACKGROUNDS), help="Arka planlar")
+    parser.add_argument("--scenes", type=int, default=3, help="Boyut ve arka plan başına sahne sayısı")
+    parser.add_argument("--threads", default="1,2,4,8,13",
+                        help="Thread ölçekleme testi için thread sayıları (boş: test yapılmaz)")
+    parser.add_argument("--scaling-config", default="spatial", help="Thread ölçekleme testinin yapılandırması")
+    parser.add_argument("--max-passes", type=int, default=13, help="Sahne başına en fazla tarama")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cards-folder", default="CROPPEDCARDS")
+    parser.add_argument("--template-bank", default="template_bank.bin")
+    parser.add_argument("--json", metavar="DOSYA", help="Sonuçları JSON olarak da kaydet")
+    parser.add_argument("--validate-color-mode", metavar="MOD", choices=["gray", "blue", "green", "red"],
+                        help="Karşılaştırma yerine tek kanallı modun bgr ile aynı kararları verdiğini doğrula "
+                             "(fark varsa çıkış kodu 1)")
+    parser.add_argument("--stream-frames", type=int, default=150,
+                        help="Renk modu doğrulamasında beslenen sentetik akış frame sayısı")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s',
+                        stream=sys.stderr)
+
+    configs = [name.strip() for name in args.configs.split(",") if name.strip()]
+    unknown = [name for name in configs if name not in CONFIGURATIONS]
+    if unknown:
+        print(f"Bilinmeyen yapılandırma: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    scenes = build_scenes(args.cards_folder, args.seed, args.scenes,
+                          [size.strip() for size in args.sizes.split(",") if size.strip()],
+                          [kind.strip() for kind in args.backgrounds.split(",") if kind.strip()])
+    card_total = sum(len(scene['truth']) for scene in scenes)
+    print(f"{len(scenes)} sahne, {card_total} kart (tohum: {args.seed})")
+
+    if args.validate_color_mode:
+        mismatches, summary = validate_color_mode(args.validate_color_mode, scenes, args)
+        print(format_validation(args.validate_color_mode, scenes, mismatches, summary))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({'seed': args.seed, 'scenes': len(scenes), 'mode': args.validate_color_mode,
+                           'summary': summary, 'mismatches': mismatches}, f, indent=2, ensure_ascii=False)
+        return 1 if mismatches else 0
+
+    results = []
+    for name in configs:
+        print(f"Çalışıyor: {name}", file=sys.stderr)
+        results.append(benchmark_configuration(name, CONFIGURATIONS[name], scenes, args))
+    print()
+    print(format_table(results))
+
+    scaling = []
+    thread_counts = [int(value) for value in args.threads.split(",") if value.strip()]
+    if thread_counts:
+        for thread_count in thread_counts:
+            print(f"Çalışıyor: {args.scaling_config} ({thread_count} thread)", file=sys.stderr)
+            scaling.append(benchmark_configuration(args.scaling_config, CONFIGURATIONS[args.scaling_config],
+                                                   scenes, args, thread_count))
+        print()
+        print("Thread ölçekleme:")
+        print(format_table(scaling))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'seed': args.seed, 'scenes': len(scenes), 'results': results, 'thread_scaling': scaling},
+                      f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
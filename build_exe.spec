@@ -24,6 +24,8 @@ a = Analysis(
         'time',
         'threading',
         'multiprocessing',
+        'multiprocessing.shared_memory',
+        'concurrent.futures',
     ],
     hookspath=[],
     hooksconfig={},
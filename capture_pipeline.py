@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+from collections import deque
+
+from mss import mss
+
+from frame_capture import grab_regions_bgr
+
+
+class CapturePipeline:
+    """Ekran yakalama ve kart tespitini Tk ana döngüsünden ayıran üretici/tüketici hattı.
+
+    Yakalama thread'i frame'leri sınırlı bir halka tampona yazar. Tespit
+    thread'i her seferinde en son frame'i alır ve bekleyen eski frame'leri
+    atar. Sonuçlar thread güvenli bir kuyruğa konur; Tk tarafı kuyruğu
+    root.after ile boşaltır. Böylece frame N+1 yakalanırken frame N işlenir.
+
+    scheduler (CaptureScheduler) verilirse yakalama aralığı sahne hareketine
+    ve CPU bütçesine göre ayarlanır; verilmezse sabit capture_interval kullanılır.
+
+    Birden fazla masa add_region ile eklenir: tüm bölgeler tek mss
+    yakalamasıyla alınır, her bölge kendi detektörüyle (aynı worker
+    havuzunu paylaşarak) sırayla işlenir ve sonuçlar 'region' adıyla gelir.
+    """
+
+    def __init__(self, card_detector, selection_coords, capture_interval=0.05, buffer_size=2, metrics=None,
+                 scheduler=None, region_name=None):
+        self.card_detector = card_detector
+        # Aşama süreleri detektörle aynı kayda yazılır
+        self.metrics = metrics if metrics is not None else card_detector.metrics
+        self.selection_coords = selection_coords
+        # (ad, detektör, seçim) listesi; thread'ler okurken değişmesin diye her değişiklikte yenisi atanır
+        self.regions = [(region_name, card_detector, selection_coords)]
+        self.capture_interval = capture_interval  # İki yakalama arasındaki minimum süre (saniye)
+        self.scheduler = scheduler
+        self.frames = deque(maxlen=buffer_size)  # Halka tampon: dolunca en eski frame düşer
+        self.frame_condition = threading.Condition()
+        self.results = queue.Queue()
+        self.stop_event = threading.Event()
+        self.capture_thread = None
+        self.detection_thread = None
+        self.frame_counter = 0
+        self.dropped_frames = 0
+
+    def start(self):
+        """Yakalama ve tespit thread'lerini başlat"""
+        self.stop_event.clear()
+        self.capture_thread = threading.Thread(target=self._capture_loop, name="CaptureThread", daemon=True)
+        self.detection_thread = threading.Thread(target=self._detection_loop, name="DetectionThread", daemon=True)
+        self.capture_thread.start()
+        self.detection_thread.start()
+
+    def stop(self, timeout=1.0):
+        """Thread'leri durdur ve bitmelerini bekle"""
+        self.stop_event.set()
+        with self.frame_condition:
+            self.frame_condition.notify_all()
+        for thread in (self.capture_thread, self.detection_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+        self.capture_thread = None
+        self.detection_thread = None
+
+    def is_running(self):
+        """Hat çalışıyor mu?"""
+        return self.capture_thread is not None and not self.stop_event.is_set()
+
+    def set_selection(self, selection_coords, region_name=None):
+        """Bölgenin (varsayılan: ilk bölge) yakalanacak alanını değiştir (bir sonraki frame'den itibaren geçerli)"""
+        regions = list(self.regions)
+        index = 0 if region_name is None else [region[0] for region in regions].index(region_name)
+        name, card_detector, _ = regions[index]
+        regions[index] = (name, card_detector, selection_coords)
+        if index == 0:
+            self.selection_coords = selection_coords
+        self.regions = regions
+
+    def add_region(self, region_name, card_detector, selection_coords):
+        """Yeni bir masa/bölge ekle (bir sonraki frame'den itibaren yakalanır)"""
+        self.regions = self.regions + [(region_name, card_detector, selection_coords)]
+
+    def remove_region(self, region_name):
+        """Bölgeyi yakalamadan çıkar (ilk bölge çıkarılamaz)"""
+        self.regions = self.regions[:1] + [region for region in self.regions[1:] if region[0] != region_name]
+
+    def _grab(self, sct, regions):
+        """Tüm bölgeleri tek yakalamayla al, bölge sırasıyla BGR ndarray listesi döndür"""
+        return grab_regions_bgr(sct, [region[2] for region in regions], self.metrics)
+
+    def _capture_loop(self):
+        """Üretici: frame'leri yakalayıp halka tampona yaz"""
+        # mss örneği thread'e özeldir, bu yüzden thread içinde oluşturulur
+        with mss() as sct:
+            while not self.stop_event.is_set():
+                started = time.perf_counter()
+                try:
+                    regions = self.regions
+                    frames = self._grab(sct, regions)
+                    self.frame_counter += 1
+                    with self.frame_condition:
+                        if len(self.frames) == self.frames.maxlen:
+                            self.dropped_frames += 1
+                        # Yakalama anı perf_counter ile saklanır (yakalamadan UI'a gecikme için)
+                        self.frames.append((self.frame_counter, time.perf_counter(), regions, frames))
+                        self.frame_condition.notify()
+                except Exception as e:
+                    self.results.put({'error': f"Yakalama hatası: {str(e)}"})
+
+                interval = self.scheduler.next_interval() if self.scheduler is not None else self.capture_interval
+                self.metrics.record("capture_interval", interval)
+                remaining = interval - (time.perf_counter() - started)
+                if remaining > 0:
+                    self.stop_event.wait(remaining)
+
+    def _detection_loop(self):
+        """Tüketici: en son frame'i al, eskileri at, tespit yap"""
+        while not self.stop_event.is_set():
+            with self.frame_condition:
+                while not self.frames and not self.stop_event.is_set():
+                    self.frame_condition.wait()
+                if self.stop_event.is_set():
+                    break
+                frame_id, captured_at, regions, frames = self.frames.pop()
+                stale = len(self.frames)
+                self.frames.clear()
+            self.dropped_frames += stale
+
+            started = time.perf_counter()
+            changed = False
+            # Bölgeler sırayla işlenir; her detect_cards şablonları zaten ortak havuza dağıtır
+            for (region_name, card_detector, _), frame in zip(regions, frames):
+                detected_cards = card_detector.detect_cards(frame)
+                changed = changed or not card_detector.last_frame_stats['skipped']
+                self.results.put({
+                    'frame_id': frame_id,
+                    'captured_at': captured_at,
+                    'region': region_name,
+                    'cards': detected_cards,
+                    'dropped': stale
+                })
+            if self.scheduler is not None:
+                # Atlanan (değişmeyen) frame'ler zamanlayıcıyı yavaşlatır, taranan frame'ler hızlandırır
+                self.scheduler.observe(changed, time.perf_counter() - started)
+
+    def poll_results(self):
+        """Kuyruktaki tüm sonuçları bloklamadan döndür (Tk thread'inden çağrılır)"""
+        items = []
+        while True:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                return items
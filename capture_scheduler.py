@@ -0,0 +1,68 @@
+import os
+import threading
+import time
+
+
+class CaptureScheduler:
+    """Sahne hareketine göre yakalama aralığını ayarlayan zamanlayıcı.
+
+    Art arda değişmeyen frame'lerde aralık her frame'de backoff katıyla
+    uzar ve idle_interval'da durur; bir değişiklik görülünce aralık hemen
+    sürdürülebilir en kısa değere iner. Sürdürülebilir aralık: min_interval,
+    son tespit süreleri (tespitten hızlı yakalamak frame atmaktır) ve CPU
+    bütçesinin izin verdiği aralığın en büyüğüdür. CPU bütçesi, sürecin
+    frame başına harcadığı CPU süresinden hesaplanır ve boşta da uygulanır.
+    """
+
+    def __init__(self, min_interval=0.02, idle_interval=0.25, cpu_budget=50.0, idle_after=3,
+                 backoff=1.5, smoothing=0.3, cpu_count=None):
+        self.min_interval = min_interval  # Aktifken en kısa aralık (saniye)
+        self.idle_interval = idle_interval  # Boşta en uzun aralık; tepki süresinin üst sınırı
+        self.cpu_budget = cpu_budget  # Tüm çekirdeklerin yüzdesi olarak izin verilen CPU
+        self.idle_after = idle_after  # Bu kadar değişmeyen frame'den sonra yavaşlamaya başla
+        self.backoff = backoff
+        self.smoothing = smoothing  # Üstel ortalama katsayısı
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.interval = min_interval
+        self.unchanged_frames = 0
+        self.detect_time = 0.0  # Frame başına tespit süresi (üstel ortalama)
+        self.cpu_per_frame = 0.0  # Frame başına süreç CPU süresi (üstel ortalama)
+        self.last_cpu_time = time.process_time()
+        self.lock = threading.Lock()
+
+    @property
+    def active(self):
+        """Sahne hareketli mi (yavaşlama başlamadı mı)"""
+        return self.unchanged_frames < self.idle_after
+
+    def _average(self, current, sample):
+        return sample if current == 0.0 else current + self.smoothing * (sample - current)
+
+    def cpu_floor(self):
+        """CPU bütçesini aşmamak için gereken en kısa aralık"""
+        return self.cpu_per_frame / (self.cpu_budget / 100.0 * self.cpu_count)
+
+    def sustainable_interval(self):
+        """Aktifken kullanılacak aralık"""
+        return max(self.min_interval, self.detect_time, self.cpu_floor())
+
+    def observe(self, changed, detect_seconds):
+        """Tespit thread'i her frame'den sonra çağırır: frame değişti mi, tespit ne kadar sürdü"""
+        with self.lock:
+            self.detect_time = self._average(self.detect_time, detect_seconds)
+            if changed:
+                self.unchanged_frames = 0
+                self.interval = self.sustainable_interval()
+            else:
+                self.unchanged_frames += 1
+                if self.unchanged_frames >= self.idle_after:
+                    self.interval = min(max(self.interval * self.backoff, self.sustainable_interval()),
+                                        max(self.idle_interval, self.sustainable_interval()))
+
+    def next_interval(self):
+        """Yakalama thread'i her yakalamadan sonra çağırır; bir sonraki yakalamaya kadar beklenecek süre"""
+        with self.lock:
+            cpu_time = time.process_time()
+            self.cpu_per_frame = self._average(self.cpu_per_frame, cpu_time - self.last_cpu_time)
+            self.last_cpu_time = cpu_time
+            return max(self.interval, self.cpu_floor())
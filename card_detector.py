@@ -1,3 +1,4 @@
+import copy
 import cv2
 import numpy as np
 import os
@@ -7,46 +8,202 @@ import threading
 import time
 import psutil
 import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from fft_matcher import FFTMatcher
+from glyph_matcher import GlyphMatcher
+from descriptor_index import DescriptorIndex
+from process_backend import ProcessMatchingBackend
+from tile_tracker import TileChangeTracker
+from metrics import MetricsRegistry
+from peak_suppression import find_peaks, non_max_suppression, overlap_ratio
+from hot_zones import HotZoneMap
+from color_space import COLOR_MODES, to_match_space, is_red_suit
+from patch_cache import PatchCache, patch_fingerprint
+from template_prefilter import MIN_MATCH_THRESHOLD, TemplatePrefilter
+from descriptor_index import DESCRIPTOR_SIZE
+import template_bank
+import log_pipeline
 
 class CardDetector:
-    def __init__(self, cards_folder="CROPPEDCARDS"):
+    def __init__(self, cards_folder="CROPPEDCARDS", match_engine="spatial", pyramid_levels=0,
+                 pyramid_coarse_threshold=0.5, detection_mode="card",
+                 localize_cards=False, card_brightness=200, use_descriptor_index=False,
+                 descriptor_min_similarity=0.8, descriptor_margin=0.1, cpu_sample_interval=1.0,
+                 backend="thread", process_workers=None, incremental=False, tile_size=32,
+                 change_threshold=5.0, template_bank_path="template_bank.bin", thread_count=None,
+                 metrics=None, nms_overlap=0.3, hot_zones_path=None, full_scan_interval=10,
+                 hot_zone_margin=8, patch_cache_size=256, color_mode="bgr", template_scale=1.0,
+                 match_threshold=0.99, template_prefilter=True):
         self.cards_folder = cards_folder
+        # Ölçek kalibrasyonu: şablonlar ekrandaki kart boyutuna bir kez ölçeklenir (1.0 = CROPPEDCARDS boyutu)
+        self.template_scale = float(template_scale)
+        # Eşleşme eşiği; ölçeklenmiş şablonlar birebir eşleşmediği için kalibrasyon daha düşük önerebilir
+        self.match_threshold = match_threshold
+        self.match_engine = match_engine  # "spatial" (cv2.matchTemplate) veya "fft" (toplu frekans uzayı)
+        # "thread": kalıcı thread havuzu, "process": paylaşılan bellekli süreç havuzu (8+ çekirdek için)
+        self.backend = backend
+        self.process_workers = process_workers
+        self.process_backend = None
+        # "card": 52 tam şablon, "glyph": sadece köşe indeksi (rank + suit glifleri)
+        self.detection_mode = detection_mode
+        # Eşleştirme renk uzayı: "bgr" veya tek kanal ("gray", "blue", "green", "red");
+        # tek kanalda kırmızı/siyah ayrımı ayrıca ucuz bir renk kontrolüyle yapılır
+        if color_mode not in COLOR_MODES:
+            raise ValueError(f"Bilinmeyen renk modu: {color_mode} (seçenekler: {', '.join(COLOR_MODES)})")
+        self.color_mode = "bgr" if detection_mode == "glyph" else color_mode
+        self.color_templates = {}  # Renk kontrolü ve glif modu için orijinal BGR şablonlar
+        self.suit_is_red = {}  # Kart adı -> şablonun mürekkebi kırmızı mı
+        # Ön filtre: bölgede yeterli kırmızı/siyah mürekkep yoksa o şablonlar hiç eşleştirilmez
+        self.use_template_prefilter = template_prefilter
+        self.prefilter = None
+        # Lokalizasyon: önce kart şeklindeki parlak bölgeler bulunur, sadece onlar sınıflandırılır
+        self.localize_cards = localize_cards
+        self.card_brightness = card_brightness  # Kart yüzeyi sayılacak minimum parlaklık (tüm kanallarda)
+        # Tanımlayıcı indeksi: lokalize bölgeler önce en yakın komşu ile sınıflandırılır
+        self.use_descriptor_index = use_descriptor_index
+        self.descriptor_min_similarity = descriptor_min_similarity
+        self.descriptor_margin = descriptor_margin  # En iyi iki aday arasındaki minimum fark
+        self.region_margin = 3  # Lokalize bölgelerin etrafındaki pay
+        # Pyramid araması: 0 = kapalı, 1 = 1/2 çözünürlük, 2 = 1/4 çözünürlük
+        self.pyramid_levels = max(0, int(pyramid_levels))
+        self.pyramid_coarse_threshold = pyramid_coarse_threshold  # Kaba seviyede aday eşiği
         self.card_templates = {}
+        self.template_pyramids = {}  # Kart adı -> [tam boyut, 1/2, 1/4, ...]
+        # Derlenmiş şablon bankası (None ise PNG'ler her açılışta çözülür)
+        self.template_bank_path = template_bank_path
+        self.template_bank = None
+        self.fft_matcher = None
+        self.glyph_matcher = None
+        self.descriptor_index = None
         self.detected_cards = set()  # Tespit edilen kartları sakla
         self.previous_frame = None  # Önceki frame'i sakla
+        self.change_threshold = change_threshold  # Frame değişikliği eşiği (kanal başına ortalama fark)
+        # Artımlı mod: korelasyon haritaları saklanır, sadece değişen karolar yeniden hesaplanır
+        self.incremental = incremental
+        self.tile_tracker = TileChangeTracker(tile_size, change_threshold)
+        self.correlation_maps = {}  # Kart adı -> son korelasyon haritası
+        self.correlation_frame = None  # Haritaların hesaplandığı frame
+        # Şablonlar arası bastırma: bu orandan fazla örtüşen adaylardan sadece en güvenilir olan kalır
+        self.nms_overlap = nms_overlap
+        self.template_shapes = {}  # Kart adı -> (yükseklik, genişlik)
+        # Tespit edilen kartların kutuları ve o anki bölge parmak izleri: görüntüsü
+        # değişmemiş bir bölgede başka bir kart (ör. aynı rakamın diğer rengi) raporlanmaz
+        self.detected_regions = []
+        # Sıcak bölgeler: geçmiş tespitlerin olduğu yerler önce taranır (None = kapalı)
+        self.hot_zones = HotZoneMap(hot_zones_path) if hot_zones_path else None
+        self.full_scan_interval = full_scan_interval  # Bu kadar bölge taramasından sonra tam tarama
+        self.hot_zone_margin = hot_zone_margin  # Bölgelerin etrafındaki pay (kart kayması için)
+        self.frames_since_full_scan = 0
+        # Aşama süreleri (değişiklik kontrolü, şablon başına matchTemplate, birleştirme...)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        # Bölge parmak izi önbelleği: değişmeyen aday bölgeler yeniden eşleştirilmez (0 = kapalı)
+        self.patch_cache = PatchCache(patch_cache_size, metrics=self.metrics) if patch_cache_size else None
+        # Son detect_cards çağrısının özeti (atlandı mı, kaç şablon değerlendirildi, kaç thread)
+        self.last_frame_stats = {'skipped': False, 'templates_evaluated': 0, 'thread_count': 0, 'detected': 0,
+                                 'scan_mode': None}
         self.setup_logging()
         self.load_card_templates()
+        self.template_shapes = {name: template.shape[:2] for name, template in self.card_templates.items()}
+        self.color_templates = self.card_templates
+        if self.color_mode != "bgr":
+            self.convert_templates()
+        # Artımlı modda elenen şablonların haritaları bayatlayacağı için ön filtre kullanılmaz;
+        # 0.99'dan düşük eşikte (ölçeklenmiş banka) filtre gerçek eşleşmeleri eleyebilir
+        if (self.use_template_prefilter and self.card_templates and self.detection_mode == "card" and
+                not self.incremental and self.match_threshold >= MIN_MATCH_THRESHOLD):
+            self.prefilter = TemplatePrefilter(self.color_templates)
+        if self.match_engine == "fft" and self.card_templates:
+            self.fft_matcher = FFTMatcher(self.card_templates)
+        if self.detection_mode == "glyph" and self.card_templates:
+            ink_maps = self.template_bank.ink_maps() if self.template_bank is not None else None
+            self.glyph_matcher = GlyphMatcher(self.color_templates, ink_maps=ink_maps)
+            self.logger.info(f"Glif modu: {len(self.glyph_matcher.rank_glyphs)} rank + {len(self.glyph_matcher.suit_glyphs)} suit glifi hazırlandı")
+        if self.use_descriptor_index and self.card_templates:
+            # Bankadaki tanımlayıcılar BGR şablonlardan hesaplanmıştır
+            descriptors = self.template_bank.descriptors() if self.template_bank is not None and self.color_mode == "bgr" else None
+            self.descriptor_index = DescriptorIndex(self.card_templates, descriptors=descriptors)
         
         # Thread'ler için lock
         self.detection_lock = threading.Lock()
         self.detected_cards = set()  # Normal set
+        # Bölge taramasında her bölge en az en büyük şablon kadar olmalı
+        self.template_size = (max((shape[0] for shape in self.template_shapes.values()), default=0),
+                              max((shape[1] for shape in self.template_shapes.values()), default=0))
         
         # Adaptif thread sistemi
         self.cpu_count = multiprocessing.cpu_count()
-        self.optimal_thread_count = self.get_optimal_thread_count()
+        self.max_thread_count = 13
+        # Sabit thread sayısı verilirse CPU'ya göre adaptasyon kapanır (ölçüm ve karşılaştırma için)
+        self.fixed_thread_count = min(max(1, int(thread_count)), self.max_thread_count) if thread_count else None
+        self.optimal_thread_count = self.fixed_thread_count or self.get_optimal_thread_count(cpu_usage=0.0)
         self.logger.info(f"CPU Çekirdek Sayısı: {self.cpu_count}, Optimal Thread Sayısı: {self.optimal_thread_count}")
         
+        # Kalıcı worker havuzu: thread'ler bir kez oluşturulur, her frame'de yeniden kullanılır
+        self.executor = ThreadPoolExecutor(max_workers=self.max_thread_count, thread_name_prefix="CardWorker")
+        # Çoklu masa: for_region ile oluşturulan detektörler şablonları ve havuzu bu detektörden paylaşır
+        self.shared_owner = None
+        self.region_detectors = []
+        
+        # CPU kullanımı arka planda örneklenir, tespit döngüsü beklemez
+        self.cpu_sample_interval = cpu_sample_interval
+        self.cpu_usage = 0.0
+        self.sampler_stop_event = threading.Event()
+        self.cpu_sampler_thread = threading.Thread(target=self._cpu_sampler_loop, name="CpuSampler", daemon=True)
+        self.cpu_sampler_thread.start()
+        
+        if self.backend == "process" and self.card_templates:
+            bank_path = self.template_bank.path if self.template_bank is not None else None
+            self.process_backend = ProcessMatchingBackend(self.cards_folder, self.process_workers, bank_path,
+                                                          self.color_mode, self.template_scale)
+            self.logger.info(f"Süreç arka ucu: {self.process_backend.workers} worker süreci")
+        
     def setup_logging(self):
-        """Logging ayarları"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('card_detector.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """Logging ayarları - kayıtlar kuyruğa konur, arka planda dönen dosyaya yazılır"""
+        log_pipeline.configure_logging('card_detector.log')
         self.logger = logging.getLogger(__name__)
+        # Frame başına tekrarlanan kayıtlar birkaç saniyede bir özet olarak yazılır
+        log_pipeline.install_rate_limit(self.logger)
+        
+    def build_pyramid(self, image, levels=None):
+        """Görüntüyü her seviyede yarıya küçülterek pyramid oluştur (seviye 0 = orijinal)"""
+        if levels is None:
+            levels = self.pyramid_levels
+        return template_bank.build_pyramid(image, levels)
+    
+    def load_template_bank(self):
+        """Derlenmiş şablon bankasını mmap ile aç; eskiyse yeniden derle"""
+        params = {
+            'pyramid_levels': self.pyramid_levels,
+            'descriptor_size': list(DESCRIPTOR_SIZE)
+        }
+        # Her ölçeğin kendi bankası vardır; ölçekler arasında geçiş yeniden derleme gerektirmez
+        bank_path = template_bank.scaled_bank_path(self.template_bank_path, self.template_scale)
+        if self.template_scale != 1.0:
+            params['scale'] = self.template_scale
+        bank, rebuilt = template_bank.load_or_build(bank_path, self.cards_folder, params, self.logger)
+        if bank is None or not bank.card_names:
+            return False
         
+        self.template_bank = bank
+        # Şablonlar değişti; eski şablonlarla bulunan bölge sonuçları geçersiz
+        if self.patch_cache is not None:
+            self.patch_cache.clear()
+        self.card_templates = bank.templates()
+        self.template_pyramids = bank.pyramids()
+        action = "derlendi" if rebuilt else "açıldı"
+        self.logger.info(f"Şablon bankası {action}: {bank_path} ({len(self.card_templates)} kart, pyramid seviyesi: {self.pyramid_levels}, ölçek: {self.template_scale:g})")
+        return True
+    
     def load_card_templates(self):
-        """CROPPEDCARDS klasöründeki kart şablonlarını yükle ve küçült"""
+        """CROPPEDCARDS klasöründeki kart şablonlarını yükle ve pyramid seviyelerini hazırla"""
         try:
             if not os.path.exists(self.cards_folder):
                 self.logger.error(f"{self.cards_folder} klasörü bulunamadı!")
                 return
-                
-            # Küçültme oranı (0.5x = yarı boyut)
-            scale_factor = 1
+            
+            # Derlenmiş banka varsa açılış tek bir mmap'ten ibarettir
+            if self.template_bank_path and self.load_template_bank():
+                return
                 
             for filename in os.listdir(self.cards_folder):
                 if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
@@ -54,29 +211,67 @@ class CardDetector:
                     template = cv2.imread(filepath, cv2.IMREAD_COLOR)
                     
                     if template is not None:
-                        # Şablonu küçült
-                        height, width = template.shape[:2]
-                        new_width = int(width * scale_factor)
-                        new_height = int(height * scale_factor)
-                        template_resized = cv2.resize(template, (new_width, new_height), interpolation=cv2.INTER_AREA)
+                        template = template_bank.scale_image(template, self.template_scale)
+                        # Küçültülmüş pyramid seviyelerini önceden hazırla
+                        pyramid = self.build_pyramid(template)
                         
                         # Kart adını dosya adından çıkar (uzantısız)
                         card_name = os.path.splitext(filename)[0]
-                        self.card_templates[card_name] = template_resized
-                        self.logger.info(f"Kart şablonu yüklendi ve küçültüldü: {card_name} ({width}x{height} -> {new_width}x{new_height})")
+                        self.card_templates[card_name] = template
+                        self.template_pyramids[card_name] = pyramid
+                        sizes = " -> ".join(f"{level.shape[1]}x{level.shape[0]}" for level in pyramid)
+                        self.logger.info(f"Kart şablonu yüklendi: {card_name} ({sizes})")
                     else:
                         self.logger.warning(f"Görüntü yüklenemedi: {filename}")
                         
-            self.logger.info(f"Toplam {len(self.card_templates)} kart şablonu yüklendi ve küçültüldü")
+            self.logger.info(f"Toplam {len(self.card_templates)} kart şablonu yüklendi (pyramid seviyesi: {self.pyramid_levels})")
             
         except Exception as e:
             self.logger.error(f"Kart şablonları yüklenirken hata: {str(e)}")
     
-    def get_optimal_thread_count(self):
-        """CPU kullanımına göre optimal thread sayısını hesapla"""
+    def convert_templates(self):
+        """Şablonları ve pyramid seviyelerini tek kanallı eşleştirme uzayına çevir.
+        
+        Kırmızı/siyah bilgisi tek kanalda kaybolabileceği için her şablonun
+        mürekkep rengi önceden BGR şablondan çıkarılır.
+        """
+        self.suit_is_red = {name: is_red_suit(template) for name, template in self.color_templates.items()}
+        self.card_templates = {name: to_match_space(template, self.color_mode)
+                               for name, template in self.color_templates.items()}
+        self.template_pyramids = {name: [to_match_space(level, self.color_mode) for level in pyramid]
+                                  for name, pyramid in self.template_pyramids.items()}
+        self.logger.info(f"Eşleştirme renk modu: {self.color_mode} (tek kanal)")
+    
+    def suit_color_matches(self, color_frame, card):
+        """Adayın frame'deki mürekkep rengi (kırmızı/siyah) şablonunkiyle aynı mı"""
+        h, w = self.template_shapes[card['name']]
+        x, y = card['location']
+        return is_red_suit(color_frame[y:y + h, x:x + w]) == self.suit_is_red[card['name']]
+    
+    def _cpu_sampler_loop(self):
+        """CPU kullanımını arka planda periyodik olarak örnekle"""
+        try:
+            # İlk çağrı referans noktası oluşturur, bloklamaz
+            psutil.cpu_percent(interval=None)
+            while not self.sampler_stop_event.wait(self.cpu_sample_interval):
+                self.cpu_usage = psutil.cpu_percent(interval=None)
+                if self.fixed_thread_count:
+                    continue
+                thread_count = self.get_optimal_thread_count(self.cpu_usage)
+                if thread_count != self.optimal_thread_count:
+                    self.logger.info(f"CPU kullanımı {self.cpu_usage:.1f}%, thread sayısı {self.optimal_thread_count} -> {thread_count}")
+                    self.optimal_thread_count = thread_count
+                    for region_detector in self.region_detectors:
+                        region_detector.optimal_thread_count = thread_count
+        except Exception as e:
+            self.logger.error(f"CPU örnekleyici hatası: {str(e)}")
+    
+    def get_optimal_thread_count(self, cpu_usage=None):
+        """CPU kullanımına göre optimal thread sayısını hesapla (bloklamaz)"""
         try:
-            # CPU kullanımını al
-            cpu_usage = psutil.cpu_percent(interval=0.1)
+            # Arka planda örneklenen son CPU kullanımını al
+            if cpu_usage is None:
+                cpu_usage = self.cpu_usage
             
             # CPU çekirdek sayısına göre temel thread sayısı
             if self.cpu_count >= 8:
@@ -89,16 +284,13 @@ class CardDetector:
             # CPU kullanımına göre adaptif ayarlama
             if cpu_usage < 30:
                 # Düşük CPU kullanımı - daha fazla thread
-                adaptive_threads = min(base_threads + 2, 13)
-                self.logger.info(f"CPU kullanımı düşük ({cpu_usage:.1f}%), thread sayısı artırıldı: {adaptive_threads}")
+                adaptive_threads = min(base_threads + 2, self.max_thread_count)
             elif cpu_usage < 60:
                 # Orta CPU kullanımı - optimal thread
                 adaptive_threads = base_threads
-                self.logger.info(f"CPU kullanımı orta ({cpu_usage:.1f}%), optimal thread sayısı: {adaptive_threads}")
             else:
                 # Yüksek CPU kullanımı - daha az thread
                 adaptive_threads = max(base_threads - 2, 2)
-                self.logger.info(f"CPU kullanımı yüksek ({cpu_usage:.1f}%), thread sayısı azaltıldı: {adaptive_threads}")
             
             return adaptive_threads
             
@@ -106,151 +298,838 @@ class CardDetector:
             self.logger.error(f"Thread sayısı hesaplanırken hata: {str(e)}")
             return 4  # Varsayılan değer
     
-    def detect_cards_in_range(self, screenshot_resized, card_names, thread_id):
-        """Belirli bir kart aralığını tara (thread için)"""
-        detected_cards = []
+    def split_card_names(self, thread_count, excluded=frozenset()):
+        """Kart isimlerini (ön filtrenin elediği kartlar hariç) thread sayısına göre dilimlere böl"""
+        all_card_names = [name for name in self.card_templates if name not in excluded]
+        # Sırayla dağıt: dilim boyları en fazla bir farklı olur, kalan son dilime yığılmaz
+        return [all_card_names[i::thread_count] for i in range(thread_count)]
+    
+    def match_card(self, frame_pyramid, card_name):
+        """Tek bir şablonu eşleştir ve süresini hem toplu hem şablon bazında kaydet"""
+        started = time.perf_counter()
+        max_val, max_loc = self._match_card(frame_pyramid, card_name)
+        self._record_match_time(card_name, time.perf_counter() - started)
+        return max_val, max_loc
+    
+    def match_card_peaks(self, frame_pyramid, card_name, threshold):
+        """Şablonun eşiği geçen tüm konumlarını bul: [(güven, (x, y))]"""
+        started = time.perf_counter()
+        windows = self._coarse_windows(frame_pyramid, card_name)
+        template = self.card_templates[card_name]
+        if windows is None:
+            result = cv2.matchTemplate(frame_pyramid[0], template, cv2.TM_CCOEFF_NORMED)
+            peaks = find_peaks(result, threshold, template.shape)
+        else:
+            peaks = []
+            for x0, y0, x1, y1 in windows:
+                result = cv2.matchTemplate(frame_pyramid[0][y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                if max_val >= threshold:
+                    peaks.append((max_val, (max_loc[0] + x0, max_loc[1] + y0)))
+        self._record_match_time(card_name, time.perf_counter() - started)
+        return peaks
+    
+    def _record_match_time(self, card_name, elapsed):
+        self.metrics.record("match_template", elapsed)
+        self.metrics.record(f"template/{card_name}", elapsed)
+    
+    def _match_card(self, frame_pyramid, card_name):
+        """Tek bir şablonu eşleştir, (max_val, max_loc) döndür.
+        
+        Pyramid modunda adaylar küçük çözünürlükte bulunur ve her aday tam
+        çözünürlükte küçük bir pencerede doğrulanır; döndürülen güven her
+        zaman tam çözünürlük TM_CCOEFF_NORMED değeridir.
+        """
+        frame = frame_pyramid[0]
+        template = self.card_templates[card_name]
+        windows = self._coarse_windows(frame_pyramid, card_name)
+        
+        if windows is None:
+            result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            return max_val, max_loc
+        
+        best_val, best_loc = -1.0, (0, 0)
+        for x0, y0, x1, y1 in windows:
+            result = cv2.matchTemplate(frame[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            if max_val > best_val:
+                best_val, best_loc = max_val, (max_loc[0] + x0, max_loc[1] + y0)
+        
+        return best_val, best_loc
+    
+    def _coarse_windows(self, frame_pyramid, card_name):
+        """Pyramid'in kaba seviyesinde adayları bul, tam çözünürlükteki doğrulama pencerelerini döndür.
+        
+        Pyramid kapalıysa veya kaba seviye şablondan küçükse None döndürür
+        (tam çözünürlükte tüm frame taranmalıdır).
+        """
+        frame = frame_pyramid[0]
+        template = self.card_templates[card_name]
+        template_pyramid = self.template_pyramids[card_name]
+        level = min(len(frame_pyramid), len(template_pyramid)) - 1
+        if level <= 0:
+            return None
+        
+        coarse_frame = frame_pyramid[level]
+        coarse_template = template_pyramid[level]
+        if coarse_frame.shape[0] < coarse_template.shape[0] or coarse_frame.shape[1] < coarse_template.shape[1]:
+            return None
+        
+        coarse_result = cv2.matchTemplate(coarse_frame, coarse_template, cv2.TM_CCOEFF_NORMED)
+        
+        scale = 2 ** level
+        margin = scale + 1  # Yuvarlama kaymasını karşılayacak doğrulama payı
+        h, w = template.shape[:2]
+        frame_h, frame_w = frame.shape[:2]
+        
+        # Eşiği geçen her kaba tepe doğrulanır. Küçültmede kart şablonun
+        # örnekleme ızgarasından kayabildiği için gerçek kartın kaba skoru
+        # 0.6'ya kadar düşebilir; eşik bunun altında tutulur
+        windows = []
+        for coarse_val, (cx, cy) in find_peaks(coarse_result, self.pyramid_coarse_threshold,
+                                               coarse_template.shape, max_peaks=None):
+            # Tam çözünürlükte küçük pencerede doğrula
+            x0 = max(cx * scale - margin, 0)
+            y0 = max(cy * scale - margin, 0)
+            x1 = min(cx * scale + margin + w, frame_w)
+            y1 = min(cy * scale + margin + h, frame_h)
+            if x1 - x0 < w or y1 - y0 < h:
+                continue
+            windows.append((x0, y0, x1, y1))
+        
+        return windows
+    
+    def detect_cards_fft(self, frame, thread_cards):
+        """Tüm şablonları frekans uzayında tek geçişte eşleştir.
+        
+        Daha önce tespit edilen kartlar atlanır; her şablonun eşiği geçen tüm
+        konumları aday olarak döndürülür.
+        """
+        with self.detection_lock:
+            pending = [name for card_names in thread_cards for name in card_names if name not in self.detected_cards]
+        
+        threshold = self.match_threshold
+        with self.metrics.timer("fft_match"):
+            peaks = self.fft_matcher.match(frame, pending, threshold)
+        
+        results = []
+        for thread_id, card_names in enumerate(thread_cards):
+            detected_cards = []
+            cards_checked = 0
+            for card_name in card_names:
+                if card_name not in peaks:
+                    continue
+                cards_checked += 1
+                for max_val, max_loc in peaks[card_name]:
+                    detected_cards.append({
+                        'name': card_name,
+                        'confidence': max_val,
+                        'location': max_loc,
+                        'thread_id': thread_id
+                    })
+            results.append({
+                'cards': detected_cards,
+                'cards_checked': cards_checked,
+                'thread_id': thread_id
+            })
+        return results
+    
+    def detect_cards_glyph(self, frame):
+        """Kartları köşe indeksindeki rank ve suit gliflerinden tespit et"""
+        with self.detection_lock:
+            skip_cards = set(self.detected_cards)
+        
+        with self.metrics.timer("glyph_match"):
+            detected_cards = self.glyph_matcher.match(frame, skip_cards)
+        for card in detected_cards:
+            card['thread_id'] = 0
+        
+        glyph_count = len(self.glyph_matcher.rank_glyphs) + len(self.glyph_matcher.suit_glyphs)
+        return [{
+            'cards': detected_cards,
+            'cards_checked': glyph_count,
+            'thread_id': 0
+        }]
+    
+    def localize_card_regions(self, frame, margin=None):
+        """Frame'i parlak, dikdörtgen kart adaylarına ayır.
+        
+        (x, y, genişlik, yükseklik) listesi döndürür. Bölgeler şablonun
+        tamamını içerebilecek kadar büyük olanlarla sınırlıdır.
+        """
+        if margin is None:
+            margin = self.region_margin
+        template_h, template_w = next(iter(self.card_templates.values())).shape[:2]
+        frame_h, frame_w = frame.shape[:2]
+        
+        # Kart yüzeyi: tüm kanalları parlak (beyaz) pikseller
+        if frame.ndim == 3:
+            surface = frame.min(axis=2)
+        else:
+            surface = frame
+        mask = (surface >= self.card_brightness).astype(np.uint8)
+        
+        # Kartın içindeki rakam/desen boşluklarını kapat
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        regions = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            # Şablondan belirgin şekilde küçük bölgeler kart olamaz
+            if w + 2 * margin < template_w or h + 2 * margin < template_h:
+                continue
+            x0 = max(x - margin, 0)
+            y0 = max(y - margin, 0)
+            x1 = min(x + w + margin, frame_w)
+            y1 = min(y + h + margin, frame_h)
+            if x1 - x0 < template_w or y1 - y0 < template_h:
+                continue
+            regions.append((x0, y0, x1 - x0, y1 - y0))
+        
+        return regions
+    
+    def classify_region(self, patch, patch_pyramid):
+        """Bölgeyi tanımlayıcı indeksiyle sınıflandır, matchTemplate ile doğrula.
+        
+        Fark yeterince büyükse sadece en yakın kart doğrulanır, belirsizse
+        ilk birkaç aday doğrulanır. (kart_adı, güven, konum, doğrulanan
+        şablon sayısı) döndürür; kart bulunamazsa kart_adı None olur.
+        """
+        with self.detection_lock:
+            skip_cards = set(self.detected_cards)
+        
+        ranked = self.descriptor_index.query(patch, max_offset=2 * self.region_margin, skip_cards=skip_cards)
+        if not ranked:
+            return None, 0.0, None, 0
+        
+        best_similarity = ranked[0][0]
+        second_similarity = ranked[1][0] if len(ranked) > 1 else -1.0
+        if (best_similarity >= self.descriptor_min_similarity and
+                best_similarity - second_similarity >= self.descriptor_margin):
+            candidates = ranked[:1]
+        else:
+            candidates = ranked
+        
+        checked = 0
+        for similarity, card_name in candidates:
+            checked += 1
+            max_val, max_loc = self.match_card(patch_pyramid, card_name)
+            if max_val >= self.match_threshold:
+                return card_name, max_val, max_loc, checked
+        return None, 0.0, None, checked
+    
+    def prune_templates(self, color_image):
+        """BGR bölgede eşleşemeyecek şablonlar (ön filtre kapalıysa veya bölge yoksa boş küme)"""
+        if self.prefilter is None or color_image is None:
+            return frozenset()
+        with self.metrics.timer("prefilter"):
+            pruned = self.prefilter.prune(color_image)
+        self.metrics.increment("prefilter/considered", len(self.prefilter.card_names))
+        self.metrics.increment("prefilter/pruned", len(pruned))
+        return pruned
+    
+    def match_patch(self, patch, excluded=frozenset()):
+        """Bir bölgedeki kartları bul.
+        
+        ([(kart_adı, güven, (x, y))], doğrulanan şablon sayısı, tam mı)
+        döndürür; konumlar bölgenin sol üst köşesine göredir. Tanımlayıcı
+        indeksi ilk doğrulanan kartta durduğu için sonucu tam sayılmaz.
+        """
+        patch_pyramid = self.build_pyramid(patch)
         cards_checked = 0
+        threshold = self.match_threshold
         
-        for card_name in card_names:
-            # Eğer kart zaten tespit edilmişse, atla
+        if self.descriptor_index is not None:
+            card_name, max_val, max_loc, cards_checked = self.classify_region(patch, patch_pyramid)
+            if card_name is not None:
+                return [(card_name, max_val, max_loc)], cards_checked, False
+        
+        # İndeks yoksa veya sonuç doğrulanamadıysa tüm şablonları dene (ön filtrenin elediği kartlar hariç)
+        peaks = []
+        for card_name in self.card_templates:
+            if card_name in excluded:
+                continue
             with self.detection_lock:
                 if card_name in self.detected_cards:
                     continue
             
             cards_checked += 1
+            for max_val, max_loc in self.match_card_peaks(patch_pyramid, card_name, threshold):
+                peaks.append((card_name, max_val, max_loc))
+        return peaks, cards_checked, True
+    
+    def detect_cards_localized(self, frame, card_regions, color_frame=None):
+        """Sadece lokalize edilmiş kart bölgelerini sınıflandır; değişmeyen bölgeler önbellekten gelir"""
+        detected_cards = []
+        cards_checked = 0
+        with self.detection_lock:
+            skip_cards = frozenset(self.detected_cards)
+        
+        for x0, y0, w, h in card_regions:
+            patch = frame[y0:y0 + h, x0:x0 + w]
+            key = self.patch_cache.fingerprint(patch) if self.patch_cache is not None else None
+            peaks = self.patch_cache.get(key, skip_cards) if key is not None else None
+            if peaks is None:
+                color_patch = color_frame[y0:y0 + h, x0:x0 + w] if color_frame is not None else None
+                peaks, checked, complete = self.match_patch(patch, self.prune_templates(color_patch))
+                cards_checked += checked
+                if key is not None:
+                    self.patch_cache.put(key, peaks, skip_cards, complete)
+            
+            for card_name, max_val, max_loc in peaks:
+                detected_cards.append({
+                    'name': card_name,
+                    'confidence': max_val,
+                    'location': (max_loc[0] + x0, max_loc[1] + y0),
+                    'thread_id': 0
+                })
+        
+        return [{
+            'cards': detected_cards,
+            'cards_checked': cards_checked,
+            'thread_id': 0
+        }]
+    
+    def detect_cards_process(self, frame, thread_cards):
+        """Kart dilimlerini süreç havuzunda tara ve kayıtları tespit sonuçlarına çevir"""
+        with self.detection_lock:
+            skip_cards = set(self.detected_cards)
+        
+        started = time.perf_counter()
+        futures = self.process_backend.submit_slices(frame, thread_cards, skip_cards, self.match_threshold)
+        
+        results = []
+        for thread_id, future in enumerate(futures):
+            detected_cards = []
+            try:
+                matches, cards_checked = future.result()
+            except Exception as e:
+                self.logger.error(f"Süreç {thread_id} hatası: {str(e)}")
+                matches, cards_checked = [], 0
+            
+            for card_name, max_val, max_loc in matches:
+                detected_cards.append({
+                    'name': card_name,
+                    'confidence': max_val,
+                    'location': tuple(max_loc),
+                    'thread_id': thread_id
+                })
+            
+            results.append({
+                'cards': detected_cards,
+                'cards_checked': cards_checked,
+                'thread_id': thread_id
+            })
+        self.metrics.record("process_match", time.perf_counter() - started)
+        return results
+    
+    def update_correlation_maps(self, frame, card_names, dirty_rects, threshold=None):
+        """Kartların korelasyon haritalarını güncelle, {kart_adı: [(güven, konum)]} döndür.
+        
+        dirty_rects None ise (veya harita yoksa) harita baştan hesaplanır;
+        aksi halde sadece kirli bölgelerden etkilenen harita alanı güncellenir.
+        Bir pikseldeki değişiklik, şablon boyutu kadar sol/üst komşu konumları etkiler.
+        """
+        if threshold is None:
+            threshold = self.match_threshold
+        scores = {}
+        for card_name in card_names:
+            started = time.perf_counter()
             template = self.card_templates[card_name]
+            h, w = template.shape[:2]
+            result = self.correlation_maps.get(card_name)
             
-            result = cv2.matchTemplate(screenshot_resized, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            if result is None or dirty_rects is None:
+                result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+                self.correlation_maps[card_name] = result
+            else:
+                map_h, map_w = result.shape[:2]
+                for x0, y0, x1, y1 in dirty_rects:
+                    mx0, my0 = max(x0 - w + 1, 0), max(y0 - h + 1, 0)
+                    mx1, my1 = min(x1, map_w), min(y1, map_h)
+                    if mx1 <= mx0 or my1 <= my0:
+                        continue
+                    region = frame[my0:my1 + h - 1, mx0:mx1 + w - 1]
+                    result[my0:my1, mx0:mx1] = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
             
-            # Eşik değeri
-            threshold = 0.99
+            # Eşiği geçen tüm konumlar (harita değiştirilmez)
+            scores[card_name] = find_peaks(result, threshold, template.shape)
+            self._record_match_time(card_name, time.perf_counter() - started)
+        return scores
+    
+    def detect_cards_incremental(self, frame, dirty_rects, thread_count, color_frame=None):
+        """Korelasyon haritalarını artımlı güncelle ve eşiği geçen tüm kartları raporla.
+        
+        color_frame: karo değişim referansı olarak saklanan BGR frame (tek kanallı
+        modda frame'den farklıdır; değişiklik kontrolü BGR'de yapılır).
+        """
+        with self.detection_lock:
+            pending = [name for name in self.card_templates if name not in self.detected_cards]
+            # Tespit edilen kartların haritaları artık güncellenmiyor, bayatlamasınlar
+            for card_name in self.detected_cards:
+                self.correlation_maps.pop(card_name, None)
+        
+        slice_size = max(1, -(-len(pending) // thread_count))
+        slices = [pending[i:i + slice_size] for i in range(0, len(pending), slice_size)]
+        futures = [self.submit(self.update_correlation_maps, frame, card_names, dirty_rects) for card_names in slices]
+        
+        results = []
+        for thread_id, future in enumerate(futures):
+            scores = future.result()
+            detected_cards = []
+            for card_name, peaks in scores.items():
+                for max_val, max_loc in peaks:
+                    detected_cards.append({
+                        'name': card_name,
+                        'confidence': max_val,
+                        'location': max_loc,
+                        'thread_id': thread_id
+                    })
+            results.append({
+                'cards': detected_cards,
+                'cards_checked': len(scores),
+                'thread_id': thread_id
+            })
+        
+        # Referans sadece yeniden hesaplanan bölgelerde güncellenir; eşik altı küçük
+        # değişiklikler birikerek eşiği geçtiğinde haritalar yine yenilenir
+        reference = frame if color_frame is None else color_frame
+        if dirty_rects is None or self.correlation_frame is None:
+            self.correlation_frame = reference.copy()
+        else:
+            for x0, y0, x1, y1 in dirty_rects:
+                self.correlation_frame[y0:y1, x0:x1] = reference[y0:y1, x0:x1]
+        return results
+    
+    def set_selection_area(self, selection_coords):
+        """Seçim alanı değişince önceki alana ait sıcak bölgeleri geçersiz kıl"""
+        if self.hot_zones is not None:
+            self.hot_zones.set_area(selection_coords)
+        if self.patch_cache is not None:
+            self.patch_cache.clear()
+    
+    def plan_hot_zone_scan(self, frame):
+        """Frame'in sadece sıcak bölgelerde taranıp taranamayacağına karar ver.
+        
+        Taranacak (x, y, genişlik, yükseklik) listesini, tam tarama gerekiyorsa
+        None döndürür. Tam tarama gerekir: bölge yoksa, full_scan_interval
+        kadar bölge taraması yapıldıysa veya karo değişim sinyali bölgelerin
+        dışında bir değişiklik gösteriyorsa. Bölgeler karo sınırlarına
+        genişletilir; böylece "bölge içinde" kontrolü karo düzeyinde kesindir.
+        frame, previous_frame gibi BGR frame'dir.
+        """
+        if (self.hot_zones is None or self.detection_mode != "card" or self.localize_cards or
+                self.incremental or self.frames_since_full_scan >= self.full_scan_interval):
+            return None
+        if not self.hot_zones.matches_frame(frame.shape):
+            return None
+        rects = self.hot_zones.search_rects(frame.shape, self.hot_zone_margin, self.template_size)
+        if not rects:
+            return None
+        dirty = self.tile_tracker.dirty_mask(frame, self.previous_frame)
+        if dirty is None:
+            return None
+        
+        tile = self.tile_tracker.tile_size
+        frame_h, frame_w = frame.shape[:2]
+        covered = np.zeros_like(dirty)
+        zone_rects = []
+        for x, y, w, h in rects:
+            tx0, ty0 = x // tile, y // tile
+            tx1, ty1 = -(-(x + w) // tile), -(-(y + h) // tile)
+            covered[ty0:ty1, tx0:tx1] = True
+            x0, y0 = tx0 * tile, ty0 * tile
+            zone_rects.append((x0, y0, min(tx1 * tile, frame_w) - x0, min(ty1 * tile, frame_h) - y0))
+        
+        if (dirty & ~covered).any():
+            self.logger.info("Sıcak bölgelerin dışında değişiklik var, tam tarama", extra={'rate_key': 'zone_outside'})
+            return None
+        return zone_rects
+    
+    def detect_cards_in_zones(self, frame, zone_rects, thread_count, color_frame=None):
+        """Sadece sıcak bölgeleri tara; her bölgede şablon dilimleri havuzda paralel çalışır.
+        
+        İçeriği önbellekteki bir bölgeyle aynı olan bölgeler için eşleştirme yapılmaz.
+        """
+        with self.detection_lock:
+            skip_cards = frozenset(self.detected_cards)
+        results = []
+        jobs = []
+        for x0, y0, w, h in zone_rects:
+            patch = frame[y0:y0 + h, x0:x0 + w]
+            key = self.patch_cache.fingerprint(patch) if self.patch_cache is not None else None
+            peaks = self.patch_cache.get(key, skip_cards) if key is not None else None
+            if peaks is not None:
+                results.append({
+                    'cards': [{
+                        'name': card_name,
+                        'confidence': max_val,
+                        'location': (max_loc[0] + x0, max_loc[1] + y0),
+                        'thread_id': 0
+                    } for card_name, max_val, max_loc in peaks],
+                    'cards_checked': 0,
+                    'thread_id': 0
+                })
+                continue
+            patch_pyramid = self.build_pyramid(patch)
+            color_patch = color_frame[y0:y0 + h, x0:x0 + w] if color_frame is not None else None
+            thread_cards = self.split_card_names(thread_count, self.prune_templates(color_patch))
+            futures = [self.submit(self._detect_cards_thread, patch_pyramid, thread_cards[i], i)
+                       for i in range(thread_count)]
+            jobs.append((x0, y0, key, futures))
+        
+        for x0, y0, key, futures in jobs:
+            peaks = []
+            for future in futures:
+                result = future.result()
+                # Konumlar bölgeye göre; frame koordinatlarına çevir
+                for card in result['cards']:
+                    peaks.append((card['name'], card['confidence'], card['location']))
+                    card['location'] = (card['location'][0] + x0, card['location'][1] + y0)
+                results.append(result)
+            if key is not None:
+                self.patch_cache.put(key, peaks, skip_cards)
+        return results
+    
+    def record_hot_zones(self, detected_cards, frame_shape):
+        """Tespit kutularını sıcak bölgelere işle, bölgeler değiştiyse kaydet"""
+        boxes = []
+        for card in detected_cards:
+            h, w = self.template_shapes[card['name']]
+            boxes.append((card['location'][0], card['location'][1], w, h))
+        if self.hot_zones.record(boxes, frame_shape):
+            self.hot_zones.save()
+    
+    def card_box(self, card):
+        """Adayın (x, y, genişlik, yükseklik) kutusu"""
+        h, w = self.template_shapes[card['name']]
+        return (card['location'][0], card['location'][1], w, h)
+    
+    def region_fingerprint(self, frame, box):
+        x, y, w, h = box
+        return patch_fingerprint(frame[y:y + h, x:x + w])
+    
+    def is_known_region(self, frame, card, current_fingerprints):
+        """Aday, daha önce kart tanınan ve görüntüsü o zamandan beri değişmeyen bir bölgede mi.
+        
+        current_fingerprints: bu frame için hesaplanan parmak izleri (kutu -> özet),
+        her bölge frame başına bir kez özetlenir.
+        """
+        box = self.card_box(card)
+        for known_box, fingerprint in self.detected_regions:
+            if overlap_ratio(box, known_box) <= self.nms_overlap:
+                continue
+            if known_box not in current_fingerprints:
+                current_fingerprints[known_box] = self.region_fingerprint(frame, known_box)
+            if current_fingerprints[known_box] == fingerprint:
+                return True
+        return False
+    
+    def for_region(self, hot_zones_path=None):
+        """Başka bir masa/bölge için detektör döndür.
+        
+        Şablonlar, banka, eşleştiriciler, worker havuzu ve süreç arka ucu bu
+        detektörle paylaşılır; tespit edilen kartlar, önceki frame, korelasyon
+        haritaları, sıcak bölgeler ve bölge önbelleği bölgeye özeldir. Paylaşılan
+        kaynakları sadece asıl detektörün shutdown'ı kapatır.
+        """
+        owner = self.shared_owner or self
+        region = copy.copy(owner)
+        region.shared_owner = owner
+        region.region_detectors = []
+        region.detection_lock = threading.Lock()
+        region.detected_cards = set()
+        region.detected_regions = []
+        region.previous_frame = None
+        region.tile_tracker = TileChangeTracker(owner.tile_tracker.tile_size, owner.change_threshold)
+        region.correlation_maps = {}
+        region.correlation_frame = None
+        region.hot_zones = HotZoneMap(hot_zones_path) if hot_zones_path else None
+        region.frames_since_full_scan = 0
+        region.patch_cache = (PatchCache(owner.patch_cache.capacity, metrics=owner.metrics)
+                              if owner.patch_cache is not None else None)
+        region.last_frame_stats = {'skipped': False, 'templates_evaluated': 0, 'thread_count': 0, 'detected': 0,
+                                   'scan_mode': None}
+        owner.region_detectors.append(region)
+        return region
+    
+    def reset_detection_state(self):
+        """Tespit edilen kartları ve frame/harita önbelleklerini temizle"""
+        with self.detection_lock:
+            self.detected_cards.clear()
+        self.detected_regions = []
+        self.previous_frame = None
+        self.correlation_maps.clear()
+        self.correlation_frame = None
+    
+    def detect_cards_in_range(self, frame_pyramid, card_names, thread_id):
+        """Belirli bir kart aralığını tara (thread için).
+        
+        Dilimdeki her şablonun eşiği geçen tüm konumları aday olarak
+        döndürülür; şablonlar arası bastırma detect_cards'ta yapılır.
+        """
+        detected_cards = []
+        cards_checked = 0
+        
+        # Eşik değeri
+        threshold = self.match_threshold
+        
+        for card_name in card_names:
+            # Eğer kart zaten tespit edilmişse, atla
+            with self.detection_lock:
+                if card_name in self.detected_cards:
+                    continue
             
-            if max_val >= threshold:
+            cards_checked += 1
+            for max_val, max_loc in self.match_card_peaks(frame_pyramid, card_name, threshold):
                 detected_cards.append({
                     'name': card_name,
                     'confidence': max_val,
                     'location': max_loc,
                     'thread_id': thread_id
                 })
-                
-                with self.detection_lock:
-                    self.detected_cards.add(card_name)
-                
-                self.logger.info(f"Thread {thread_id}: Kart tespit edildi: {card_name} (güven: {max_val:.2f}) - {cards_checked} kart tarandı")
-                break  # İlk eşleşme bulunduğunda dur
         
         return detected_cards, cards_checked
     
     def detect_cards(self, screenshot):
-        """Ekran görüntüsünde kartları tespit et - multithreaded"""
+        """Ekran görüntüsünde kartları tespit et - multithreaded.
+        
+        screenshot: BGR/BGRA ndarray (frame_capture.grab_bgr) veya PIL Image
+        """
         if not self.card_templates:
             self.logger.warning("Kart şablonları yüklenmemiş!")
             return []
             
         detected_cards = []
+        self.last_frame_stats = {'skipped': True, 'templates_evaluated': 0, 'thread_count': 0, 'detected': 0,
+                                 'scan_mode': None}
+        started = time.perf_counter()
         
         try:
-            # PIL Image'i OpenCV formatına çevir
+            # PIL Image'i OpenCV formatına çevir; ndarray (BGR/BGRA) doğrudan kullanılır
             if isinstance(screenshot, Image.Image):
                 screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            elif screenshot.ndim == 3 and screenshot.shape[2] == 4:
+                screenshot_cv = cv2.cvtColor(screenshot, cv2.COLOR_BGRA2BGR)
             else:
                 screenshot_cv = screenshot
             
-            # Ekran görüntüsünü küçült (şablonlarla aynı oranda)
-            scale_factor = 1
-            height, width = screenshot_cv.shape[:2]
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            screenshot_resized = cv2.resize(screenshot_cv, (new_width, new_height), interpolation=cv2.INTER_AREA)
+            # Tek kanallı mod: eşleştirme ve önbellekler tek kanalda çalışır. Değişiklik
+            # kontrolü BGR frame'de kalır; gri dönüşümde yeni bir kartın farkı eşiğin
+            # altına düşüp frame atlanabilir
+            color_frame = screenshot_cv
+            if self.color_mode != "bgr":
+                screenshot_cv = to_match_space(screenshot_cv, self.color_mode)
+            
+            # Artımlı mod: karo bazında değişiklik kontrolü
+            dirty_rects = None
+            change_started = time.perf_counter()
+            if self.incremental:
+                dirty_rects = self.tile_tracker.dirty_rects(color_frame, self.correlation_frame)
+                self.metrics.record("change_check", time.perf_counter() - change_started)
+                if dirty_rects is not None and not dirty_rects:
+                    self.logger.info("Frame değişikliği yok, tarama atlandı", extra={'rate_key': 'unchanged'})
+                    return []
             
             # Frame değişikliği kontrolü
-            if self.previous_frame is not None:
+            elif self.previous_frame is not None:
                 # Boyut kontrolü - aynı boyutta olmalı
-                if screenshot_resized.shape == self.previous_frame.shape:
+                if color_frame.shape == self.previous_frame.shape:
                     # Önceki frame ile karşılaştır
-                    frame_diff = cv2.absdiff(screenshot_resized, self.previous_frame)
-                    mean_diff = cv2.mean(frame_diff)[0]
+                    frame_diff = cv2.absdiff(color_frame, self.previous_frame)
+                    channels = frame_diff.shape[2] if frame_diff.ndim == 3 else 1
+                    mean_diff = max(cv2.mean(frame_diff)[:channels])  # Tüm kanallar
+                    self.metrics.record("change_check", time.perf_counter() - change_started)
                     
                     # Eğer frame değişikliği çok az ise, tarama yapma
-                    if mean_diff < 5.0:  # Eşik değeri
-                        self.logger.info("Frame değişikliği yok, tarama atlandı")
+                    if mean_diff < self.change_threshold:
+                        self.logger.info("Frame değişikliği yok, tarama atlandı", extra={'rate_key': 'unchanged'})
                         return []
                 else:
                     # Boyut farklıysa önceki frame'i güncelle ve devam et
-                    self.logger.info("Frame boyutu değişti, tarama devam ediyor")
+                    self.logger.info("Frame boyutu değişti, tarama devam ediyor", extra={'rate_key': 'resized'})
             
             # Tarama başladığını logla
-            self.logger.info("Kart taraması başladı (adaptif multithreading)...")
-            
-            # Adaptif thread sayısını al
-            thread_count = self.get_optimal_thread_count()
-            
-            # Kartları thread sayısına göre böl
-            all_card_names = list(self.card_templates.keys())
-            cards_per_thread = len(all_card_names) // thread_count
+            self.last_frame_stats['skipped'] = False
+            self.logger.info("Kart taraması başladı (adaptif multithreading)...", extra={'rate_key': 'scan_start'})
             
-            # Thread'ler için kart listeleri
-            thread_cards = []
-            for i in range(thread_count):
-                start_idx = i * cards_per_thread
-                end_idx = start_idx + cards_per_thread if i < thread_count - 1 else len(all_card_names)
-                thread_cards.append(all_card_names[start_idx:end_idx])
-            
-            self.logger.info(f"Kartlar {thread_count} thread'e bölündü: {[len(cards) for cards in thread_cards]} kart/thread")
-            
-            # Thread'leri başlat
-            threads = []
-            results = []
-            
-            for i in range(thread_count):
-                thread = threading.Thread(
-                    target=self._detect_cards_thread,
-                    args=(screenshot_resized, thread_cards[i], i, results)
-                )
-                threads.append(thread)
-                thread.start()
+            # Sıcak bölgeler: önce geçmiş tespitlerin olduğu yerler taranır
+            zone_hit = False
+            total_cards_checked = 0
+            zone_rects = self.plan_hot_zone_scan(color_frame)
+            if zone_rects is not None:
+                thread_count = self.optimal_thread_count
+                with self.metrics.timer("hot_zone_scan"):
+                    results = self.detect_cards_in_zones(screenshot_cv, zone_rects, thread_count, color_frame)
+                total_cards_checked += sum(result['cards_checked'] for result in results)
+                # Bölge taraması ancak filtrelerden geçen yeni bir tespit verirse yeterlidir;
+                # bilinen kartların adayları değişikliğin başka yerde olmadığını göstermez
+                detected_cards = self.select_detections(results, screenshot_cv, color_frame)
+                zone_hit = bool(detected_cards)
+                if zone_hit:
+                    self.frames_since_full_scan += 1
+                    self.last_frame_stats['scan_mode'] = 'hot_zone'
+                    self.logger.info("%d sıcak bölge tarandı", len(zone_rects), extra={'rate_key': 'zones'})
+                else:
+                    self.logger.info("Sıcak bölgelerde yeni kart bulunamadı, tam tarama", extra={'rate_key': 'zone_miss'})
             
-            # Thread'lerin bitmesini bekle
-            for thread in threads:
-                thread.join()
+            if not zone_hit:
+                self.frames_since_full_scan = 0
+                self.last_frame_stats['scan_mode'] = 'full'
+                results, thread_count = self.scan_full_frame(screenshot_cv, dirty_rects, color_frame)
+                total_cards_checked += sum(result['cards_checked'] for result in results if result)
+                detected_cards = self.select_detections(results, screenshot_cv, color_frame)
             
-            # Sonuçları birleştir
-            total_cards_checked = 0
-            for result in results:
-                if result:
-                    detected_cards.extend(result['cards'])
-                    total_cards_checked += result['cards_checked']
+            with self.detection_lock:
+                self.detected_cards.update(card['name'] for card in detected_cards)
+            for card in detected_cards:
+                box = self.card_box(card)
+                self.detected_regions.append((box, self.region_fingerprint(screenshot_cv, box)))
+            for card in detected_cards:
+                self.logger.info(f"Thread {card['thread_id']}: Kart tespit edildi: {card['name']} (güven: {card['confidence']:.2f})")
+            if self.hot_zones is not None and detected_cards:
+                self.record_hot_zones(detected_cards, screenshot_cv.shape)
+            self.last_frame_stats.update(templates_evaluated=total_cards_checked, thread_count=thread_count,
+                                         detected=len(detected_cards))
             
             # Eğer hiç eşleşme bulunamadıysa, bu frame'i previous frame olarak ata
             if not detected_cards:
-                self.previous_frame = screenshot_resized.copy()
-                self.logger.info(f"Hiç eşleşme bulunamadı - {total_cards_checked} kart tarandı ({thread_count} thread), frame previous frame olarak atandı")
+                self.previous_frame = color_frame.copy()
+                self.logger.info("Hiç eşleşme bulunamadı - %d kart tarandı (%d thread), frame previous frame olarak atandı",
+                                 total_cards_checked, thread_count, extra={'rate_key': 'no_match'})
             else:
-                self.logger.info(f"Eşleşme bulundu, frame previous frame olarak atanmadı")
+                self.logger.info("Eşleşme bulundu, frame previous frame olarak atanmadı", extra={'rate_key': 'match'})
                     
         except Exception as e:
             self.logger.error(f"Kart tespiti sırasında hata: {str(e)}")
+        finally:
+            # Atlanan frame'ler ayrı tutulur, hızlı tarama gibi görünmesinler
+            stage = "detect_skipped" if self.last_frame_stats['skipped'] else "detect_total"
+            self.metrics.record(stage, time.perf_counter() - started)
             
         return detected_cards
     
-    def _detect_cards_thread(self, screenshot_resized, card_names, thread_id, results):
-        """Thread fonksiyonu - kart tespiti yapar"""
+    def select_detections(self, results, screenshot_cv, color_frame):
+        """Tarama sonuçlarındaki adaylardan bu frame'de raporlanacak yeni kartları seç.
+        
+        Zaten tespit edilmiş kartlar, bilinen kart bölgeleri ve rengi tutmayan
+        adaylar atılır; kalanlar şablonlar arası NMS ile birleştirilir.
+        """
+        with self.metrics.timer("merge"):
+            candidates = []
+            for result in results:
+                if result:
+                    candidates.extend(result['cards'])
+            
+            # Şablonlar arası bastırma: örtüşen adaylardan en güvenilir olan kalır
+            with self.detection_lock:
+                candidates = [card for card in candidates if card['name'] not in self.detected_cards]
+            if self.detected_regions:
+                current_fingerprints = {}
+                candidates = [card for card in candidates
+                              if not self.is_known_region(screenshot_cv, card, current_fingerprints)]
+            if self.suit_is_red:
+                # Tek kanalda eşleşen adayların kırmızı/siyah rengi BGR frame'de doğrulanır
+                matching = [card for card in candidates if self.suit_color_matches(color_frame, card)]
+                if len(matching) < len(candidates):
+                    self.metrics.increment("suit_check/rejected", len(candidates) - len(matching))
+                candidates = matching
+            return non_max_suppression(candidates, self.template_shapes, self.nms_overlap)
+    
+    def scan_full_frame(self, screenshot_cv, dirty_rects, color_frame=None):
+        """Tüm seçim alanını yapılandırılmış yolla tara, (sonuçlar, thread sayısı) döndür.
+        
+        color_frame: ön filtrenin mürekkep sayımı için BGR frame (tek kanallı modda
+        screenshot_cv'den farklıdır).
+        """
+        # Pyramid modunda frame'i şablonlarla aynı oranlarda küçült
+        frame_pyramid = self.build_pyramid(screenshot_cv)
+        
+        if self.detection_mode == "glyph" and self.glyph_matcher is not None:
+            # Glif modu: sadece köşe indeksleri aranır, thread gerekmez
+            thread_count = 1
+            results = self.detect_cards_glyph(screenshot_cv)
+        elif self.localize_cards:
+            # Lokalizasyon: sadece kart adaylarının olduğu küçük bölgeler taranır
+            thread_count = 1
+            with self.metrics.timer("localize"):
+                card_regions = self.localize_card_regions(screenshot_cv)
+            self.logger.info("%d kart adayı bölge bulundu", len(card_regions), extra={'rate_key': 'regions'})
+            results = self.detect_cards_localized(screenshot_cv, card_regions, color_frame)
+        elif self.incremental:
+            # Artımlı mod: sadece kirli karolar ve şablon payı yeniden hesaplanır
+            thread_count = self.optimal_thread_count
+            if dirty_rects is not None:
+                self.logger.info("%d kirli bölge yeniden hesaplanıyor", len(dirty_rects), extra={'rate_key': 'dirty'})
+            results = self.detect_cards_incremental(screenshot_cv, dirty_rects, thread_count, color_frame)
+        elif self.match_engine == "fft" and self.fft_matcher is not None:
+            # FFT motoru: tüm şablonlar tek geçişte, thread gerekmez
+            thread_count = self.optimal_thread_count
+            thread_cards = self.split_card_names(thread_count, self.prune_templates(color_frame))
+            results = self.detect_cards_fft(screenshot_cv, thread_cards)
+        elif self.process_backend is not None:
+            # Süreç arka ucu: frame paylaşılan belleğe bir kez yazılır
+            thread_count = self.process_backend.workers
+            thread_cards = self.split_card_names(thread_count, self.prune_templates(color_frame))
+            results = self.detect_cards_process(screenshot_cv, thread_cards)
+        else:
+            # Adaptif thread sayısını al (arka planda güncellenir)
+            thread_count = self.optimal_thread_count
+            
+            # Kartları thread sayısına göre böl; ön filtrenin elediği şablonlar hiç gönderilmez
+            thread_cards = self.split_card_names(thread_count, self.prune_templates(color_frame))
+            
+            self.logger.info("Kartlar %d thread'e bölündü", thread_count, extra={'rate_key': 'split'})
+            
+            # İşleri kalıcı havuza gönder
+            futures = [
+                self.submit(self._detect_cards_thread, frame_pyramid, thread_cards[i], i)
+                for i in range(thread_count)
+            ]
+            
+            # Sonuçların bitmesini bekle
+            results = [future.result() for future in futures]
+        
+        return results, thread_count
+    
+    def submit(self, fn, *args, **kwargs):
+        """İşi kalıcı worker havuzuna gönder, Future döndür"""
+        return self.executor.submit(fn, *args, **kwargs)
+    
+    def shutdown(self):
+        """CPU örnekleyicisini, worker havuzunu ve varsa süreç arka ucunu kapat"""
+        if self.shared_owner is not None:
+            # Bölge detektörü: paylaşılan kaynaklar asıl detektöre aittir
+            if self in self.shared_owner.region_detectors:
+                self.shared_owner.region_detectors.remove(self)
+            return
+        self.sampler_stop_event.set()
+        self.executor.shutdown(wait=False)
+        if self.process_backend is not None:
+            self.process_backend.shutdown()
+            self.process_backend = None
+    
+    def _detect_cards_thread(self, frame_pyramid, card_names, thread_id):
+        """Worker fonksiyonu - kart tespiti yapar"""
         try:
-            detected_cards, cards_checked = self.detect_cards_in_range(screenshot_resized, card_names, thread_id)
-            results.append({
+            detected_cards, cards_checked = self.detect_cards_in_range(frame_pyramid, card_names, thread_id)
+            return {
                 'cards': detected_cards,
                 'cards_checked': cards_checked,
                 'thread_id': thread_id
-            })
+            }
         except Exception as e:
             self.logger.error(f"Thread {thread_id} hatası: {str(e)}")
-            results.append({
+            return {
                 'cards': [],
                 'cards_checked': 0,
                 'thread_id': thread_id
-            })
-        
+            }
+    
     def get_detection_summary(self, detected_cards):
         """Tespit edilen kartların özetini döndür"""
         if not detected_cards:
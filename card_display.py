@@ -1,54 +1,115 @@
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
+import logging
 import os
 
+CARD_SIZE = (50, 70)  # Kart görselinin ekrandaki boyutu (genişlik, yükseklik)
+CARD_PADDING = 3  # Kartların çevresindeki boşluk
+GRID_COLUMNS = 13  # Satır başına kart (her satır bir suit)
+BACKGROUND = "#F4F4F9"
+PLACEHOLDER = "#FFFFFF"  # Görseller yüklenene kadar kart yerlerinin rengi
+HOVER_OUTLINE = "#4A90E2"
+
+
+def card_cell(index):
+    """Grid'deki index. kartın sol üst köşesi (x, y)"""
+    row, col = divmod(index, GRID_COLUMNS)
+    return (CARD_PADDING + col * (CARD_SIZE[0] + 2 * CARD_PADDING),
+            CARD_PADDING + row * (CARD_SIZE[1] + 2 * CARD_PADDING))
+
+
+def atlas_size(card_count):
+    """Tüm grid'i kapsayan atlas boyutu (genişlik, yükseklik)"""
+    rows = -(-card_count // GRID_COLUMNS)
+    return (GRID_COLUMNS * (CARD_SIZE[0] + 2 * CARD_PADDING), rows * (CARD_SIZE[1] + 2 * CARD_PADDING))
+
+
+def placeholder_atlas(card_count):
+    """Kart yerleri boş (beyaz) grid görüntüsü; atlasın taban görüntüsü"""
+    atlas = Image.new('RGB', atlas_size(card_count), BACKGROUND)
+    blank = Image.new('RGB', CARD_SIZE, PLACEHOLDER)
+    for index in range(card_count):
+        atlas.paste(blank, card_cell(index))
+    return atlas
+
+
+def dimmed_atlas(atlas):
+    """Atlasın yarı şeffaf siyah filtreli (tespit edilmiş) hali - tüm kartlar tek işlemde"""
+    black_filter = Image.new('RGBA', atlas.size, (0, 0, 0, 128))  # Alpha 128 = yarı şeffaf
+    return Image.alpha_composite(atlas.convert('RGBA'), black_filter).convert('RGB')
+
+
 class CardDisplay:
-    def __init__(self, parent_frame, cards_folder="CARDS"):
+    """52 kartlık "kalan kartlar" grid'i, tek bir Canvas üzerinde.
+
+    Kart görselleri yüklemede iki sprite atlasına dizilir: normal ve
+    filtreli (tespit edilmiş). Canvas'ta tek bir görüntü öğesi vardır; bir
+    kartın durumu değişince sadece o kartın hücresi uygun atlastan bu
+    görüntüye kopyalanır (Tk'de tek "copy -from" çağrısı). Bir frame'deki
+    tüm değişiklikler biriktirilir ve after_idle ile tek seferde çizilir.
+    """
+
+    def __init__(self, parent_frame, cards_folder="CARDS", deferred_loading=False, load_chunk_size=8,
+                 on_loaded=None, title="🎴 KALAN KARTLAR"):
         self.parent_frame = parent_frame
         self.cards_folder = cards_folder
-        self.card_labels = {}
-        self.card_images = {}
-        self.card_pil_images = {}  # Orijinal PIL görüntüleri sakla
-        self.card_filtered_images = {}  # Filtrelenmiş görüntüleri sakla
+        self.title = title  # Çoklu masada panel başlığı masa adını içerir
+        self.logger = logging.getLogger(__name__)
+        self.card_names = []  # Grid sırasıyla kart adları
+        self.card_cells = {}  # Kart adı -> hücrenin sol üst köşesi (x, y)
+        self.card_files = {}  # Kart adı -> dosya adı
         self.detected_cards = set()
+        # Ertelenmiş yükleme: pencere önce boş kartlarla açılır, görüntüler boşta parça parça yüklenir
+        self.deferred_loading = deferred_loading
+        self.load_chunk_size = load_chunk_size
+        self.pending_cards = []
+        self.on_loaded = on_loaded  # Tüm görüntüler yüklenince çağrılır
+        self.atlas = None  # Yükleme sırasında kartların dizildiği PIL atlas (yükleme bitince bırakılır)
+        self.normal_atlas = None  # PhotoImage: tüm kartlar normal
+        self.dimmed_atlas = None  # PhotoImage: tüm kartlar filtreli
+        self.display_image = None  # Canvas'ta gösterilen, hücreleri atlaslardan kopyalanan görüntü
+        self.dirty_cards = set()  # Bir sonraki çizimde güncellenecek kartlar
+        self.redraw_job = None
+        self.hover_card = None
         self.setup_card_grid()
-        
+
     def setup_card_grid(self):
         """Kart grid'ini oluştur"""
         # Ana frame - parent_frame artık content_frame
         self.cards_frame = ttk.LabelFrame(
-            self.parent_frame, 
-            text="🎴 KALAN KARTLAR", 
+            self.parent_frame,
+            text=self.title,
             padding="15",
             style="Modern.TLabelframe"
         )
         self.cards_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(10, 0))
-        
-        # Grid frame
-        self.grid_frame = ttk.Frame(self.cards_frame, style="Modern.TFrame")
-        self.grid_frame.pack(expand=True, fill=tk.BOTH)
-        
+
         # Kartları yükle ve göster
         self.load_and_display_cards()
-        
+
+    def set_title(self, title):
+        """Panel başlığını değiştir"""
+        self.title = title
+        self.cards_frame.config(text=title)
+
     def load_and_display_cards(self):
-        """Kartları yükle ve grid'de göster"""
+        """Kart listesini oku, boş grid'i çiz ve görselleri (ertelenmiş modda parça parça) yükle"""
         try:
             if not os.path.exists(self.cards_folder):
-                print(f"{self.cards_folder} klasörü bulunamadı!")
+                self.logger.error(f"{self.cards_folder} klasörü bulunamadı!")
                 return
-                
+
             # Kartları sırala (suit ve rank'e göre)
             card_files = []
             for filename in os.listdir(self.cards_folder):
                 if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
                     card_files.append(filename)
-            
+
             # Kartları sırala: Hearts, Diamonds, Clubs, Spades
             suits_order = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
             ranks_order = ['Ace', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 'Jack', 'Queen', 'King']
-            
+
             sorted_cards = []
             for suit in suits_order:
                 for rank in ranks_order:
@@ -56,134 +117,168 @@ class CardDisplay:
                         if filename.startswith(f"{suit} {rank}"):
                             sorted_cards.append(filename)
                             break
-            
+
             # Grid oluştur (4 suit x 13 rank)
-            for i, filename in enumerate(sorted_cards):
-                row = i // 13  # 13 kart per satır
-                col = i % 13   # 13 sütun
-                
-                # Kart görüntüsünü yükle
-                filepath = os.path.join(self.cards_folder, filename)
-                try:
-                    # Görüntüyü büyüt (50x70 piksel - %100 oranında büyütme)
-                    original_image = Image.open(filepath)
-                    resized_image = original_image.resize((50, 70), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(resized_image)
-                    
-                    # Label oluştur
-                    card_name = os.path.splitext(filename)[0]
-                    label = tk.Label(
-                        self.grid_frame,
-                        image=photo,
-                        relief=tk.FLAT,
-                        borderwidth=0,  # Border yok
-                        bg="#FFFFFF",
-                        cursor="hand2"
-                    )
-                    label.image = photo  # Referansı sakla
-                    label.grid(row=row, column=col, padx=3, pady=3)
-                    
-                    # Hover efektleri ekle
-                    label.bind('<Enter>', lambda e, lbl=label: self.on_card_hover_enter(lbl))
-                    label.bind('<Leave>', lambda e, lbl=label: self.on_card_hover_leave(lbl))
-                    
-                    # Tıklama event'i ekle
-                    label.bind('<Button-1>', lambda e, name=card_name: self.on_card_click(name))
-                    
-                    # Kart bilgilerini sakla
-                    self.card_labels[card_name] = label
-                    self.card_images[card_name] = photo
-                    self.card_pil_images[card_name] = resized_image  # Orijinal PIL görüntüsünü sakla
-                    
-                    # Filtrelenmiş görüntüyü önceden oluştur ve sakla
-                    self.create_filtered_image(card_name, resized_image)
-                    
-                except Exception as e:
-                    print(f"Kart yüklenemedi: {filename} - {str(e)}")
-                    
-                    
+            for index, filename in enumerate(sorted_cards):
+                card_name = os.path.splitext(filename)[0]
+                self.card_files[card_name] = filename
+                self.card_cells[card_name] = card_cell(index)
+                self.card_names.append(card_name)
+
+            # Görüntüler yüklenene kadar kart yerleri boş gösterilir
+            self.atlas = placeholder_atlas(len(self.card_names))
+            width, height = self.atlas.size
+            self.canvas = tk.Canvas(self.cards_frame, width=width, height=height, background=BACKGROUND,
+                                    highlightthickness=0, cursor="hand2")
+            self.canvas.pack(expand=True)
+            self.display_image = ImageTk.PhotoImage(self.atlas, master=self.canvas)
+            self.canvas.create_image(0, 0, image=self.display_image, anchor=tk.NW)
+            self.hover_rect = self.canvas.create_rectangle(0, 0, 0, 0, outline=HOVER_OUTLINE, width=2,
+                                                           state=tk.HIDDEN)
+
+            # Tek Canvas üzerinde üç bağlama (kart başına widget ve bağlama yok)
+            self.canvas.bind('<Motion>', self.on_canvas_motion)
+            self.canvas.bind('<Leave>', self.on_canvas_leave)
+            self.canvas.bind('<Button-1>', self.on_canvas_click)
+
+            self.pending_cards = list(self.card_names)
+            if self.deferred_loading:
+                self.canvas.after_idle(self.load_next_chunk)
+            else:
+                self.load_cards(self.pending_cards)
+                self.pending_cards = []
+                self.finish_loading()
+
         except Exception as e:
-            print(f"Kart grid'i oluşturulurken hata: {str(e)}")
-    
-    def create_filtered_image(self, card_name, original_image):
-        """Kart için filtrelenmiş görüntüyü önceden oluştur"""
+            self.logger.error(f"Kart grid'i oluşturulurken hata: {str(e)}")
+
+    def load_cards(self, card_names):
+        """Kart görsellerini diskten yükle, küçült ve atlastaki hücrelerine yerleştir"""
+        for card_name in card_names:
+            filepath = os.path.join(self.cards_folder, self.card_files[card_name])
+            try:
+                with Image.open(filepath) as original_image:
+                    resized_image = original_image.convert('RGBA').resize(CARD_SIZE, Image.Resampling.LANCZOS)
+                # Şeffaf köşeler hücrenin beyaz zemininde kalır
+                self.atlas.paste(resized_image, self.card_cells[card_name], resized_image)
+            except Exception as e:
+                self.logger.warning(f"Kart yüklenemedi: {self.card_files[card_name]} - {str(e)}")
+
+    def load_next_chunk(self):
+        """Ertelenmiş modda bir sonraki kart grubunu yükle, Tk döngüsünü bloklamadan devam et"""
+        chunk = self.pending_cards[:self.load_chunk_size]
+        del self.pending_cards[:self.load_chunk_size]
+        self.load_cards(chunk)
+        if self.pending_cards:
+            self.canvas.after(1, self.load_next_chunk)
+        else:
+            self.finish_loading()
+
+    def finish_loading(self):
+        """Atlasları oluştur, grid'i güncel durumla çiz ve yüklemenin bittiğini bildir"""
         try:
-            # Yarı şeffaf siyah filtre oluştur
-            black_filter = Image.new('RGBA', (50, 70), (0, 0, 0, 128))  # Alpha 128 = yarı şeffaf
-            
-            # Orijinal görüntüyü RGBA'ya çevir
-            original_rgba = original_image.convert('RGBA')
-            
-            # İki görüntüyü birleştir
-            combined_image = Image.alpha_composite(original_rgba, black_filter)
-            
-            # Tkinter PhotoImage'e çevir ve sakla
-            filtered_image = ImageTk.PhotoImage(combined_image)
-            self.card_filtered_images[card_name] = filtered_image
-            
+            self.normal_atlas = ImageTk.PhotoImage(self.atlas, master=self.canvas)
+            self.dimmed_atlas = ImageTk.PhotoImage(dimmed_atlas(self.atlas), master=self.canvas)
+            self.atlas = None  # PIL kopyaları gerekmez, sadece iki atlas ve gösterilen görüntü kalır
+            self.copy_region(self.normal_atlas)
+            # Yükleme sırasında tespit edilen veya tıklanan kartlar
+            self.dirty_cards.update(self.detected_cards)
+            self.redraw()
         except Exception as e:
-            print(f"Filtrelenmiş görüntü oluşturulurken hata: {str(e)}")
-            
+            self.logger.error(f"Kart atlası oluşturulurken hata: {str(e)}")
+        if self.on_loaded:
+            self.on_loaded()
+
+    def copy_region(self, source, box=None):
+        """Atlastan gösterilen görüntüye kopyala (box = (x0, y0, x1, y1); None ise tamamı)"""
+        if box is None:
+            self.canvas.tk.call(str(self.display_image), 'copy', str(source))
+        else:
+            self.canvas.tk.call(str(self.display_image), 'copy', str(source),
+                                '-from', *box, '-to', box[0], box[1])
+
+    def mark_dirty(self, card_names):
+        """Kartları bir sonraki çizime ekle; çizim Tk boşa çıkınca bir kez yapılır"""
+        self.dirty_cards.update(card_names)
+        if self.redraw_job is None:
+            self.redraw_job = self.canvas.after_idle(self.redraw)
+
+    def redraw(self):
+        """Biriken değişiklikleri çiz: her kart için tek bir hücre kopyası"""
+        self.redraw_job = None
+        if self.normal_atlas is None:
+            # Atlaslar henüz hazır değil; finish_loading güncel durumu çizer
+            return
+        dirty_cards, self.dirty_cards = self.dirty_cards, set()
+        for card_name in dirty_cards:
+            x, y = self.card_cells[card_name]
+            source = self.dimmed_atlas if card_name in self.detected_cards else self.normal_atlas
+            self.copy_region(source, (x, y, x + CARD_SIZE[0], y + CARD_SIZE[1]))
+
     def update_detected_cards(self, detected_cards):
-        """Tespit edilen kartları güncelle - sadece değişen kartları güncelle"""
-        
-        # Yeni tespit edilen kartları set'e çevir (hızlı arama için)
-        new_detected_set = {card['name'] for card in detected_cards}
-        
-        # Sadece yeni tespit edilen kartları işaretle
-        for card_name in new_detected_set:
-            if card_name in self.card_labels and card_name not in self.detected_cards:
-                label = self.card_labels[card_name]
-                # Siyah filtre uygula
-                self.apply_black_filter(label, card_name)
-                self.detected_cards.add(card_name)
-                print(f"Yeni kart tespit edildi: {card_name}")
-        
-        # Performans için print sayısını azalt
-        if len(new_detected_set) > 0:
-            print(f"Bu frame'de {len(new_detected_set)} yeni kart tespit edildi")
-    
-    def apply_black_filter(self, label, card_name):
-        """Kartın üzerine siyah filtre uygula - önceden oluşturulmuş görüntüyü kullan"""
-        try:
-            # Önceden oluşturulmuş filtrelenmiş görüntüyü kullan
-            filtered_image = self.card_filtered_images[card_name]
-            
-            # Label'a uygula
-            label.config(image=filtered_image)
-            label.image = filtered_image
-            
-        except Exception as e:
-            print(f"Siyah filtre uygulanırken hata: {str(e)}")
-    
-    def on_card_hover_enter(self, label):
-        """Kart üzerine gelindiğinde"""
-        # Sadece arka plan rengini değiştir, boyut değişmesin
-        label.configure(bg="#F0F8FF")  # Açık mavi hover efekti
-        
-    def on_card_hover_leave(self, label):
-        """Kart üzerinden ayrıldığında"""
-        # Normal arka plan rengine döndür
-        label.configure(bg="#FFFFFF")  # Beyaz arka plan
-        
+        """Tespit edilen kartları güncelle - sadece yeni kartlar çizime eklenir"""
+
+        # Sadece grid'de olan ve henüz işaretlenmemiş kartlar
+        new_cards = {card['name'] for card in detected_cards} & self.card_cells.keys()
+        new_cards -= self.detected_cards
+        if not new_cards:
+            return
+        self.detected_cards.update(new_cards)
+        self.mark_dirty(new_cards)
+        self.logger.info(f"Yeni kart tespit edildi: {', '.join(sorted(new_cards))}")
+
+    def reset(self):
+        """Tüm kartları tespit edilmemiş olarak göster"""
+        self.detected_cards.clear()
+        self.dirty_cards.clear()
+        if self.normal_atlas is not None:
+            self.copy_region(self.normal_atlas)
+
+    def card_at(self, x, y):
+        """Canvas koordinatındaki kartın adı (boşluktaysa None)"""
+        for card_name, (cell_x, cell_y) in self.card_cells.items():
+            if cell_x <= x < cell_x + CARD_SIZE[0] and cell_y <= y < cell_y + CARD_SIZE[1]:
+                return card_name
+        return None
+
+    def on_canvas_motion(self, event):
+        """Fare altındaki kartın çevresine çerçeve çiz"""
+        card_name = self.card_at(event.x, event.y)
+        if card_name == self.hover_card:
+            return
+        self.hover_card = card_name
+        if card_name is None:
+            self.canvas.itemconfigure(self.hover_rect, state=tk.HIDDEN)
+            return
+        x, y = self.card_cells[card_name]
+        self.canvas.coords(self.hover_rect, x - 1, y - 1, x + CARD_SIZE[0] + 1, y + CARD_SIZE[1] + 1)
+        self.canvas.itemconfigure(self.hover_rect, state=tk.NORMAL)
+
+    def on_canvas_leave(self, event):
+        """Fare grid'den ayrıldığında çerçeveyi gizle"""
+        self.hover_card = None
+        self.canvas.itemconfigure(self.hover_rect, state=tk.HIDDEN)
+
+    def on_canvas_click(self, event):
+        """Tıklanan kartı bul ve durumunu değiştir"""
+        card_name = self.card_at(event.x, event.y)
+        if card_name is not None:
+            self.on_card_click(card_name)
+
     def on_card_click(self, card_name):
         """Kart tıklandığında çağrılır"""
         try:
-            if card_name in self.card_labels:
-                label = self.card_labels[card_name]
-                
+            if card_name in self.card_cells:
                 # Kart zaten tespit edilmiş mi kontrol et
                 if card_name in self.detected_cards:
                     # Tespit edilmişse, normal haline döndür
-                    label.config(image=self.card_images[card_name])
-                    label.image = self.card_images[card_name]
                     self.detected_cards.remove(card_name)
-                    print(f"Kart normal haline döndürüldü: {card_name}")
+                    self.logger.info(f"Kart normal haline döndürüldü: {card_name}")
                 else:
                     # Tespit edilmemişse, siyah filtre uygula
-                    self.apply_black_filter(label, card_name)
                     self.detected_cards.add(card_name)
-                    print(f"Kart tespit edildi: {card_name}")
-                    
+                    self.logger.info(f"Kart tespit edildi: {card_name}")
+                self.mark_dirty([card_name])
+
         except Exception as e:
-            print(f"Kart tıklama hatası: {str(e)}") 
\ No newline at end of file
+            self.logger.error(f"Kart tıklama hatası: {str(e)}")
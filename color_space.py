@@ -0,0 +1,35 @@
+import cv2
+import numpy as np
+
+# Eşleştirme renk uzayları: "bgr" = 3 kanal (varsayılan), diğerleri tek kanal
+COLOR_MODES = ("bgr", "gray", "blue", "green", "red")
+CHANNEL_INDEX = {"blue": 0, "green": 1, "red": 2}
+
+INK_THRESHOLD = 60  # Mürekkep sayılacak minimum koyuluk (en koyu kanalda)
+RED_MARGIN = 60  # Kırmızı mürekkepte R'nin G ve B'den en az bu kadar büyük olması
+RED_INK_FRACTION = 0.5  # Mürekkebin bu oranından fazlası kırmızıysa kart kırmızıdır
+
+
+def to_match_space(image, mode):
+    """BGR görüntüyü eşleştirme renk uzayına çevir (tek kanallı modlarda 2 boyutlu)"""
+    if mode == "bgr" or image.ndim == 2:
+        return image
+    if mode == "gray":
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return cv2.extractChannel(image, CHANNEL_INDEX[mode])
+
+
+def red_ink_fraction(image):
+    """Koyu (mürekkep) piksellerden kırmızı olanların oranı; mürekkep yoksa 0"""
+    image = image.astype(np.int16)
+    ink = image.min(axis=2) < 255 - INK_THRESHOLD
+    ink_count = int(ink.sum())
+    if not ink_count:
+        return 0.0
+    red = (image[:, :, 2] - np.maximum(image[:, :, 0], image[:, :, 1]) > RED_MARGIN) & ink
+    return float(red.sum()) / ink_count
+
+
+def is_red_suit(image):
+    """Kartın mürekkebi kırmızı mı (kupa/karo) yoksa siyah mı (sinek/maça)"""
+    return red_ink_fraction(image) >= RED_INK_FRACTION
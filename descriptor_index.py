@@ -0,0 +1,79 @@
+import cv2
+import numpy as np
+
+DESCRIPTOR_SIZE = (6, 12)  # (genişlik, yükseklik)
+
+
+class DescriptorIndex:
+    """Kart şablonlarının kompakt tanımlayıcılarından oluşan en yakın komşu indeksi.
+
+    Her şablon küçük bir boyuta indirgenip ortalaması çıkarılmış, birim
+    uzunlukta bir vektöre çevrilir. Bir aday bölge tek bir matris çarpımıyla
+    tüm desteyle karşılaştırılır; bu yüzden sınıflandırma maliyeti deste
+    büyüklüğünden neredeyse bağımsızdır.
+    """
+
+    def __init__(self, templates, descriptor_size=DESCRIPTOR_SIZE, descriptors=None):
+        self.descriptor_size = descriptor_size  # (genişlik, yükseklik)
+        self.card_names = []
+        self.descriptors = None
+        self.template_shape = None
+        if descriptors is not None:
+            # Şablon bankasından önceden hesaplanmış tanımlayıcılar
+            self.card_names = list(templates.keys())
+            self.template_shape = next(iter(templates.values())).shape[:2]
+            self.descriptors = descriptors
+        else:
+            self.build(templates)
+
+    def describe(self, image):
+        """Görüntüyü birim uzunlukta kompakt tanımlayıcıya çevir"""
+        small = cv2.resize(image, self.descriptor_size, interpolation=cv2.INTER_AREA)
+        vector = small.astype(np.float32).ravel()
+        vector -= vector.mean()
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def build(self, templates):
+        """Şablonların tanımlayıcılarını yükleme sırasında hesapla"""
+        self.card_names = list(templates.keys())
+        if not self.card_names:
+            self.descriptors = None
+            return
+        self.template_shape = next(iter(templates.values())).shape[:2]
+        self.descriptors = np.stack([self.describe(templates[name]) for name in self.card_names])
+
+    def query(self, patch, max_offset=0, skip_cards=(), top_k=5):
+        """Bölgenin sol üst köşesindeki şablon boyutlu pencereyi sınıflandır.
+
+        Hizalama hatalarını karşılamak için köşe etrafında max_offset kadar
+        kaydırılmış pencereler de denenir. (benzerlik, kart_adı) listesini
+        en benzerden başlayarak döndürür.
+        """
+        if self.descriptors is None:
+            return []
+        h, w = self.template_shape
+        patch_h, patch_w = patch.shape[:2]
+
+        windows = []
+        for dy in range(0, min(max_offset, patch_h - h) + 1):
+            for dx in range(0, min(max_offset, patch_w - w) + 1):
+                windows.append(self.describe(patch[dy:dy + h, dx:dx + w]))
+        if not windows:
+            return []
+
+        # Tüm pencereler x tüm kartlar: tek matris çarpımı
+        similarities = np.stack(windows) @ self.descriptors.T
+        best = similarities.max(axis=0)
+
+        ranked = []
+        for i in np.argsort(-best):
+            card_name = self.card_names[i]
+            if card_name in skip_cards:
+                continue
+            ranked.append((float(best[i]), card_name))
+            if len(ranked) >= top_k:
+                break
+        return ranked
@@ -0,0 +1,159 @@
+import cv2
+import numpy as np
+
+from peak_suppression import find_peaks
+
+
+class FFTMatcher:
+    """Tüm şablonları tek geçişte frekans uzayında eşleştiren motor.
+
+    Frame'in spektrumu bir kez hesaplanır, şablon spektrumları sadece son
+    frame boyutu için (complex64) saklanır; boyut değişince yeniden
+    hesaplanır. Korelasyon şablonlar chunk_size'lık gruplar halinde yapılır,
+    böylece ara diziler tüm banka kadar büyümez. Sonuçlar
+    cv2.TM_CCOEFF_NORMED ile aynı formülü (çok kanallı normalizasyon ve
+    OpenCV'nin yuvarlama korumaları dahil) kullanır; matchTemplate de float32
+    çalıştığı için eşik kararları uzamsal eşleştirmeyle aynıdır.
+    """
+
+    def __init__(self, templates, chunk_size=8):
+        self.templates = {}
+        self.template_norms = {}
+        self.template_shape = None
+        self.chunk_size = chunk_size  # Aynı anda korele edilen şablon sayısı
+        self.spectra_shape = None  # Saklanan spektrumların DFT boyutu
+        self.template_spectra = None  # (isim -> indeks, spektrumlar)
+        self.set_templates(templates)
+
+    def set_templates(self, templates):
+        """Şablonları ortalamadan arındırıp normlarıyla birlikte sakla"""
+        self.templates = {}
+        self.template_norms = {}
+        self.spectra_shape = None
+        self.template_spectra = None
+        self.template_shape = None
+
+        for card_name, template in templates.items():
+            if self.template_shape is None:
+                self.template_shape = template.shape
+            elif template.shape != self.template_shape:
+                raise ValueError("FFT motoru için tüm şablonlar aynı boyutta olmalı")
+
+            template_f = template.astype(np.float32)
+            if template_f.ndim == 2:
+                template_f = template_f[:, :, None]
+            # Kanal bazında ortalamayı çıkar (TM_CCOEFF)
+            template_zm = template_f - template_f.mean(axis=(0, 1), keepdims=True)
+            self.templates[card_name] = template_zm
+            self.template_norms[card_name] = float(np.sqrt(np.sum(template_zm.astype(np.float64) ** 2)))
+
+    def _fft_shape(self, frame_shape):
+        """Frame boyutu için hızlı DFT boyutunu döndür"""
+        height, width = frame_shape[:2]
+        return cv2.getOptimalDFTSize(height), cv2.getOptimalDFTSize(width)
+
+    def _get_spectra(self, frame_shape):
+        """Şablon spektrumlarını frame boyutu için hazırla (sadece son boyut saklanır)"""
+        fft_shape = self._fft_shape(frame_shape)
+        if self.spectra_shape == fft_shape:
+            return self.template_spectra
+        # Eski boyutun spektrumları yenisi hesaplanmadan bırakılır (tepe bellek iki banka olmasın)
+        self.spectra_shape = None
+        self.template_spectra = None
+
+        names = list(self.templates.keys())
+        h, w = self.template_shape[:2]
+        channels = self.templates[names[0]].shape[2] if names else 1
+        spectra = np.empty((len(names), channels, fft_shape[0], fft_shape[1] // 2 + 1), dtype=np.complex64)
+        padded = np.zeros((channels, fft_shape[0], fft_shape[1]), dtype=np.float32)
+        for i, card_name in enumerate(names):
+            padded[:, :h, :w] = np.moveaxis(self.templates[card_name], 2, 0)
+            # Korelasyon = IFFT(F(frame) * conj(F(şablon)))
+            spectra[i] = np.conj(np.fft.rfft2(padded))
+        index = {card_name: i for i, card_name in enumerate(names)}
+        self.spectra_shape = fft_shape
+        self.template_spectra = (index, spectra)
+        return self.template_spectra
+
+    def _window_energy(self, frame_f):
+        """Her pencere için sum(I^2) - sum(I)^2/N değerini integral görüntüyle hesapla"""
+        h, w = self.template_shape[:2]
+        count = h * w
+        wnd_sum2 = 0.0
+        wnd_mean2 = 0.0
+        for c in range(frame_f.shape[2]):
+            channel = frame_f[:, :, c]
+            integral, integral_sq = cv2.integral2(channel, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+            s1 = integral[h:, w:] - integral[:-h, w:] - integral[h:, :-w] + integral[:-h, :-w]
+            s2 = integral_sq[h:, w:] - integral_sq[:-h, w:] - integral_sq[h:, :-w] + integral_sq[:-h, :-w]
+            wnd_sum2 = wnd_sum2 + s2
+            wnd_mean2 = wnd_mean2 + s1 * s1 / count
+        return wnd_sum2, wnd_mean2
+
+    def match(self, frame, card_names=None, threshold=None):
+        """Frame'i verilen şablonlarla eşleştir.
+
+        {kart_adı: (max_val, max_loc)} sözlüğü döndürür; max_loc (x, y) biçimindedir.
+        threshold verilirse her şablon için eşiği geçen tüm tepe noktaları
+        {kart_adı: [(skor, (x, y))]} olarak döndürülür.
+        """
+        if not self.templates:
+            return {}
+        if card_names is None:
+            card_names = list(self.templates.keys())
+        if not card_names:
+            return {}
+
+        h, w = self.template_shape[:2]
+        frame_h, frame_w = frame.shape[:2]
+        if frame_h < h or frame_w < w:
+            return {}
+
+        frame_f = frame.astype(np.float32)
+        if frame_f.ndim == 2:
+            frame_f = frame_f[:, :, None]
+
+        index, spectra = self._get_spectra(frame.shape)
+        fft_shape = self._fft_shape(frame.shape)
+        result_h = frame_h - h + 1
+        result_w = frame_w - w + 1
+
+        # Frame spektrumu bir kez hesaplanır, tüm şablonlar paylaşır
+        frame_spectrum = np.fft.rfft2(np.moveaxis(frame_f, 2, 0), s=fft_shape).astype(np.complex64)
+
+        wnd_sum2, wnd_mean2 = self._window_energy(frame_f)
+        diff2 = np.maximum(wnd_sum2 - wnd_mean2, 0)
+        # OpenCV ile aynı yuvarlama koruması
+        flat = diff2 <= np.minimum(0.5, 10 * np.finfo(np.float32).eps * wnd_sum2)
+        window_norm = np.where(flat, 0.0, np.sqrt(diff2)).astype(np.float32)
+
+        results = {}
+        for start in range(0, len(card_names), self.chunk_size):
+            chunk = card_names[start:start + self.chunk_size]
+            selected = [index[card_name] for card_name in chunk]
+            products = np.einsum('chw,nchw->nhw', frame_spectrum, spectra[selected])
+            correlations = np.fft.irfft2(products, s=fft_shape)[:, :result_h, :result_w].astype(np.float32)
+
+            norms = np.array([self.template_norms[card_name] for card_name in chunk], dtype=np.float32)
+            t = window_norm[None, :, :] * norms[:, None, None]
+            abs_num = np.abs(correlations)
+            scores = np.where(
+                abs_num < t,
+                correlations / np.where(t > 0, t, 1.0),
+                np.where(abs_num < t * 1.125, np.sign(correlations), 0.0)
+            ).astype(np.float32)
+
+            if threshold is not None:
+                # Sadece eşiği geçen haritalarda tepe araması yapılır
+                maxima = scores.reshape(len(chunk), -1).max(axis=1)
+                for i, card_name in enumerate(chunk):
+                    results[card_name] = (find_peaks(scores[i], threshold, self.template_shape)
+                                          if maxima[i] >= threshold else [])
+                continue
+
+            best = scores.reshape(len(chunk), -1).argmax(axis=1)
+            for i, card_name in enumerate(chunk):
+                y, x = divmod(int(best[i]), result_w)
+                results[card_name] = (float(scores[i, y, x]), (x, y))
+
+        return results
@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+
+
+def selection_monitor(selection_coords):
+    """(x1, y1, x2, y2) seçimini mss monitor sözlüğüne çevir"""
+    x1, y1, x2, y2 = selection_coords
+    return {"top": y1, "left": x1, "width": x2 - x1, "height": y2 - y1}
+
+
+def bgra_view(screenshot):
+    """mss ekran görüntüsünün ham BGRA tamponunu kopyalamadan NumPy görünümü olarak döndür"""
+    return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+
+
+def grab_bgr(sct, selection_coords, metrics=None):
+    """Seçili alanı yakala ve tek bir dönüşümle bitişik BGR ndarray döndür.
+
+    mss'in RGB'ye yeniden paketlemesi, PIL görüntüsü, np.array ve RGB2BGR
+    adımlarının yerini tek bir cvtColor alır. Bitişik dizi, her şablon
+    eşleştirmesinde OpenCV'nin görünümü yeniden kopyalamasını önler.
+    metrics verilirse 'grab' ve 'color_convert' aşamaları ayrı ölçülür.
+    """
+    if metrics is None:
+        screenshot = sct.grab(selection_monitor(selection_coords))
+        return cv2.cvtColor(bgra_view(screenshot), cv2.COLOR_BGRA2BGR)
+    with metrics.timer("grab"):
+        screenshot = sct.grab(selection_monitor(selection_coords))
+    with metrics.timer("color_convert"):
+        return cv2.cvtColor(bgra_view(screenshot), cv2.COLOR_BGRA2BGR)
+
+
+def union_coords(coords_list):
+    """Seçimlerin hepsini kapsayan en küçük (x1, y1, x2, y2) dikdörtgen"""
+    return (min(c[0] for c in coords_list), min(c[1] for c in coords_list),
+            max(c[2] for c in coords_list), max(c[3] for c in coords_list))
+
+
+def grab_regions_bgr(sct, coords_list, metrics=None):
+    """Birden fazla seçimi tek mss yakalamasıyla al, her biri için bitişik BGR ndarray döndür.
+
+    Tüm seçimleri kapsayan dikdörtgen bir kez yakalanır; her seçim ham
+    BGRA tamponundan kopyasız dilimlenir ve sadece kendi pikselleri BGR'ye
+    çevrilir. Seçimler birbirinden çok uzaksa aradaki pikseller de yakalanır,
+    ama ekran başına tek çağrı birden çok küçük çağrıdan ucuzdur.
+    """
+    if len(coords_list) == 1:
+        return [grab_bgr(sct, coords_list[0], metrics)]
+    bounds = union_coords(coords_list)
+    if metrics is None:
+        view = bgra_view(sct.grab(selection_monitor(bounds)))
+    else:
+        with metrics.timer("grab"):
+            view = bgra_view(sct.grab(selection_monitor(bounds)))
+    frames = []
+    for x1, y1, x2, y2 in coords_list:
+        region = view[y1 - bounds[1]:y2 - bounds[1], x1 - bounds[0]:x2 - bounds[0]]
+        if metrics is None:
+            frames.append(cv2.cvtColor(region, cv2.COLOR_BGRA2BGR))
+        else:
+            with metrics.timer("color_convert"):
+                frames.append(cv2.cvtColor(region, cv2.COLOR_BGRA2BGR))
+    return frames
@@ -0,0 +1,161 @@
+import cv2
+import numpy as np
+
+# CROPPEDCARDS şablonlarında köşe indeksinin geometrisi (şablon boyutuna oranla)
+RANK_REGION_HEIGHT = 33 / 50  # Üst kısım: rakam/harf
+GLYPH_REGION_WIDTH = 21 / 26  # Sağ kenardaki kart deseni hariç
+INK_THRESHOLD = 60  # Mürekkep sayılacak minimum koyuluk
+GLYPH_PADDING = 2  # Sıkı kırpmanın etrafında bırakılan beyaz pay
+
+
+def ink_map(image):
+    """BGR görüntüyü tek kanallı mürekkep haritasına çevir (kırmızı ve siyah aynı görünür)"""
+    if image.ndim == 2:
+        return 255 - image
+    return 255 - image.min(axis=2)
+
+
+def split_card_name(card_name):
+    """'Hearts Ace' -> ('Hearts', 'Ace')"""
+    suit, rank = card_name.split(" ", 1)
+    return suit, rank
+
+
+class GlyphMatcher:
+    """Kartları sadece köşe indeksinden (rank + suit glifleri) tanıyan motor.
+
+    52 tam şablon yerine ~13 rank ve 4 suit glifi aranır ve sonuçlar
+    konuma göre eşleştirilerek 'Suit Rank' kart adına çevrilir. Sadece köşe
+    indeksi görünen, üstü kısmen kapalı kartlar da bu şekilde bulunur.
+    """
+
+    def __init__(self, templates, rank_threshold=0.95, suit_threshold=0.97,
+                 variant_threshold=0.95, position_tolerance=4, ink_maps=None):
+        self.rank_threshold = rank_threshold
+        self.suit_threshold = suit_threshold
+        self.variant_threshold = variant_threshold  # Bu değerin üstünde benzeyen glifler tekrar eklenmez
+        self.position_tolerance = position_tolerance
+        self.rank_glyphs = []  # (rank, glif, (x_ofset, y_ofset))
+        self.suit_glyphs = []  # (suit, glif, (x_ofset, y_ofset))
+        self.template_shape = None
+        self.build_glyphs(templates, ink_maps)
+
+    def _tight_crop(self, region, x_origin, y_origin):
+        """Mürekkep içeren alanı küçük bir payla kırp, kırpmanın şablondaki konumunu döndür"""
+        ys, xs = np.where(region > INK_THRESHOLD)
+        if len(ys) == 0:
+            return None, None
+        y0 = max(ys.min() - GLYPH_PADDING, 0)
+        y1 = min(ys.max() + GLYPH_PADDING + 1, region.shape[0])
+        x0 = max(xs.min() - GLYPH_PADDING, 0)
+        x1 = min(xs.max() + GLYPH_PADDING + 1, region.shape[1])
+        return region[y0:y1, x0:x1].copy(), (x_origin + x0, y_origin + y0)
+
+    def _is_known_variant(self, glyph, variants):
+        """Glif mevcut varyantlardan biriyle zaten temsil ediliyor mu?"""
+        padded = np.pad(glyph, 4)
+        for known in variants:
+            if known.shape[0] > padded.shape[0] or known.shape[1] > padded.shape[1]:
+                continue
+            result = cv2.matchTemplate(padded, known, cv2.TM_CCOEFF_NORMED)
+            if cv2.minMaxLoc(result)[1] >= self.variant_threshold:
+                return True
+        return False
+
+    def build_glyphs(self, templates, ink_maps=None):
+        """Tam kart şablonlarından rank ve suit gliflerini çıkar.
+
+        Aynı rank farklı renklerde hafif farklı çizildiği için, mevcut
+        gliflere yeterince benzemeyen çizimler ek varyant olarak saklanır.
+        """
+        self.rank_glyphs = []
+        self.suit_glyphs = []
+        rank_variants = {}
+        suit_variants = {}
+
+        for card_name, template in templates.items():
+            suit, rank = split_card_name(card_name)
+            ink = ink_maps[card_name] if ink_maps is not None else ink_map(template)
+            height, width = ink.shape[:2]
+            self.template_shape = (height, width)
+            split = int(round(height * RANK_REGION_HEIGHT))
+            glyph_width = int(round(width * GLYPH_REGION_WIDTH))
+
+            glyph, offset = self._tight_crop(ink[:split, :glyph_width], 0, 0)
+            if glyph is not None and not self._is_known_variant(glyph, rank_variants.setdefault(rank, [])):
+                rank_variants[rank].append(glyph)
+                self.rank_glyphs.append((rank, glyph, offset))
+
+            glyph, offset = self._tight_crop(ink[split:, :glyph_width], 0, split)
+            if glyph is not None and not self._is_known_variant(glyph, suit_variants.setdefault(suit, [])):
+                suit_variants[suit].append(glyph)
+                self.suit_glyphs.append((suit, glyph, offset))
+
+    def _find_hits(self, ink, glyph, threshold):
+        """Eşiği geçen tüm konumları, yakın tekrarları bastırarak döndür"""
+        if ink.shape[0] < glyph.shape[0] or ink.shape[1] < glyph.shape[1]:
+            return []
+        result = cv2.matchTemplate(ink, glyph, cv2.TM_CCOEFF_NORMED)
+        ys, xs = np.where(result >= threshold)
+        if len(ys) == 0:
+            return []
+
+        order = np.argsort(-result[ys, xs])
+        hits = []
+        min_distance = max(glyph.shape[:2]) // 2
+        for i in order:
+            x, y = int(xs[i]), int(ys[i])
+            if all(abs(x - hx) > min_distance or abs(y - hy) > min_distance for _, (hx, hy) in hits):
+                hits.append((float(result[y, x]), (x, y)))
+        return hits
+
+    def match(self, frame, skip_cards=()):
+        """Frame'deki kartları köşe indeksinden bul.
+
+        detect_cards ile aynı biçimde {'name', 'confidence', 'location'}
+        sözlükleri döndürür; location, tam şablonun sol üst köşesine karşılık gelir.
+        """
+        ink = ink_map(frame)
+        if ink.dtype != np.uint8:
+            ink = ink.astype(np.uint8)
+
+        suit_hits = []
+        for suit, glyph, offset in self.suit_glyphs:
+            for score, (x, y) in self._find_hits(ink, glyph, self.suit_threshold):
+                # Şablonun sol üst köşesine göre konum
+                suit_hits.append((suit, score, (x - offset[0], y - offset[1])))
+        if not suit_hits:
+            return []
+
+        candidates = []
+        for rank, glyph, offset in self.rank_glyphs:
+            for score, (x, y) in self._find_hits(ink, glyph, self.rank_threshold):
+                origin = (x - offset[0], y - offset[1])
+                for suit, suit_score, suit_origin in suit_hits:
+                    # Rank ve suit aynı kartın köşesinde olmalı
+                    if (abs(origin[0] - suit_origin[0]) <= self.position_tolerance and
+                            abs(origin[1] - suit_origin[1]) <= self.position_tolerance):
+                        card_name = f"{suit} {rank}"
+                        if card_name in skip_cards:
+                            continue
+                        candidates.append((min(score, suit_score), card_name, origin))
+
+        # Aynı köşe için en güvenilir eşleşmeyi tut
+        candidates.sort(reverse=True)
+        detected_cards = []
+        used_origins = []
+        seen_names = set()
+        for confidence, card_name, origin in candidates:
+            if card_name in seen_names:
+                continue
+            if any(abs(origin[0] - ox) <= self.position_tolerance and abs(origin[1] - oy) <= self.position_tolerance
+                   for ox, oy in used_origins):
+                continue
+            seen_names.add(card_name)
+            used_origins.append(origin)
+            detected_cards.append({
+                'name': card_name,
+                'confidence': confidence,
+                'location': origin
+            })
+        return detected_cards
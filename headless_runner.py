@@ -0,0 +1,193 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import cv2
+
+from card_detector import CardDetector
+from synthetic_scenes import SyntheticSceneSource
+
+
+def iter_image_frames(folder, source_fps):
+    """Klasördeki görüntüleri ada göre sıralı olarak (zaman damgası, frame, etiket) üret"""
+    filenames = sorted(f for f in os.listdir(folder) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')))
+    for index, filename in enumerate(filenames):
+        frame = cv2.imread(os.path.join(folder, filename), cv2.IMREAD_COLOR)
+        if frame is None:
+            logging.getLogger(__name__).warning(f"Görüntü okunamadı: {filename}")
+            continue
+        yield index / source_fps, frame, filename
+
+
+def iter_video_frames(path):
+    """Video dosyasının frame'lerini (zaman damgası, frame, frame numarası) olarak üret"""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError(f"Video açılamadı: {path}")
+    try:
+        index = 0
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, frame, index
+            index += 1
+    finally:
+        capture.release()
+
+
+def video_fps(path, default):
+    """Videonun kayıt hızını oku, bilinmiyorsa varsayılanı döndür"""
+    capture = cv2.VideoCapture(path)
+    fps = capture.get(cv2.CAP_PROP_FPS) if capture.isOpened() else 0
+    capture.release()
+    return fps if fps and fps > 0 else default
+
+
+def iter_synthetic_frames(source, count, source_fps, card_detector):
+    """Sentetik sahne frame'leri; yeni oyunda detektör RESET'e basılmış gibi sıfırlanır"""
+    games = source.games
+    for index, (frame, _) in enumerate(source.frames(count)):
+        if source.games != games:
+            games = source.games
+            card_detector.reset_detection_state()
+        yield index / source_fps, frame, index
+
+
+def build_detector(args):
+    """Komut satırı seçeneklerinden CardDetector oluştur"""
+    return CardDetector(
+        cards_folder=args.cards_folder,
+        match_engine=args.engine,
+        pyramid_levels=args.pyramid_levels,
+        detection_mode=args.mode,
+        localize_cards=args.localize,
+        use_descriptor_index=args.descriptor_index,
+        backend=args.backend,
+        process_workers=args.workers,
+        incremental=args.incremental,
+        template_bank_path=None if args.no_template_bank else args.template_bank,
+        hot_zones_path=args.hot_zones,
+        full_scan_interval=args.full_scan_interval,
+        color_mode=args.color_mode,
+        template_scale=args.template_scale,
+        match_threshold=args.match_threshold,
+        template_prefilter=not args.no_prefilter
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Kayıtlı frame'ler, video veya sentetik sahneler üzerinde ekransız kart tespiti")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--images", metavar="KLASÖR", help="Sıralı frame görüntülerinin bulunduğu klasör")
+    source.add_argument("--video", metavar="DOSYA", help="Video dosyası")
+    source.add_argument("--synthetic", metavar="N", type=int, help="N adet sentetik masa frame'i üret")
+    parser.add_argument("--output", default="-", help="JSON-lines çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--all-frames", action="store_true", help="Kart tespit edilmeyen frame'leri de yaz")
+    parser.add_argument("--limit", type=int, default=None, help="En fazla bu kadar frame işle")
+    parser.add_argument("--source-fps", type=float, default=20.0,
+                        help="Görüntü/sentetik kaynağın gerçek zamanlı hızı (varsayılan: 20, yakalama aralığı 0.05 s)")
+    parser.add_argument("--seed", type=int, default=0, help="Sentetik sahne tohumu")
+    parser.add_argument("--cards-folder", default="CROPPEDCARDS")
+    parser.add_argument("--engine", choices=["spatial", "fft"], default="spatial")
+    parser.add_argument("--mode", choices=["card", "glyph"], default="card")
+    parser.add_argument("--pyramid-levels", type=int, default=0)
+    parser.add_argument("--localize", action="store_true")
+    parser.add_argument("--color-mode", choices=["bgr", "gray", "blue", "green", "red"], default="bgr",
+                        help="Eşleştirme renk uzayı (tek kanal ~3 kat daha ucuz)")
+    parser.add_argument("--descriptor-index", action="store_true")
+    parser.add_argument("--backend", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--template-bank", default="template_bank.bin")
+    parser.add_argument("--template-scale", type=float, default=1.0,
+                        help="Şablon ölçeği (scale_calibration.py ile bulunur)")
+    parser.add_argument("--match-threshold", type=float, default=0.99,
+                        help="Eşleşme eşiği (ölçeklenmiş şablonlarda kalibrasyonun önerdiği değer)")
+    parser.add_argument("--no-template-bank", action="store_true")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="Renk ön filtresini kapat (karşılaştırma için)")
+    parser.add_argument("--hot-zones", metavar="DOSYA", default=None,
+                        help="Sıcak bölge dosyası (geçmiş tespit konumları önce taranır)")
+    parser.add_argument("--full-scan-interval", type=int, default=10,
+                        help="Sıcak bölge kullanılırken bu kadar bölge taramasında bir tam tarama")
+    parser.add_argument("--metrics", action="store_true", help="Sonunda aşama sürelerinin p50/p95/p99 raporunu yaz")
+    parser.add_argument("--verbose", action="store_true", help="Detektörün INFO loglarını göster")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Detektörden önce yapılandırılır; böylece loglar stderr'e gider, JSON çıktısına karışmaz
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    card_detector = build_detector(args)
+    if args.video:
+        source_fps = video_fps(args.video, args.source_fps)
+        frames = iter_video_frames(args.video)
+    elif args.images:
+        source_fps = args.source_fps
+        frames = iter_image_frames(args.images, source_fps)
+    else:
+        source_fps = args.source_fps
+        scenes = SyntheticSceneSource(cards_folder=args.cards_folder, seed=args.seed)
+        frames = iter_synthetic_frames(scenes, args.synthetic, source_fps, card_detector)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    frame_count = 0
+    detection_count = 0
+    media_time = 0.0
+    started = time.perf_counter()
+    try:
+        for timestamp, frame, label in frames:
+            if args.limit is not None and frame_count >= args.limit:
+                break
+            frame_started = time.perf_counter()
+            detected_cards = card_detector.detect_cards(frame)
+            latency = time.perf_counter() - frame_started
+            frame_count += 1
+            detection_count += len(detected_cards)
+            media_time = timestamp
+
+            if detected_cards or args.all_frames:
+                record = {
+                    'frame': frame_count - 1,
+                    'source': label,
+                    'timestamp': round(timestamp, 4),
+                    'wall_time': time.time(),
+                    'latency_ms': round(latency * 1000, 3),
+                    'cards': [{
+                        'name': card['name'],
+                        'confidence': round(float(card['confidence']), 4),
+                        'location': [int(card['location'][0]), int(card['location'][1])]
+                    } for card in detected_cards]
+                }
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        elapsed = time.perf_counter() - started
+        if output is not sys.stdout:
+            output.close()
+        card_detector.shutdown()
+
+    fps = frame_count / elapsed if elapsed > 0 else 0.0
+    # Son frame'in zaman damgası + bir frame süresi = kaynağın gerçek zamanlı süresi
+    realtime = media_time + 1.0 / source_fps if frame_count else 0.0
+    speed = realtime / elapsed if elapsed > 0 else 0.0
+    print(f"Frame: {frame_count} - Tespit: {detection_count} - Süre: {elapsed:.2f}s - "
+          f"FPS: {fps:.1f} - Kaynak FPS: {source_fps:.1f} - Gerçek zamanın {speed:.1f} katı",
+          file=sys.stderr)
+    if args.metrics:
+        print(card_detector.metrics.format_report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import threading
+import time
+
+
+class HotZoneMap:
+    """Geçmiş tespitlerin toplandığı bölgeler (sıcak bölgeler).
+
+    Pişti masasında kartlar hep aynı birkaç yere düşer (orta yığın, el
+    kartları). Her tespit kutusu, yakınındaki bir bölgeyle birleştirilir
+    veya yeni bölge açar; bölgeler seçim alanına göre (x, y, genişlik,
+    yükseklik) olarak JSON dosyasında saklanır ve sonraki açılışlarda
+    yeniden kullanılır. Seçim alanı veya frame boyutu değişirse bölgeler
+    geçersizdir ve sıfırlanır.
+    """
+
+    def __init__(self, path=None, merge_distance=12, max_zones=8):
+        self.path = path
+        self.merge_distance = merge_distance  # Bu kadar yakın kutular aynı bölgeye katılır
+        self.max_zones = max_zones  # Aşılırsa en az isabet alan bölge atılır
+        self.area = None  # Bölgelerin ait olduğu seçim alanı (x1, y1, x2, y2)
+        self.frame_shape = None  # (yükseklik, genişlik)
+        self.zones = []  # [{'x', 'y', 'w', 'h', 'hits'}]
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self):
+        """Kayıtlı bölgeleri yükle; dosya yoksa veya okunamazsa boş başla"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.area = tuple(data['area']) if data.get('area') else None
+            self.frame_shape = tuple(data['frame_shape']) if data.get('frame_shape') else None
+            self.zones = [dict(zone) for zone in data.get('zones', [])]
+            self.logger.info(f"Sıcak bölgeler yüklendi: {self.path} ({len(self.zones)} bölge)")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Sıcak bölgeler okunamadı, sıfırdan başlanıyor: {str(e)}")
+            self.zones = []
+            return False
+
+    def save(self):
+        """Bölgeleri geçici dosyaya yazıp yerine taşı (yarım dosya kalmasın)"""
+        if not self.path:
+            return
+        with self.lock:
+            data = {
+                'area': list(self.area) if self.area else None,
+                'frame_shape': list(self.frame_shape) if self.frame_shape else None,
+                'zones': [dict(zone) for zone in self.zones],
+                'timestamp': time.time()
+            }
+        temp_path = f"{self.path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            self.logger.warning(f"Sıcak bölgeler kaydedilemedi: {str(e)}")
+
+    def reset(self, area=None):
+        """Bölgeleri temizle (yeni seçim alanı veya yeni masa düzeni)"""
+        with self.lock:
+            self.area = tuple(area) if area else None
+            self.frame_shape = None
+            self.zones = []
+        self.save()
+
+    def set_area(self, area):
+        """Seçim alanını bildir; kayıtlı bölgeler başka bir alana aitse sıfırla"""
+        area = tuple(area) if area else None
+        if area == self.area:
+            return False
+        if self.area is not None or self.zones:
+            self.logger.info("Seçim alanı değişti, sıcak bölgeler sıfırlandı")
+        self.reset(area)
+        return True
+
+    def matches_frame(self, frame_shape):
+        """Bölgeler bu boyuttaki frame için geçerli mi"""
+        return self.frame_shape == tuple(frame_shape[:2])
+
+    def record(self, boxes, frame_shape):
+        """Tespit kutularını (x, y, genişlik, yükseklik) bölgelere işle.
+
+        Bölge sayısı veya sınırları değiştiyse True döner (kaydetmek gerekir);
+        sadece isabet sayısı artan bölgeler için dosya yeniden yazılmaz.
+        """
+        frame_shape = tuple(frame_shape[:2])
+        changed = False
+        with self.lock:
+            if self.frame_shape != frame_shape:
+                self.frame_shape = frame_shape
+                self.zones = []
+                changed = True
+
+            for x, y, w, h in boxes:
+                zone = self._nearest_zone(x, y, w, h)
+                if zone is None:
+                    self.zones.append({'x': int(x), 'y': int(y), 'w': int(w), 'h': int(h), 'hits': 1})
+                    changed = True
+                    continue
+                zone['hits'] += 1
+                x0, y0 = min(zone['x'], x), min(zone['y'], y)
+                x1 = max(zone['x'] + zone['w'], x + w)
+                y1 = max(zone['y'] + zone['h'], y + h)
+                if (x0, y0, x1 - x0, y1 - y0) != (zone['x'], zone['y'], zone['w'], zone['h']):
+                    zone.update(x=int(x0), y=int(y0), w=int(x1 - x0), h=int(y1 - y0))
+                    changed = True
+
+            if len(self.zones) > self.max_zones:
+                self.zones.sort(key=lambda zone: zone['hits'], reverse=True)
+                del self.zones[self.max_zones:]
+                changed = True
+        return changed
+
+    def _nearest_zone(self, x, y, w, h):
+        """Kutuya merge_distance'tan yakın ilk bölge (yoksa None)"""
+        d = self.merge_distance
+        for zone in self.zones:
+            if (x - d < zone['x'] + zone['w'] and zone['x'] < x + w + d and
+                    y - d < zone['y'] + zone['h'] and zone['y'] < y + h + d):
+                return zone
+        return None
+
+    def search_rects(self, frame_shape, margin, min_size):
+        """Taranacak bölgeler: payla genişletilmiş, frame'e kırpılmış (x, y, genişlik, yükseklik).
+
+        Her bölge en az şablon boyutu (min_size = (yükseklik, genişlik)) kadardır.
+        """
+        frame_h, frame_w = frame_shape[:2]
+        min_h, min_w = min_size
+        rects = []
+        with self.lock:
+            zones = list(self.zones)
+        for zone in zones:
+            x0 = max(zone['x'] - margin, 0)
+            y0 = max(zone['y'] - margin, 0)
+            x1 = min(max(zone['x'] + zone['w'] + margin, x0 + min_w), frame_w)
+            y1 = min(max(zone['y'] + zone['h'] + margin, y0 + min_h), frame_h)
+            if x1 - x0 < min_w or y1 - y0 < min_h:
+                continue
+            rects.append((x0, y0, x1 - x0, y1 - y0))
+        return rects
@@ -0,0 +1,90 @@
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """Frame başına tekrarlanan kayıtları özetleyen filtre.
+
+    Sadece extra={'rate_key': ...} ile işaretlenmiş kayıtlara dokunur: aynı
+    anahtar için interval saniyede en fazla bir kayıt geçer, aradakiler
+    sayılır ve bir sonraki geçen kayda "N benzer kayıt özetlendi" notu eklenir.
+    """
+
+    def __init__(self, interval=5.0):
+        super().__init__()
+        self.interval = interval
+        self.state = {}  # anahtar -> [son geçiş zamanı, bastırılan kayıt sayısı]
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'rate_key', None)
+        if key is None:
+            return True
+        with self.lock:
+            state = self.state.get(key)
+            if state is not None and record.created - state[0] < self.interval:
+                state[1] += 1
+                return False
+            suppressed = state[1] if state is not None else 0
+            self.state[key] = [record.created, 0]
+        if suppressed:
+            record.msg = f"{record.msg} (son {self.interval:g} sn'de {suppressed} benzer kayıt özetlendi)"
+        return True
+
+
+def configure_logging(log_file='card_detector.log', level=logging.INFO, max_bytes=1024 * 1024, backup_count=3):
+    """Kök logger'ı kuyruklu, dönen (rotating) dosya günlüğüyle yapılandır.
+
+    Çağıran thread sadece kaydı kuyruğa koyar; dosyaya ve konsola yazma
+    işini QueueListener'ın arka plan thread'i yapar. Kök logger zaten
+    yapılandırılmışsa (ör. ekransız çalıştırıcı) hiçbir şey değiştirilmez;
+    logging.basicConfig ile aynı davranış. Birden fazla çağrı güvenlidir.
+    """
+    global _listener
+    with _listener_lock:
+        root = logging.getLogger()
+        if _listener is not None or root.handlers:
+            return _listener
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        # Kapanışta kuyrukta kalan kayıtlar yazılsın
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging():
+    """Arka plan yazıcısını durdur, kuyruktaki kayıtları boşalt"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def install_rate_limit(logger, interval=5.0):
+    """Logger'a (bir kez) frame başına kayıt özetleyicisini ekle"""
+    for existing in logger.filters:
+        if isinstance(existing, RateLimitFilter):
+            return existing
+    rate_limit = RateLimitFilter(interval)
+    logger.addFilter(rate_limit)
+    return rate_limit
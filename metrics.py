@@ -0,0 +1,152 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Panelde ve raporda gösterilen aşamalar (sırasıyla)
+PANEL_STAGES = (
+    "grab",
+    "color_convert",
+    "change_check",
+    "match_template",
+    "merge",
+    "detect_total",
+    "ui_update",
+    "capture_to_ui",
+    "capture_interval",
+)
+
+
+class StageHistogram:
+    """Bir aşamanın son N süresini tutan halka tampon.
+
+    Kayıt sadece bir dizi yazımıdır; yüzdelikler rapor istendiğinde
+    (saniyede bir gibi) son N değer sıralanarak hesaplanır.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.values = [0.0] * capacity
+        self.index = 0
+        self.count = 0  # Toplam kayıt sayısı (tampon boyutundan büyük olabilir)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.values[self.index] = seconds
+            self.index = (self.index + 1) % self.capacity
+            self.count += 1
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        """Tampondaki değerlerin yüzdeliklerini milisaniye olarak döndür"""
+        with self.lock:
+            # Tampon dolana kadar sadece ilk count eleman yazılmıştır
+            values = sorted(self.values[:min(self.count, self.capacity)])
+        if not values:
+            return {f"p{q}": None for q in quantiles}
+        result = {}
+        for q in quantiles:
+            position = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+            result[f"p{q}"] = values[position] * 1000
+        return result
+
+
+class MetricsRegistry:
+    """Aşama adı -> StageHistogram; yakalama, tespit ve UI thread'leri aynı kaydı paylaşır.
+
+    Süre dışındaki olaylar (önbellek isabeti gibi) adlandırılmış sayaçlarda tutulur.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, stage):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self.lock:
+                histogram = self.stages.setdefault(stage, StageHistogram(self.capacity))
+        return histogram
+
+    def record(self, stage, seconds):
+        """Aşama süresini kaydet (saniye)"""
+        self.histogram(stage).record(seconds)
+
+    def increment(self, counter, amount=1):
+        """Sayacı artır"""
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def counter_snapshot(self):
+        """{sayaç: değer} kopyası"""
+        with self.lock:
+            return dict(sorted(self.counters.items()))
+
+    def hit_ratio(self, prefix):
+        """'<prefix>/hit' ve '<prefix>/miss' sayaçlarından isabet oranı (sayaç yoksa None)"""
+        with self.lock:
+            hits = self.counters.get(f"{prefix}/hit", 0)
+            misses = self.counters.get(f"{prefix}/miss", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def counter_ratio(self, part, total):
+        """part / total sayaç oranı (total sayacı yoksa None)"""
+        with self.lock:
+            part_value = self.counters.get(part, 0)
+            total_value = self.counters.get(total, 0)
+        return part_value / total_value if total_value else None
+
+    @contextmanager
+    def timer(self, stage):
+        """with bloğunun süresini aşamaya kaydet"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def snapshot(self, stages=None):
+        """{aşama: {'count', 'p50', 'p95', 'p99'}} (süreler milisaniye)"""
+        if stages is None:
+            with self.lock:
+                stages = sorted(self.stages)
+        snapshot = {}
+        for stage in stages:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                continue
+            snapshot[stage] = dict(count=histogram.count, **histogram.percentiles())
+        return snapshot
+
+    def format_report(self, stages=None, title="Aşama süreleri (ms)"):
+        """Yüzdelik tablosunu metin olarak döndür"""
+        lines = [f"{title}:", f"  {'Aşama':<28}{'Adet':>8}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for stage, values in self.snapshot(stages).items():
+            if values['p50'] is None:
+                continue
+            lines.append(f"  {stage:<28}{values['count']:>8}{values['p50']:>9.2f}{values['p95']:>9.2f}{values['p99']:>9.2f}")
+        counters = self.counter_snapshot()
+        if counters:
+            lines.append("Sayaçlar:")
+            for counter, value in counters.items():
+                lines.append(f"  {counter:<28}{value:>8}")
+        pruned = self.counter_ratio("prefilter/pruned", "prefilter/considered")
+        if pruned is not None:
+            lines.append(f"  {'ön filtre eleme oranı':<28}{pruned * 100:>7.1f}%")
+        return "\n".join(lines)
+
+    def format_panel(self, stages=PANEL_STAGES):
+        """Dar UI paneli için kısa satırlar: 'aşama  p50/p95/p99'"""
+        lines = ["p50 / p95 / p99 ms"]
+        for stage, values in self.snapshot(stages).items():
+            if values['p50'] is None:
+                continue
+            lines.append(f"{stage[:13]:<13} {values['p50']:.1f}/{values['p95']:.1f}/{values['p99']:.1f}")
+        ratio = self.hit_ratio("patch_cache")
+        if ratio is not None:
+            lines.append(f"{'patch_cache':<13} isabet %{ratio * 100:.0f}")
+        pruned = self.counter_ratio("prefilter/pruned", "prefilter/considered")
+        if pruned is not None:
+            lines.append(f"{'prefilter':<13} elenen %{pruned * 100:.0f}")
+        return "\n".join(lines)
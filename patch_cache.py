@@ -0,0 +1,69 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def patch_fingerprint(patch, quantize_bits=2):
+    """Bölgenin boyut + nicemlenmiş piksel özeti (düşük bitler yakalama gürültüsüdür)"""
+    normalized = patch >> quantize_bits if quantize_bits else patch
+    digest = hashlib.blake2b(normalized.tobytes(), digest_size=16)
+    digest.update(str(patch.shape).encode())
+    return digest.digest()
+
+
+class PatchCache:
+    """Aday bölge (patch) parmak izi -> eşleştirme sonucu, LRU ile sınırlı.
+
+    Aynı kart görüntüsü çok sayıda frame boyunca ekranda kalır; bölgenin
+    içeriği değişmediyse matchTemplate yeniden çalıştırılmaz. Anahtar,
+    düşük bitleri atılmış (yakalama gürültüsüne dayanıklı) piksellerin ve
+    bölge boyutunun hızlı özetidir. Sonuç, o sırada atlanan (zaten tespit
+    edilmiş) kartlara bağlı olduğu için atlanan kümeyle birlikte saklanır:
+    tüm şablonlar denenerek bulunan (tam) bir kayıt, şimdi atlanan küme o
+    zamankini kapsıyorsa geçerlidir (aynı oyunda tespit edilen kartlar
+    sadece artar) ve o zamandan beri tespit edilen kartların tepeleri
+    döndürülmeden önce çıkarılır; ilk doğrulanan kartta duran (eksik) bir
+    kayıt sadece atlanan küme aynıysa kullanılır. Sonuç (kart adı, güven,
+    konum) tepelerinin listesidir.
+    """
+
+    def __init__(self, capacity=256, quantize_bits=2, metrics=None):
+        self.capacity = capacity
+        self.quantize_bits = quantize_bits
+        self.metrics = metrics
+        self.entries = OrderedDict()  # parmak izi -> (sonuç, atlanan kartlar, tam mı)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def fingerprint(self, patch):
+        """Bölgenin boyut + nicemlenmiş piksel özetini döndür"""
+        return patch_fingerprint(patch, self.quantize_bits)
+
+    def get(self, key, skip_cards):
+        """Geçerli kayıt varsa skip_cards'taki kartlar çıkarılmış sonucu döndür (en yeni olarak işaretler), yoksa None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[1] <= skip_cards if entry[2] else entry[1] == skip_cards):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                result = [peak for peak in entry[0] if peak[0] not in skip_cards]
+            else:
+                self.misses += 1
+                result = None
+        if self.metrics is not None:
+            self.metrics.increment("patch_cache/hit" if result is not None else "patch_cache/miss")
+        return result
+
+    def put(self, key, result, skip_cards, complete=True):
+        """Sonucu kaydet; kapasite aşılırsa en uzun süre kullanılmayan kayıt atılır"""
+        with self.lock:
+            self.entries[key] = (result, frozenset(skip_cards), complete)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Tüm kayıtları at (şablon bankası veya seçim alanı değişti)"""
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,60 @@
+import cv2
+
+
+def find_peaks(result, threshold, template_shape, max_peaks=8):
+    """Korelasyon haritasında eşiği geçen tüm tepe noktalarını bul.
+
+    En yüksek nokta alınır, çevresi şablon boyutunun yarısı kadar bastırılır
+    ve eşiğin altına inene kadar tekrarlanır. Harita değiştirilmez; sadece
+    eşiği geçen bir nokta varsa kopyalanır. max_peaks None ise sınır yoktur.
+    [(skor, (x, y))] döndürür.
+    """
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    if max_val < threshold:
+        return []
+
+    h, w = template_shape[:2]
+    working = result.copy()
+    peaks = []
+    while max_val >= threshold and (max_peaks is None or len(peaks) < max_peaks):
+        peaks.append((float(max_val), max_loc))
+        x, y = max_loc
+        working[max(y - h // 2, 0):y + h // 2 + 1, max(x - w // 2, 0):x + w // 2 + 1] = -1.0
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(working)
+    return peaks
+
+
+def overlap_ratio(box_a, box_b):
+    """İki (x, y, genişlik, yükseklik) kutusunun kesişim / birleşim oranı"""
+    ax, ay, aw, ah = box_a
+    bx, by, bw, bh = box_b
+    inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+    inter_h = min(ay + ah, by + bh) - max(ay, by)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    intersection = inter_w * inter_h
+    return intersection / float(aw * ah + bw * bh - intersection)
+
+
+def non_max_suppression(candidates, template_shapes, iou_threshold=0.3):
+    """Şablonlar arası çakışan adayları bastır.
+
+    candidates: {'name', 'confidence', 'location', ...} sözlükleri.
+    En güvenilir adaydan başlanır; daha önce seçilen bir adayla
+    iou_threshold'dan fazla örtüşen adaylar atılır. Destede her karttan bir
+    tane olduğu için aynı kartın ikinci konumu da atılır.
+    """
+    kept = []
+    kept_boxes = []
+    kept_names = set()
+    for candidate in sorted(candidates, key=lambda c: c['confidence'], reverse=True):
+        if candidate['name'] in kept_names:
+            continue
+        h, w = template_shapes[candidate['name']][:2]
+        box = (candidate['location'][0], candidate['location'][1], w, h)
+        if any(overlap_ratio(box, other) > iou_threshold for other in kept_boxes):
+            continue
+        kept.append(candidate)
+        kept_boxes.append(box)
+        kept_names.add(candidate['name'])
+    return kept
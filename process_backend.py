@@ -0,0 +1,134 @@
+import cv2
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from color_space import to_match_space
+from peak_suppression import find_peaks
+from template_bank import TemplateBank, scale_image
+
+# Worker sürecine ait durum (her süreçte bir kez yüklenir)
+_worker_templates = {}
+_worker_frame_memory = None
+
+
+def _load_templates(cards_folder, scale=1.0):
+    """Worker sürecinde kart şablonlarını yükle"""
+    templates = {}
+    for filename in os.listdir(cards_folder):
+        if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+            template = cv2.imread(os.path.join(cards_folder, filename), cv2.IMREAD_COLOR)
+            if template is not None:
+                templates[os.path.splitext(filename)[0]] = scale_image(template, scale)
+    return templates
+
+
+def _init_worker(cards_folder, bank_path=None, color_mode="bgr", scale=1.0):
+    """Worker süreci başlatıcısı - şablon bankası süreç başına bir kez yüklenir.
+
+    Derlenmiş banka varsa mmap ile açılır; tüm worker'lar aynı salt okunur
+    sayfaları paylaşır. Tek kanallı modda şablonlar bir kez dönüştürülür.
+    """
+    global _worker_templates
+    bank = TemplateBank.open(bank_path) if bank_path else None
+    if bank is not None:
+        _worker_templates = bank.templates()
+    else:
+        _worker_templates = _load_templates(cards_folder, scale)
+    if color_mode != "bgr":
+        _worker_templates = {name: to_match_space(template, color_mode) for name, template in _worker_templates.items()}
+
+
+def _attach_frame(memory_name):
+    """Paylaşılan frame belleğine bağlan (isim değişmedikçe tekrar bağlanmaz)"""
+    global _worker_frame_memory
+    if _worker_frame_memory is None or _worker_frame_memory.name != memory_name:
+        if _worker_frame_memory is not None:
+            _worker_frame_memory.close()
+        _worker_frame_memory = shared_memory.SharedMemory(name=memory_name)
+    return _worker_frame_memory
+
+
+def _match_slice(memory_name, shape, card_names, skip_cards, threshold):
+    """Paylaşılan frame'in kopyasız görünümü üzerinde bir kart dilimini tara.
+
+    Eşiği geçen tüm konumlar döndürülür (şablonlar arası bastırma ana
+    süreçte yapılır). Sadece küçük eşleşme kayıtları döndürür:
+    ([(kart_adı, güven, konum)], taranan kart sayısı)
+    """
+    memory = _attach_frame(memory_name)
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+
+    matches = []
+    cards_checked = 0
+    for card_name in card_names:
+        if card_name in skip_cards:
+            continue
+        template = _worker_templates.get(card_name)
+        if template is None:
+            continue
+
+        cards_checked += 1
+        result = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+        for max_val, max_loc in find_peaks(result, threshold, template.shape):
+            matches.append((card_name, max_val, max_loc))
+
+    del frame  # Bellek görünümünü bırak
+    return matches, cards_checked
+
+
+class ProcessMatchingBackend:
+    """Şablon eşleştirmeyi ayrı süreçlerde çalıştıran arka uç.
+
+    Her worker süreci şablon bankasını bir kez yükler. Yakalanan frame
+    paylaşılan belleğe bir kez yazılır; worker'lar ona kopyasız bağlanır ve
+    sadece küçük eşleşme kayıtları geri döner. GIL'e bağlı kalmadan çok
+    çekirdekli makinelerde ölçeklenmek içindir.
+    """
+
+    def __init__(self, cards_folder, workers=None, bank_path=None, color_mode="bgr", scale=1.0):
+        self.cards_folder = os.path.abspath(cards_folder)
+        self.bank_path = os.path.abspath(bank_path) if bank_path else None
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.cards_folder, self.bank_path, color_mode, scale)
+        )
+        self.frame_memory = None
+
+    def publish_frame(self, frame):
+        """Frame'i paylaşılan belleğe yaz (gerekirse belleği büyüt)"""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if self.frame_memory is None or self.frame_memory.size < frame.nbytes:
+            self._release_memory()
+            self.frame_memory = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.frame_memory.buf)
+        view[...] = frame
+        del view
+        return frame.shape
+
+    def submit_slices(self, frame, thread_cards, skip_cards, threshold=0.99):
+        """Frame'i yayınla ve her kart dilimi için bir iş gönder, Future listesi döndür"""
+        shape = self.publish_frame(frame)
+        skip_cards = frozenset(skip_cards)
+        return [
+            self.executor.submit(_match_slice, self.frame_memory.name, shape, card_names, skip_cards, threshold)
+            for card_names in thread_cards
+        ]
+
+    def _release_memory(self):
+        """Paylaşılan belleği kapat ve sil"""
+        if self.frame_memory is not None:
+            try:
+                self.frame_memory.close()
+                self.frame_memory.unlink()
+            except Exception:
+                pass
+            self.frame_memory = None
+
+    def shutdown(self):
+        """Worker süreçlerini ve paylaşılan belleği kapat"""
+        self.executor.shutdown(wait=True)
+        self._release_memory()
@@ -0,0 +1,105 @@
+import argparse
+import json
+import sys
+
+import cv2
+import numpy as np
+
+from color_space import to_match_space
+from template_bank import scale_image
+
+NATIVE_THRESHOLD = 0.99  # Ölçek 1.0'da şablonlar birebir eşleşir
+# Ölçeklenmiş şablonlar yeniden örneklendiği için doğru kartlar bile ~0.9-0.99 arası skor alır;
+# aynı bölgedeki benzer kartları (diğer renk) CardDetector'ın bölge parmak izi kontrolü ayıklar
+SCALED_THRESHOLD = 0.9
+
+
+def best_score(frame, templates, scale):
+    """Şablonlar verilen ölçeğe getirildiğinde frame'deki en yüksek (skor, kart adı)"""
+    frame_h, frame_w = frame.shape[:2]
+    best = (-1.0, None)
+    for name, template in templates.items():
+        scaled = scale_image(template, scale)
+        if scaled.shape[0] > frame_h or scaled.shape[1] > frame_w:
+            continue
+        result = cv2.matchTemplate(frame, scaled, cv2.TM_CCOEFF_NORMED)
+        max_val = cv2.minMaxLoc(result)[1]
+        if max_val > best[0]:
+            best = (max_val, name)
+    return best
+
+
+def search_scales(frame, templates, scales):
+    """Ölçek listesini tara, {'scale', 'score', 'card'} en iyisini döndür.
+
+    Aynı piksel boyutunu veren ölçekler aynı şablonları üretir; her boyut bir
+    kez denenir, şablonun kendi boyutunu veren ölçek 1.0 sayılır.
+    """
+    reference = next(iter(templates.values()))
+    native_size = reference.shape[:2]
+    best = {'scale': None, 'score': -1.0, 'card': None}
+    seen_sizes = set()
+    for scale in scales:
+        size = scale_image(reference, float(scale)).shape[:2]
+        if size in seen_sizes:
+            continue
+        seen_sizes.add(size)
+        if size == native_size:
+            scale = 1.0
+        score, name = best_score(frame, templates, float(scale))
+        if score > best['score']:
+            best = {'scale': round(float(scale), 3), 'score': float(score), 'card': name}
+    return best
+
+
+def recommended_threshold(scale):
+    """Kalibre edilen ölçekte kullanılacak eşleşme eşiği"""
+    return NATIVE_THRESHOLD if scale == 1.0 else SCALED_THRESHOLD
+
+
+def calibrate_scale(frame, templates, min_scale=0.5, max_scale=2.0, coarse_step=0.05, fine_step=0.01,
+                    min_score=0.8):
+    """Seçim alanındaki kartlara en iyi uyan şablon ölçeğini bul (bir kerelik, pahalı).
+
+    Önce geniş aralık kaba adımlarla, sonra en iyi ölçeğin çevresi ince
+    adımlarla taranır. Hesap gri tonlamada yapılır. En az bir kart görünür
+    olmalıdır; en iyi skor min_score'un altındaysa None döner.
+    """
+    frame = to_match_space(frame, "gray")
+    templates = {name: to_match_space(template, "gray") for name, template in templates.items()}
+
+    coarse = search_scales(frame, templates, np.arange(min_scale, max_scale + coarse_step / 2, coarse_step))
+    if coarse['scale'] is None:
+        return None
+    fine_scales = np.arange(max(min_scale, coarse['scale'] - coarse_step),
+                            min(max_scale, coarse['scale'] + coarse_step) + fine_step / 2, fine_step)
+    best = search_scales(frame, templates, fine_scales)
+    if best['score'] < min_score:
+        return None
+    best['threshold'] = recommended_threshold(best['scale'])
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekran görüntüsünde kartlara uyan şablon ölçeğini bul")
+    parser.add_argument("image", help="En az bir kartın tamamen göründüğü seçim alanı görüntüsü")
+    parser.add_argument("--cards-folder", default="CROPPEDCARDS")
+    parser.add_argument("--min-scale", type=float, default=0.5)
+    parser.add_argument("--max-scale", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    from synthetic_scenes import load_templates
+    frame = cv2.imread(args.image, cv2.IMREAD_COLOR)
+    if frame is None:
+        print(f"Görüntü okunamadı: {args.image}", file=sys.stderr)
+        return 2
+    result = calibrate_scale(frame, load_templates(args.cards_folder), args.min_scale, args.max_scale)
+    if result is None:
+        print("Kart bulunamadı; alanda en az bir kartın tamamen göründüğünden emin olun", file=sys.stderr)
+        return 1
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
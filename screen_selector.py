@@ -1,15 +1,20 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # Açılış zaman raporu için süreç başlangıcı
+
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pyautogui
 from PIL import Image, ImageTk
-import numpy as np
-import cv2
-import time
 import json
 import os
-from mss import mss
-from card_detector import CardDetector
+import re
+import sys
+import threading
+import multiprocessing
 from card_display import CardDisplay
+from startup_timer import StartupTimer
+from metrics import MetricsRegistry
+import log_pipeline
+# cv2, numpy, mss ve card_detector ağır modüllerdir; pencere açıldıktan sonra arka planda yüklenir
 
 class RoundedButton(tk.Canvas):
     """Rounded köşeli modern buton sınıfı"""
@@ -100,7 +105,13 @@ class RoundedButton(tk.Canvas):
         self.draw_button()
 
 class ScreenSelector:
-    def __init__(self):
+    def __init__(self, deferred_startup=True):
+        self.startup_timer = StartupTimer(STARTUP_STARTED)
+        # Kayıtlar kuyruğa konur, dosyaya/konsola arka plan thread'i yazar
+        log_pipeline.configure_logging('card_detector.log')
+        self.startup_timer.mark("Modüller yüklendi")
+        # Ertelenmiş açılış: pencere hemen gösterilir, detektör ve kart görselleri arkadan hazırlanır
+        self.deferred_startup = deferred_startup
         self.root = tk.Tk()
         self.root.title("🎴 KART SAYICI")
         self.root.geometry("1000x400")  # Daha geniş pencere
@@ -120,20 +131,45 @@ class ScreenSelector:
         self.end_y = None
         self.selecting = False
         self.selection_window = None
+        self.selection_target = None  # None: asıl alan, "new": yeni masa ekleniyor
         self.auto_capture_active = False
         self.auto_capture_job = None
+        self.capture_pipeline = None  # Yakalama/tespit thread'leri
+        self.ui_poll_interval = 30  # Sonuç kuyruğunu kontrol etme aralığı (ms)
+        self.cpu_budget = 50.0  # Yakalama zamanlayıcısının CPU bütçesi (tüm çekirdeklerin yüzdesi)
+        
+        # Şablon ölçeği ve eşleşme eşiği (F4 kalibrasyonuyla belirlenir, seçilen alanla birlikte saklanır)
+        self.template_scale = 1.0
+        self.match_threshold = 0.99
+        self.calibrating = False
+        self.calibration_result = None
         
         # Manuel mod değişkeni
         self.manual_mode = tk.BooleanVar(value=False)
         
-        # Kart detektörü
-        self.card_detector = CardDetector()
+        # Kart detektörü (ertelenmiş açılışta arka plan thread'inde oluşturulur)
+        self.card_detector = None
+        self.detector_ready = threading.Event()
+        self.detector_error = None
+        self.start_requested = False  # Detektör hazır olmadan BAŞLAT'a basıldı mı?
+        self.card_display_ready = False
+        
+        # Aşama süreleri (yakalama, tespit ve UI thread'leri aynı kaydı paylaşır)
+        self.metrics = MetricsRegistry()
+        self.metrics_panel_visible = False
         
-        # MSS instance'ı (hızlı ekran görüntüsü için)
-        self.sct = mss()
+        # MSS instance'ı (hızlı ekran görüntüsü için, ilk kullanımda oluşturulur)
+        self.sct = None
         
         # Kayıt dosyası yolu
         self.settings_file = "selected_area.json"
+        # Sıcak bölgeler seçim alanıyla aynı klasörde tutulur
+        self.hot_zones_file = os.path.join(os.path.dirname(os.path.abspath(self.settings_file)), "hot_zones.json")
+        
+        # Ek masalar: her biri kendi seçimi, detektörü (şablon ve havuz paylaşımlı) ve kart paneliyle
+        # [{'name', 'coords', 'detector', 'display', 'frame'}]; asıl alan "Masa 1"dir
+        self.main_region_name = "Masa 1"
+        self.extra_regions = []
         
         # FPS sayacı değişkenleri
         self.fps_start_time = None
@@ -144,11 +180,68 @@ class ScreenSelector:
         
         # Kayıtlı alan varsa sadece yükle, otomatik başlatma
         self.load_saved_area()
+        self.startup_timer.mark("Pencere oluşturuldu")
+        
+        if self.deferred_startup:
+            threading.Thread(target=self.init_card_detector, name="DeferredInit", daemon=True).start()
+            self.root.after(50, self.check_deferred_init)
+        else:
+            self.init_card_detector()
+            self.check_deferred_init()
+        
+    def init_card_detector(self):
+        """Ağır modülleri yükle ve kart detektörünü oluştur (Tk çağrısı yapmaz)"""
+        try:
+            from card_detector import CardDetector
+            self.startup_timer.mark("Görüntü işleme modülleri yüklendi")
+            card_detector = CardDetector(metrics=self.metrics, hot_zones_path=self.hot_zones_file,
+                                         template_scale=self.template_scale, match_threshold=self.match_threshold)
+            if hasattr(self, 'selection_coords'):
+                card_detector.set_selection_area(self.selection_coords)
+            self.card_detector = card_detector
+            self.startup_timer.mark("CardDetector hazır")
+        except Exception as e:
+            self.detector_error = e
+        finally:
+            self.detector_ready.set()
+            
+    def check_deferred_init(self):
+        """Arka plan hazırlığının bitip bitmediğini Tk thread'inden kontrol et"""
+        if not self.detector_ready.is_set():
+            self.root.after(50, self.check_deferred_init)
+            return
+        if self.detector_error is not None:
+            print(f"Kart detektörü oluşturulurken hata: {str(self.detector_error)}")
+            return
+        if self.start_requested:
+            self.start_requested = False
+            self.start_auto_capture()
+        self.print_startup_report()
+        
+    def on_card_display_loaded(self):
+        """Kart görselleri yüklendiğinde çağrılır"""
+        self.startup_timer.mark("Kart görselleri yüklendi")
+        self.card_display_ready = True
+        self.print_startup_report()
+        
+    def print_startup_report(self):
+        """Detektör ve kart görselleri hazır olunca açılış raporunu bir kez yazdır"""
+        if self.startup_timer.reported or not self.detector_ready.is_set():
+            return
+        if self.card_display and not self.card_display_ready:
+            return
+        self.startup_timer.reported = True
+        print(self.startup_timer.report())
         
     def setup_ui(self):
         # Pencere kapatma event'i
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        # F2: metrik panelini aç/kapat, F3: tüm aşamaların raporunu konsola yaz, F4: ölçek kalibrasyonu
+        self.root.bind("<F2>", self.toggle_metrics_panel)
+        self.root.bind("<F3>", self.dump_metrics)
+        self.root.bind("<F4>", self.calibrate_scale)
+        
         # Havalı stil tanımları
         self.setup_styles()
         
@@ -208,6 +301,18 @@ class ScreenSelector:
         )
         self.start_stop_button.pack(side=tk.TOP, fill=tk.X, pady=(0, 12))
         
+        # Masa ekle butonu - aynı anda birden fazla masa izlemek için
+        self.add_region_button = RoundedButton(
+            top_frame, 
+            text="➕ MASA EKLE", 
+            command=self.start_region_selection,
+            bg_color="#4A90E2",
+            fg_color="#222222",
+            width=160,
+            height=45
+        )
+        self.add_region_button.pack(side=tk.TOP, fill=tk.X, pady=(0, 12))
+        
         # Alt kısım - Reset butonu
         bottom_frame = ttk.Frame(button_container, style="Modern.TFrame")
         bottom_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(15, 0))
@@ -224,6 +329,14 @@ class ScreenSelector:
         )
         self.reset_button.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Metrik paneli (F2 ile gösterilir) - aşama başına p50/p95/p99
+        self.metrics_panel = ttk.Label(
+            button_container,
+            text="",
+            style="Metrics.TLabel",
+            justify=tk.LEFT
+        )
+        
         # Seçim bilgileri kaldırıldı - sadece kart grid'i gösterilecek
         
         # Görüntü alanı kaldırıldı - performans için
@@ -234,9 +347,16 @@ class ScreenSelector:
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(1, weight=1)
         
+        # Kart panelleri alt alta: asıl alan ve eklenen her masa için bir panel
+        self.displays_frame = ttk.Frame(content_frame, style="Modern.TFrame")
+        self.displays_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        main_display_frame = ttk.Frame(self.displays_frame, style="Modern.TFrame")
+        main_display_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        
         # Kart görüntüleme sistemi
         try:
-            self.card_display = CardDisplay(content_frame)
+            self.card_display = CardDisplay(main_display_frame, deferred_loading=self.deferred_startup,
+                                            on_loaded=self.on_card_display_loaded)
         except Exception as e:
             print(f"CardDisplay oluşturulurken hata: {str(e)}")
             self.card_display = None
@@ -298,6 +418,12 @@ class ScreenSelector:
                       foreground="#222222",
                       font=("Segoe UI", 9))
         
+        # Metrik paneli stili (sabit genişlikli küçük yazı)
+        style.configure("Metrics.TLabel",
+                      background="#F4F4F9",
+                      foreground="#555555",
+                      font=("Consolas", 7))
+        
         # LabelFrame stili
         style.configure("Modern.TLabelframe",
                       background="#F4F4F9",
@@ -311,6 +437,7 @@ class ScreenSelector:
         
     def start_selection(self):
         """Ekran seçimi başlat"""
+        self.selection_target = None
         self.root.withdraw()  # Ana pencereyi gizle
         self.create_selection_window()
         
@@ -374,7 +501,11 @@ class ScreenSelector:
             self.root.deiconify()  # Ana pencereyi göster
             
             # Seçim bilgilerini güncelle
-            self.update_selection_info(x1, y1, x2, y2)
+            if self.selection_target == "new":
+                self.add_region(self.next_region_name(), (x1, y1, x2, y2))
+                self.save_selected_area(*self.selection_coords)
+            else:
+                self.update_selection_info(x1, y1, x2, y2)
             
     def cancel_selection(self, event=None):
         """Seçimi iptal et"""
@@ -382,17 +513,113 @@ class ScreenSelector:
             self.selection_window.destroy()
         self.root.deiconify()
         
-    def update_selection_info(self, x1, y1, x2, y2):
-        """Seçim bilgilerini güncelle"""
+    def update_selection_info(self, x1, y1, x2, y2, save=True):
+        """Seçim bilgilerini güncelle (kayıttan yüklerken save=False: dosya zaten güncel)"""
         # Seçim koordinatlarını sakla
         self.selection_coords = (x1, y1, x2, y2)
+        if self.capture_pipeline is not None:
+            self.capture_pipeline.set_selection(self.selection_coords)
+        if self.card_detector is not None:
+            self.card_detector.set_selection_area(self.selection_coords)
         
         # Seçilen alanı kaydet
-        self.save_selected_area(x1, y1, x2, y2)
+        if save:
+            self.save_selected_area(x1, y1, x2, y2)
         
         # Otomatik yakalama başlatma - kullanıcı butona bassın
         # self.start_auto_capture()
         
+    def start_region_selection(self):
+        """Yeni masa için ekran seçimi başlat"""
+        if not hasattr(self, 'selection_coords'):
+            messagebox.showwarning("Uyarı", "Önce bir alan seçin!")
+            return
+        self.selection_target = "new"
+        self.root.withdraw()
+        self.create_selection_window()
+        
+    def next_region_name(self):
+        """Kullanılmayan ilk "Masa N" adı"""
+        used = {self.main_region_name} | {region['name'] for region in self.extra_regions}
+        number = 2
+        while f"Masa {number}" in used:
+            number += 1
+        return f"Masa {number}"
+        
+    def region_hot_zones_file(self, name):
+        """Masanın sıcak bölge dosyası (asıl alanınkinin yanında, masa adıyla)"""
+        slug = re.sub(r'\W+', '_', name).strip('_').lower()
+        return os.path.join(os.path.dirname(self.hot_zones_file), f"hot_zones_{slug}.json")
+        
+    def add_region(self, name, coords):
+        """Ek masa ekle: kart paneli oluştur, tarama açıksa hemen yakalamaya kat"""
+        frame = ttk.Frame(self.displays_frame, style="Modern.TFrame")
+        frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=(10, 0))
+        header = ttk.Frame(frame, style="Modern.TFrame")
+        header.pack(side=tk.TOP, fill=tk.X)
+        ttk.Button(header, text=f"✖ {name}", style="Reset.TButton",
+                   command=lambda: self.remove_region(name)).pack(side=tk.RIGHT)
+        body = ttk.Frame(frame, style="Modern.TFrame")
+        body.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        try:
+            display = CardDisplay(body, deferred_loading=self.deferred_startup, title=f"🎴 KALAN KARTLAR - {name}")
+        except Exception as e:
+            print(f"CardDisplay oluşturulurken hata: {str(e)}")
+            display = None
+        region = {'name': name, 'coords': tuple(coords), 'detector': None, 'display': display, 'frame': frame}
+        self.extra_regions.append(region)
+        self.update_region_layout()
+        
+        if self.capture_pipeline is not None:
+            self.capture_pipeline.add_region(name, self.region_detector(region), region['coords'])
+        print(f"{name} eklendi: ({coords[0]}, {coords[1]}) - ({coords[2]}, {coords[3]})")
+        
+    def remove_region(self, name, save=True):
+        """Ek masayı kaldır; paylaşılan şablonlar ve havuz etkilenmez"""
+        region = next((region for region in self.extra_regions if region['name'] == name), None)
+        if region is None:
+            return
+        self.extra_regions.remove(region)
+        if self.capture_pipeline is not None:
+            self.capture_pipeline.remove_region(name)
+        if region['detector'] is not None:
+            region['detector'].shutdown()
+        region['frame'].destroy()
+        self.update_region_layout()
+        if save and hasattr(self, 'selection_coords'):
+            self.save_selected_area(*self.selection_coords)
+        print(f"{name} kaldırıldı")
+        
+    def region_detector(self, region):
+        """Masanın detektörü; yoksa asıl detektörden (paylaşımlı) oluştur"""
+        if region['detector'] is None and self.card_detector is not None:
+            region['detector'] = self.card_detector.for_region(self.region_hot_zones_file(region['name']))
+            region['detector'].set_selection_area(region['coords'])
+        return region['detector']
+        
+    def update_region_layout(self):
+        """Panel başlıklarını ve pencere yüksekliğini masa sayısına göre ayarla"""
+        if self.card_display:
+            title = f"🎴 KALAN KARTLAR - {self.main_region_name}" if self.extra_regions else "🎴 KALAN KARTLAR"
+            self.card_display.set_title(title)
+        self.root.geometry(f"1000x{400 + 330 * len(self.extra_regions)}")
+        
+    def region_display(self, region_name):
+        """Sonucun ait olduğu masanın kart paneli (None = asıl alan)"""
+        if region_name is None:
+            return self.card_display
+        for region in self.extra_regions:
+            if region['name'] == region_name:
+                return region['display']
+        return None
+        
+    def load_saved_regions(self, saved_regions):
+        """Kayıtlı ek masaları yükle (eski kayıtlarda bu alan yoktur)"""
+        for region in list(self.extra_regions):
+            self.remove_region(region['name'], save=False)
+        for saved in saved_regions:
+            self.add_region(saved['name'], (saved['x1'], saved['y1'], saved['x2'], saved['y2']))
+        
     def capture_selected_area(self):
         """Seçili alanı yakala"""
         if not hasattr(self, 'selection_coords'):
@@ -403,6 +630,9 @@ class ScreenSelector:
             x1, y1, x2, y2 = self.selection_coords
             
             # MSS ile hızlı ekran görüntüsü al
+            if self.sct is None:
+                from mss import mss
+                self.sct = mss()
             monitor = {"top": y1, "left": x1, "width": x2-x1, "height": y2-y1}
             screenshot = self.sct.grab(monitor)
             
@@ -425,7 +655,23 @@ class ScreenSelector:
     def start_auto_capture(self):
         """Otomatik yakalama başlat"""
         if hasattr(self, 'selection_coords'):
+            if self.card_detector is None:
+                # Detektör hâlâ hazırlanıyor; hazır olunca otomatik başlat
+                if self.detector_error is None:
+                    self.start_requested = True
+                    print("Kart detektörü hazırlanıyor, hazır olunca tarama başlayacak...")
+                return
+            from capture_pipeline import CapturePipeline
+            from capture_scheduler import CaptureScheduler
             self.auto_capture_active = True
+            # Yakalama ve tespit ayrı thread'lerde, UI sadece sonuçları alır;
+            # yakalama aralığı sahne hareketine ve CPU bütçesine göre ayarlanır
+            self.capture_pipeline = CapturePipeline(self.card_detector, self.selection_coords,
+                                                    scheduler=CaptureScheduler(cpu_budget=self.cpu_budget))
+            # Ek masalar aynı yakalamaya katılır; detektörleri şablonları ve havuzu paylaşır
+            for region in self.extra_regions:
+                self.capture_pipeline.add_region(region['name'], self.region_detector(region), region['coords'])
+            self.capture_pipeline.start()
             self.auto_capture()
             # Buton metnini ve rengini güncelle (kırmızı)
             self.start_stop_button.update_button(
@@ -433,18 +679,6 @@ class ScreenSelector:
                 bg_color="#E74C3C"  # Kırmızı
             )
             
-    def stop_auto_capture(self):
-        """Otomatik yakalamayı durdur"""
-        self.auto_capture_active = False
-        if self.auto_capture_job:
-            self.root.after_cancel(self.auto_capture_job)
-            self.auto_capture_job = None
-        # Buton metnini ve rengini güncelle (yeşil)
-        self.start_stop_button.update_button(
-            text="▶️ BAŞLAT",
-            bg_color="#27AE60"  # Yeşil
-        )
-        
     def toggle_auto_capture(self):
         """Başlat/Durdur toggle"""
         if self.auto_capture_active:
@@ -463,6 +697,10 @@ class ScreenSelector:
     def stop_auto_capture(self):
         """Otomatik yakalamayı durdur"""
         self.auto_capture_active = False
+        self.start_requested = False
+        if self.capture_pipeline is not None:
+            self.capture_pipeline.stop()
+            self.capture_pipeline = None
         if self.auto_capture_job:
             self.root.after_cancel(self.auto_capture_job)
             self.auto_capture_job = None
@@ -473,69 +711,151 @@ class ScreenSelector:
         )
             
     def auto_capture(self):
-        """Otomatik yakalama döngüsü"""
-        if self.auto_capture_active and hasattr(self, 'selection_coords') and not self.manual_mode.get():
+        """Tespit sonuçlarını kuyruktan al ve UI'ı güncelle (Tk thread'i)"""
+        if self.auto_capture_active and self.capture_pipeline is not None and not self.manual_mode.get():
             try:
                 # FPS hesaplama başlat
                 if self.fps_start_time is None:
                     self.fps_start_time = time.time()
                     self.fps_frame_count = 0
                 
-                x1, y1, x2, y2 = self.selection_coords
-                
-                # MSS ile hızlı ekran görüntüsü al
-                monitor = {"top": y1, "left": x1, "width": x2-x1, "height": y2-y1}
-                screenshot = self.sct.grab(monitor)
-                
-                # MSS görüntüsünü PIL Image'e çevir
-                screenshot_pil = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-                
-                # Kart tespiti yap
-                detected_cards = self.card_detector.detect_cards(screenshot_pil)
-                
-                # Kart görüntüleme sistemini güncelle
-                if self.card_display:
-                    self.card_display.update_detected_cards(detected_cards)
+                # Arka planda işlenen frame'lerin sonuçlarını al
+                for result in self.capture_pipeline.poll_results():
+                    if 'error' in result:
+                        print(f"Otomatik yakalama hatası: {result['error']}")
+                        continue
+                    
+                    # Sonucun ait olduğu masanın kart panelini güncelle
+                    card_display = self.region_display(result['region'])
+                    if card_display:
+                        with self.metrics.timer("ui_update"):
+                            card_display.update_detected_cards(result['cards'])
+                    # Yakalamadan UI güncellemesine kadar geçen toplam süre
+                    self.metrics.record("capture_to_ui", time.perf_counter() - result['captured_at'])
+                    if result['region'] is None:
+                        self.fps_frame_count += 1
                 
                 # FPS hesaplama
-                self.fps_frame_count += 1
                 current_time = time.time()
                 
                 # Her 1 saniyede bir FPS yazdır
                 if self.fps_last_print_time is None or current_time - self.fps_last_print_time >= 1.0:
                     elapsed_time = current_time - self.fps_start_time
                     fps = self.fps_frame_count / elapsed_time if elapsed_time > 0 else 0
-                    print(f"FPS: {fps:.1f} - Frame: {self.fps_frame_count} - Time: {elapsed_time:.1f}s")
+                    print(f"FPS: {fps:.1f} - Frame: {self.fps_frame_count} - Atlanan: {self.capture_pipeline.dropped_frames} - Time: {elapsed_time:.1f}s")
                     
                     # FPS sayacını sıfırla
                     self.fps_start_time = current_time
                     self.fps_frame_count = 0
                     self.fps_last_print_time = current_time
+                    
+                    if self.metrics_panel_visible:
+                        self.update_metrics_panel()
                 
             except Exception as e:
                 print(f"Otomatik yakalama hatası: {str(e)}")
                 
-            # 0.1 saniye sonra tekrar çalıştır
-            self.auto_capture_job = self.root.after(100, self.auto_capture)
+            # Sonuç kuyruğunu kısa aralıklarla kontrol et; boş kuyruk ucuzdur, sadece yakalama yavaşlar
+            self.auto_capture_job = self.root.after(self.ui_poll_interval, self.auto_capture)
+            
+    def toggle_metrics_panel(self, event=None):
+        """Aşama sürelerini gösteren paneli aç/kapat"""
+        self.metrics_panel_visible = not self.metrics_panel_visible
+        if self.metrics_panel_visible:
+            self.metrics_panel.pack(side=tk.TOP, fill=tk.X)
+            self.update_metrics_panel()
+        else:
+            self.metrics_panel.pack_forget()
+            
+    def update_metrics_panel(self):
+        """Paneli son p50/p95/p99 değerleriyle güncelle"""
+        self.metrics_panel.config(text=self.metrics.format_panel())
+        
+    def dump_metrics(self, event=None):
+        """Şablon bazındakiler dahil tüm aşamaların raporunu konsola yaz"""
+        print(self.metrics.format_report())
+        
+    def calibrate_scale(self, event=None):
+        """Seçili alandaki kart boyutuna uyan şablon ölçeğini arka planda bul"""
+        if not hasattr(self, 'selection_coords'):
+            messagebox.showwarning("Uyarı", "Önce bir alan seçin!")
+            return
+        if self.calibrating or not self.detector_ready.is_set():
+            return
+        self.calibrating = True
+        self.calibration_result = None
+        print("Ölçek kalibrasyonu başladı (alanda en az bir kart tamamen görünmeli)...")
+        threading.Thread(target=self.run_scale_calibration, name="ScaleCalibration", daemon=True).start()
+        self.root.after(100, self.check_scale_calibration)
+        
+    def run_scale_calibration(self):
+        """Alanı yakala ve ölçek aralığını tara (Tk çağrısı yapmaz)"""
+        try:
+            from mss import mss
+            from frame_capture import grab_bgr
+            from scale_calibration import calibrate_scale
+            from synthetic_scenes import load_templates
+            # mss örneği thread'e özeldir
+            with mss() as sct:
+                frame = grab_bgr(sct, self.selection_coords)
+            templates = load_templates(self.card_detector.cards_folder)
+            self.calibration_result = calibrate_scale(frame, templates) or {}
+        except Exception as e:
+            self.calibration_result = {'error': str(e)}
+            
+    def check_scale_calibration(self):
+        """Kalibrasyon bittiyse ölçeği kaydet ve detektörü yeni ölçekle yeniden oluştur"""
+        if self.calibration_result is None:
+            self.root.after(100, self.check_scale_calibration)
+            return
+        result = self.calibration_result
+        self.calibrating = False
+        if 'error' in result:
+            print(f"Ölçek kalibrasyonu hatası: {result['error']}")
+            return
+        if not result:
+            print("Ölçek kalibrasyonu: kart bulunamadı, alanda bir kartın tamamen göründüğünden emin olun")
+            return
+        
+        print(f"Ölçek kalibrasyonu: {result['scale']:g} (skor: {result['score']:.3f}, kart: {result['card']}, eşik: {result['threshold']})")
+        if result['scale'] == self.template_scale and result['threshold'] == self.match_threshold:
+            return
+        self.template_scale = result['scale']
+        self.match_threshold = result['threshold']
+        self.save_selected_area(*self.selection_coords)
+        self.rebuild_card_detector()
+        
+    def rebuild_card_detector(self):
+        """Detektörü güncel ölçek ve eşikle arka planda yeniden oluştur; tarama açıksa sonra devam eder"""
+        was_running = self.auto_capture_active
+        self.stop_auto_capture()
+        if self.card_detector is not None:
+            self.card_detector.shutdown()
+            self.card_detector = None
+        # Ek masaların detektörleri yeni asıl detektörden yeniden oluşturulur
+        for region in self.extra_regions:
+            region['detector'] = None
+        self.detector_error = None
+        self.detector_ready.clear()
+        self.start_requested = was_running
+        threading.Thread(target=self.init_card_detector, name="DeferredInit", daemon=True).start()
+        self.root.after(50, self.check_deferred_init)
             
     def reset_all_cards(self):
         """Tüm kartları reset et - tespit edilmemiş olarak işaretle"""
         try:
-            if self.card_display:
-                # Tüm kartları normal haline döndür
-                for card_name in self.card_display.card_labels:
-                    label = self.card_display.card_labels[card_name]
-                    # Orijinal görüntüyü geri yükle
-                    label.config(image=self.card_display.card_images[card_name])
-                    label.image = self.card_display.card_images[card_name]
-                
-                # Tespit edilen kartları temizle
-                self.card_display.detected_cards.clear()
-                
-                # Card detector'daki tespit edilen kartları da temizle
-                self.card_detector.detected_cards.clear()  # Set'i temizle
-                self.card_detector.previous_frame = None  # Önceki frame'i de temizle
+            regions = [(self.card_display, self.card_detector)]
+            regions += [(region['display'], region['detector']) for region in self.extra_regions]
+            for card_display, card_detector in regions:
+                if card_display:
+                    # Tespit edilen kartları temizle ve tüm kartları normal haline döndür (tek çizim)
+                    card_display.reset()
                 
+                # Card detector'daki tespit edilen kartları ve önbellekleri de temizle
+                if card_detector is not None:
+                    card_detector.reset_detection_state()
+            
+            if self.card_display:
                 print("Tüm kartlar reset edildi!")
                 
         except Exception as e:
@@ -549,11 +869,16 @@ class ScreenSelector:
                     saved_area = json.load(f)
                 
                 x1, y1, x2, y2 = saved_area['x1'], saved_area['y1'], saved_area['x2'], saved_area['y2']
+                # Eski kayıtlarda ölçek yoktur: şablonlar olduğu gibi kullanılır
+                self.template_scale = saved_area.get('template_scale', 1.0)
+                self.match_threshold = saved_area.get('match_threshold', 0.99)
                 
                 print(f"Kayıtlı alan yüklendi: ({x1}, {y1}) - ({x2}, {y2})")
                 
+                # Ek masalar önce yüklenir; yükleme sırasında dosya yeniden yazılmaz
+                self.load_saved_regions(saved_area.get('regions', []))
                 # Seçim bilgilerini güncelle
-                self.update_selection_info(x1, y1, x2, y2)
+                self.update_selection_info(x1, y1, x2, y2, save=False)
                 
             else:
                 print("Kayıtlı alan bulunamadı, manuel seçim bekleniyor...")
@@ -569,11 +894,16 @@ class ScreenSelector:
                     saved_area = json.load(f)
                 
                 x1, y1, x2, y2 = saved_area['x1'], saved_area['y1'], saved_area['x2'], saved_area['y2']
+                # Eski kayıtlarda ölçek yoktur: şablonlar olduğu gibi kullanılır
+                self.template_scale = saved_area.get('template_scale', 1.0)
+                self.match_threshold = saved_area.get('match_threshold', 0.99)
                 
                 print(f"Kayıtlı alan yüklendi: ({x1}, {y1}) - ({x2}, {y2})")
                 
+                # Ek masalar önce yüklenir; yükleme sırasında dosya yeniden yazılmaz
+                self.load_saved_regions(saved_area.get('regions', []))
                 # Seçim bilgilerini güncelle
-                self.update_selection_info(x1, y1, x2, y2)
+                self.update_selection_info(x1, y1, x2, y2, save=False)
                 
                 # Manuel mod değilse otomatik başlat
                 if not self.manual_mode.get():
@@ -593,6 +923,12 @@ class ScreenSelector:
                 'y1': y1,
                 'x2': x2,
                 'y2': y2,
+                'template_scale': self.template_scale,
+                'match_threshold': self.match_threshold,
+                # Ek masalar; eski sürümler bu alanı yok sayar ve sadece asıl alanı kullanır
+                'regions': [{'name': region['name'], 'x1': region['coords'][0], 'y1': region['coords'][1],
+                             'x2': region['coords'][2], 'y2': region['coords'][3]}
+                            for region in self.extra_regions],
                 'timestamp': time.time()
             }
             
@@ -607,6 +943,8 @@ class ScreenSelector:
     def on_closing(self):
         """Pencere kapatılırken çağrılır"""
         self.stop_auto_capture()
+        if self.card_detector is not None:
+            self.card_detector.shutdown()
         self.root.destroy()
             
     def run(self):
@@ -614,5 +952,8 @@ class ScreenSelector:
         self.root.mainloop()
 
 if __name__ == "__main__":
-    app = ScreenSelector()
+    # Paketlenmiş exe'de süreç arka ucunun worker'ları için gerekli
+    multiprocessing.freeze_support()
+    # --eager-startup: her şeyi pencere açılmadan önce hazırla (karşılaştırma için)
+    app = ScreenSelector(deferred_startup="--eager-startup" not in sys.argv)
     app.run() 
\ No newline at end of file
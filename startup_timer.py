@@ -0,0 +1,34 @@
+import threading
+import time
+
+
+class StartupTimer:
+    """Açılış adımlarının süresini ölçen basit zaman çizelgesi.
+
+    Her adım süreç başlangıcına göre geçen süreyle ve çağıran thread'in
+    adıyla kaydedilir; arka planda yapılan hazırlıklar da aynı raporda görünür.
+    """
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []  # (adım, başlangıçtan beri geçen süre, thread adı)
+        self.lock = threading.Lock()
+        self.reported = False
+
+    def mark(self, label):
+        """Adımın tamamlandığını kaydet"""
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            self.marks.append((label, elapsed, threading.current_thread().name))
+        return elapsed
+
+    def report(self):
+        """Kaydedilen adımları süre sırasıyla rapor metni olarak döndür"""
+        with self.lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+        lines = ["⏱️ Açılış zaman raporu:"]
+        previous = 0.0
+        for label, elapsed, thread_name in marks:
+            lines.append(f"  {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:7.1f} ms)  [{thread_name}] {label}")
+            previous = elapsed
+        return "\n".join(lines)
@@ -0,0 +1,174 @@
+import os
+
+import cv2
+import numpy as np
+
+BACKGROUNDS = ("felt", "gradient", "texture", "dark")
+
+
+def make_background(size, kind, rng, noise=20):
+    """Masa arka planı üret.
+
+    felt: gürültülü yeşil çuha, gradient: yatay renk geçişi,
+    texture: rastgele renkli bloklar, dark: koyu gri (gece teması).
+    """
+    height, width = size
+    background = np.empty((height, width, 3), np.int16)
+    if kind == "felt":
+        background[:] = (40, 110, 30)
+    elif kind == "gradient":
+        ramp = np.linspace(0, 1, width)[None, :, None]
+        background[:] = (np.array([120, 40, 20]) * (1 - ramp) + np.array([30, 120, 160]) * ramp).astype(np.int16)
+    elif kind == "texture":
+        block = 16
+        colors = rng.integers(20, 180, (-(-height // block), -(-width // block), 3), dtype=np.int16)
+        background[:] = np.repeat(np.repeat(colors, block, axis=0), block, axis=1)[:height, :width]
+    elif kind == "dark":
+        background[:] = (35, 35, 35)
+    else:
+        raise ValueError(f"Bilinmeyen arka plan: {kind}")
+    if noise:
+        background += rng.integers(-noise, noise, background.shape, dtype=np.int16)
+    return np.clip(background, 0, 255).astype(np.uint8)
+
+
+def load_templates(cards_folder):
+    """Kart adı -> BGR şablon"""
+    templates = {}
+    for filename in sorted(os.listdir(cards_folder)):
+        if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+            template = cv2.imread(os.path.join(cards_folder, filename), cv2.IMREAD_COLOR)
+            if template is not None:
+                templates[os.path.splitext(filename)[0]] = template
+    if not templates:
+        raise ValueError(f"{cards_folder} klasöründe kart şablonu bulunamadı")
+    return templates
+
+
+def compose_scene(templates, rng, size, card_count, background="felt", overlap_probability=0.3, noise=20):
+    """Bilinen konumlara kart yerleştirilmiş tek bir sahne oluştur.
+
+    overlap_probability olasılıkla kart, masadaki bir kartın üstüne kısmen
+    binecek şekilde yerleştirilir. (frame, gerçek değerler) döndürür;
+    gerçek değerler {'name', 'location', 'fully_visible'} sözlükleridir.
+    Sonradan konan kartlar öncekilerin üstünü kapatır.
+    """
+    height, width = size
+    frame = make_background(size, background, rng, noise)
+    names = list(templates)
+    chosen = [names[i] for i in rng.choice(len(names), size=min(card_count, len(names)), replace=False)]
+    owner = np.full((height, width), -1, np.int32)  # Her pikselde en üstteki kartın sırası
+    placed = []
+    for index, card_name in enumerate(chosen):
+        template = templates[card_name]
+        t_height, t_width = template.shape[:2]
+        if t_height > height or t_width > width:
+            continue
+        position = None
+        if placed and rng.random() < overlap_probability:
+            # Masadaki bir kartın köşesine yakın, kısmen üstüne binen konum
+            _, (bx, by) = placed[int(rng.integers(len(placed)))]
+            x = int(np.clip(bx + rng.integers(-t_width // 2, t_width // 2 + 1), 0, width - t_width))
+            y = int(np.clip(by + rng.integers(-t_height // 2, t_height // 2 + 1), 0, height - t_height))
+            position = (x, y)
+        else:
+            for _ in range(50):
+                x = int(rng.integers(0, width - t_width + 1))
+                y = int(rng.integers(0, height - t_height + 1))
+                if (owner[y:y + t_height, x:x + t_width] < 0).all():
+                    position = (x, y)
+                    break
+        if position is None:
+            continue
+        x, y = position
+        frame[y:y + t_height, x:x + t_width] = template
+        owner[y:y + t_height, x:x + t_width] = index
+        placed.append((card_name, position))
+
+    truth = []
+    for card_name, (x, y) in placed:
+        t_height, t_width = templates[card_name].shape[:2]
+        truth.append({
+            'name': card_name,
+            'location': (x, y),
+            'fully_visible': bool((owner[y:y + t_height, x:x + t_width] == chosen.index(card_name)).all())
+        })
+    return frame, truth
+
+
+class SyntheticSceneSource:
+    """Ekran ve oyun gerektirmeden sentetik masa frame'leri üreten kaynak.
+
+    CROPPEDCARDS şablonları gürültülü yeşil bir masa arka planına birbirine
+    değmeyecek şekilde yerleştirilir. Sahne oyun gibi ilerler: çoğu frame
+    bir öncekiyle aynıdır, arada masaya yeni kart açılır, masa dolunca
+    kartlar toplanır. Deste bitince yeni oyun başlar. Her frame'le birlikte
+    görünen kartların adları ve konumları (gerçek değer) döndürülür.
+    """
+
+    def __init__(self, cards_folder="CROPPEDCARDS", size=(137, 298), change_probability=0.3,
+                 max_table_cards=4, noise=20, seed=0):
+        self.cards_folder = cards_folder
+        self.size = size  # (yükseklik, genişlik)
+        self.change_probability = change_probability  # Bir frame'de masanın değişme olasılığı
+        self.max_table_cards = max_table_cards
+        self.rng = np.random.default_rng(seed)
+        self.templates = load_templates(cards_folder)
+        self.background = make_background(size, "felt", self.rng, noise)
+        self.deck = []
+        self.table = []  # (kart adı, (x, y))
+        self.games = 0
+        self.frame = None
+
+    def new_game(self):
+        """Desteyi karıştır ve masayı temizle"""
+        self.deck = list(self.templates)
+        self.rng.shuffle(self.deck)
+        self.table = []
+        self.games += 1
+
+    def free_position(self, template_shape, attempts=50):
+        """Masadaki kartlarla çakışmayan rastgele bir konum bul"""
+        height, width = self.size
+        t_height, t_width = template_shape[:2]
+        for _ in range(attempts):
+            x = int(self.rng.integers(0, width - t_width + 1))
+            y = int(self.rng.integers(0, height - t_height + 1))
+            if all(abs(x - tx) >= t_width or abs(y - ty) >= t_height for _, (tx, ty) in self.table):
+                return x, y
+        return None
+
+    def step(self):
+        """Sahneyi bir adım ilerlet; masa değiştiyse True döndür"""
+        if not self.deck and not self.table:
+            self.new_game()
+        if self.frame is not None and self.rng.random() >= self.change_probability:
+            return False
+
+        if len(self.table) >= self.max_table_cards or not self.deck:
+            # Masadaki kartlar toplanır
+            self.table = []
+            return True
+
+        card_name = self.deck.pop()
+        position = self.free_position(self.templates[card_name].shape)
+        if position is None:
+            self.table = []
+            position = self.free_position(self.templates[card_name].shape)
+        self.table.append((card_name, position))
+        return True
+
+    def render(self):
+        """Masanın şu anki görüntüsünü oluştur"""
+        frame = self.background.copy()
+        for card_name, (x, y) in self.table:
+            template = self.templates[card_name]
+            frame[y:y + template.shape[0], x:x + template.shape[1]] = template
+        return frame
+
+    def frames(self, count):
+        """count adet (frame, görünen kartlar) üret; masa değişmediyse aynı frame tekrar döner"""
+        for _ in range(count):
+            if self.step() or self.frame is None:
+                self.frame = self.render()
+            yield self.frame, list(self.table)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import mmap
+import os
+
+import cv2
+import numpy as np
+
+from descriptor_index import DescriptorIndex
+from glyph_matcher import ink_map
+
+BANK_MAGIC = b"KSBANK01"
+BANK_VERSION = 1
+ALIGNMENT = 64  # Her dizi 64 bayt hizalı başlar
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def build_pyramid(image, levels):
+    """Görüntüyü her seviyede yarıya küçülterek pyramid oluştur (seviye 0 = orijinal)"""
+    pyramid = [image]
+    for _ in range(levels):
+        height, width = pyramid[-1].shape[:2]
+        new_width, new_height = width // 2, height // 2
+        if new_width < 1 or new_height < 1:
+            break
+        pyramid.append(cv2.resize(pyramid[-1], (new_width, new_height), interpolation=cv2.INTER_AREA))
+    return pyramid
+
+
+def scale_image(image, scale):
+    """Görüntüyü ölçekle (küçültmede INTER_AREA, büyütmede INTER_LINEAR)"""
+    if scale == 1.0:
+        return image
+    height, width = image.shape[:2]
+    size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    return cv2.resize(image, size, interpolation=interpolation)
+
+
+def scaled_bank_path(path, scale):
+    """Ölçeğe özel banka dosyası: template_bank.bin -> template_bank_x1.250.bin (1.0 için aynı yol)"""
+    if scale == 1.0:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}_x{scale:.3f}{extension}"
+
+
+def _file_hash(path):
+    """Dosyanın SHA-1 özetini hesapla"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_manifest(cards_folder, hashes=True):
+    """Kaynak görüntülerin dosya adı -> {mtime, size, sha1} listesini çıkar"""
+    manifest = {}
+    for filename in os.listdir(cards_folder):
+        if filename.lower().endswith(IMAGE_EXTENSIONS):
+            path = os.path.join(cards_folder, filename)
+            stat = os.stat(path)
+            entry = {'mtime': stat.st_mtime, 'size': stat.st_size}
+            if hashes:
+                entry['sha1'] = _file_hash(path)
+            manifest[filename] = entry
+    return manifest
+
+
+class TemplateBank:
+    """Tüm şablonları ve türetilmiş verileri tek bir dosyada tutan derlenmiş banka.
+
+    Dosya yapısı: sihirli bayt + başlık uzunluğu + veri başlangıcı + JSON
+    başlık + hizalı ham diziler (ofsetler veri başlangıcına göredir). Dosya
+    salt okunur olarak mmap edilir; diziler kopyalanmadan NumPy görünümü
+    olarak açılır, böylece birden fazla detektör süreci işletim sisteminin
+    sayfa önbelleğindeki tek kopyayı paylaşır.
+    """
+
+    def __init__(self, path, header, memory, data_start):
+        self.path = path
+        self.header = header
+        self.memory = memory
+        self.data_start = data_start
+        self.card_names = header['card_names']
+        self.params = header['params']
+
+    @classmethod
+    def open(cls, path):
+        """Bankayı mmap ile aç; dosya yoksa veya bozuksa None döndür"""
+        try:
+            with open(path, 'rb') as f:
+                memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if memory[:len(BANK_MAGIC)] != BANK_MAGIC:
+                memory.close()
+                return None
+            fields = len(BANK_MAGIC)
+            header_length = int.from_bytes(memory[fields:fields + 8], 'little')
+            data_start = int.from_bytes(memory[fields + 8:fields + 16], 'little')
+            header_start = fields + 16
+            header = json.loads(memory[header_start:header_start + header_length].decode('utf-8'))
+            if header.get('version') != BANK_VERSION:
+                memory.close()
+                return None
+            return cls(path, header, memory, data_start)
+        except (OSError, ValueError):
+            return None
+
+    def array(self, key):
+        """Bankadaki bir diziyi kopyasız, salt okunur görünüm olarak döndür"""
+        info = self.header['arrays'][key]
+        dtype = np.dtype(info['dtype'])
+        count = int(np.prod(info['shape']))
+        offset = self.data_start + info['offset']
+        return np.frombuffer(self.memory, dtype=dtype, count=count, offset=offset).reshape(info['shape'])
+
+    def templates(self):
+        """Kart adı -> şablon"""
+        return {name: self.array(f"template/{name}") for name in self.card_names}
+
+    def pyramids(self):
+        """Kart adı -> [tam boyut, 1/2, 1/4, ...]"""
+        levels = self.params['pyramid_levels']
+        pyramids = {}
+        for name in self.card_names:
+            pyramid = []
+            for level in range(levels + 1):
+                key = f"pyramid/{name}/{level}"
+                if key not in self.header['arrays']:
+                    break
+                pyramid.append(self.array(key))
+            pyramids[name] = pyramid
+        return pyramids
+
+    def ink_maps(self):
+        """Kart adı -> tek kanallı mürekkep haritası (glif modu için)"""
+        return {name: self.array(f"ink/{name}") for name in self.card_names}
+
+    def descriptors(self):
+        """Tanımlayıcı matrisi (satırlar card_names sırasında)"""
+        return self.array("descriptors")
+
+    def is_fresh(self, cards_folder, params):
+        """Banka kaynak dosyalarla ve parametrelerle uyumlu mu?
+
+        Önce mtime ve boyut karşılaştırılır; farklı olan dosyalar için içerik
+        özeti kontrol edilir (sadece dokunulmuş ama değişmemiş dosyalar
+        yeniden derleme gerektirmez).
+        """
+        if self.params != params:
+            return False
+        stored = self.header['sources']
+        current = source_manifest(cards_folder, hashes=False)
+        if set(stored) != set(current):
+            return False
+        for filename, entry in current.items():
+            saved = stored[filename]
+            if saved['mtime'] == entry['mtime'] and saved['size'] == entry['size']:
+                continue
+            if _file_hash(os.path.join(cards_folder, filename)) != saved['sha1']:
+                return False
+        return True
+
+    def close(self):
+        """mmap'i kapat (bankadan alınan görünümler artık kullanılmamalı)"""
+        try:
+            self.memory.close()
+        except BufferError:
+            # Hâlâ kullanılan görünümler varsa kapatma, çöp toplayıcı halleder
+            pass
+
+    @staticmethod
+    def build(path, cards_folder, params):
+        """Kaynak görüntülerden bankayı derle ve dosyaya atomik olarak yaz.
+
+        params'ta 'scale' varsa şablonlar (ve türetilen her şey) o ölçekte derlenir.
+        """
+        manifest = source_manifest(cards_folder)
+        scale = params.get('scale', 1.0)
+        arrays = {}
+        card_names = []
+        templates = {}
+        for filename in manifest:
+            template = cv2.imread(os.path.join(cards_folder, filename), cv2.IMREAD_COLOR)
+            if template is None:
+                continue
+            template = scale_image(template, scale)
+            card_name = os.path.splitext(filename)[0]
+            card_names.append(card_name)
+            templates[card_name] = template
+            arrays[f"template/{card_name}"] = template
+            for level, image in enumerate(build_pyramid(template, params['pyramid_levels'])):
+                arrays[f"pyramid/{card_name}/{level}"] = image
+            arrays[f"ink/{card_name}"] = np.ascontiguousarray(ink_map(template))
+
+        if templates:
+            index = DescriptorIndex(templates, tuple(params['descriptor_size']))
+            arrays["descriptors"] = index.descriptors
+
+        # Dizilerin yerleşimini hesapla
+        layout = {}
+        offset = 0
+        for key, array in arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout[key] = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+            offset += array.nbytes
+
+        header = {
+            'version': BANK_VERSION,
+            'params': params,
+            'card_names': card_names,
+            'sources': manifest,
+            'arrays': layout
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        prefix_length = len(BANK_MAGIC) + 16 + len(header_bytes)
+        data_start = -(-prefix_length // ALIGNMENT) * ALIGNMENT
+
+        temp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(BANK_MAGIC)
+                f.write(len(header_bytes).to_bytes(8, 'little'))
+                f.write(data_start.to_bytes(8, 'little'))
+                f.write(header_bytes)
+                for key, array in arrays.items():
+                    f.write(b'\0' * (data_start + layout[key]['offset'] - f.tell()))
+                    f.write(np.ascontiguousarray(array).tobytes())
+            # Başka bir süreç eski bankayı açık tutuyorsa (Windows) burada hata alınır
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def load_or_build(path, cards_folder, params, logger=None):
+    """Banka güncelse aç, değilse yeniden derleyip aç"""
+    bank = TemplateBank.open(path)
+    if bank is not None and bank.is_fresh(cards_folder, params):
+        return bank, False
+    if bank is not None:
+        bank.close()
+        if logger:
+            logger.info("Şablon bankası güncel değil, yeniden derleniyor")
+    try:
+        TemplateBank.build(path, cards_folder, params)
+    except OSError as e:
+        if logger:
+            logger.warning(f"Şablon bankası yazılamadı: {str(e)}")
+        return None, False
+    return TemplateBank.open(path), True
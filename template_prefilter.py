@@ -0,0 +1,55 @@
+import numpy as np
+
+from color_space import INK_THRESHOLD, RED_MARGIN
+
+# Bölge tarafı gevşek sayılır: yakalama renk/parlaklık kayması bir pikseli sayımdan düşürmesin.
+# Siyah sayımdan sadece belirgin kırmızılar çıkarılır; şablonda siyah sayılan kenar pikselleri
+# bölgede de siyah sayılır (bölge sayımı, şablon sayımının üst kümesi kalır)
+LOOSE_INK_THRESHOLD = INK_THRESHOLD // 3
+LOOSE_RED_MARGIN = RED_MARGIN // 3
+LOOSE_BLACK_RED_LIMIT = RED_MARGIN * 2
+# Filtrenin muhafazakâr kaldığı en düşük eşleşme eşiği. Daha düşük eşikte (ör. ölçeklenmiş
+# bankanın 0.9'u) soluk/bulanık bir kart mürekkep sayımının altında kalıp yine eşleşebilir
+MIN_MATCH_THRESHOLD = 0.99
+
+
+def ink_counts(image, ink_threshold=INK_THRESHOLD, red_margin=RED_MARGIN, black_red_limit=RED_MARGIN):
+    """(kırmızı mürekkep, siyah mürekkep) piksel sayıları.
+
+    Kırmızı: R, G ve B'den red_margin kadar büyük. Siyah: en koyu kanalı
+    ink_threshold kadar koyu ve R'si G ile B'yi en fazla black_red_limit aşan piksel.
+    """
+    image = image.astype(np.int16)
+    redness = image[:, :, 2] - np.maximum(image[:, :, 0], image[:, :, 1])
+    red = redness > red_margin
+    black = (image.min(axis=2) < 255 - ink_threshold) & (redness <= black_red_limit)
+    return int(red.sum()), int(black.sum())
+
+
+class TemplatePrefilter:
+    """matchTemplate'ten önce bölgede eşleşmesi imkânsız şablonları eleyen ucuz ön filtre.
+
+    Her şablonun kırmızı ve siyah mürekkep piksel sayısı yüklemede bir kez
+    hesaplanır. Bir şablonun bir konumda ~0.99 skorla eşleşmesi, o konumdaki
+    pencerenin şablonla neredeyse aynı olması demektir; pencere bölgenin
+    içinde olduğuna göre bölge de en az o kadar kırmızı ve siyah mürekkep
+    içermelidir. Bölge gevşek eşiklerle sayılır ve şablon sayımının sadece
+    min_fraction kadarı istenir; böylece filtre sadece kesin olarak
+    eşleşemeyecek şablonları eler (ör. hiç kırmızı içermeyen bir bölgede
+    kupa/karo şablonları). Bu gerekçe sadece MIN_MATCH_THRESHOLD ve üstündeki
+    eşiklerde geçerlidir. Kaynak görüntüler köşe indeksleri olduğu için
+    resimli kart ayrımı yapılmaz; renk tek ayırt edici özettir.
+    """
+
+    def __init__(self, color_templates, min_fraction=0.5):
+        self.min_fraction = min_fraction
+        self.card_names = list(color_templates)
+        # Şablon başına gerekli (kırmızı, siyah) piksel sayıları
+        counts = np.array([ink_counts(color_templates[name]) for name in self.card_names], dtype=np.float64)
+        self.required = counts * min_fraction
+
+    def prune(self, image):
+        """BGR bölgede eşleşemeyecek şablonların kümesi"""
+        red, black = ink_counts(image, LOOSE_INK_THRESHOLD, LOOSE_RED_MARGIN, LOOSE_BLACK_RED_LIMIT)
+        impossible = (self.required[:, 0] > red) | (self.required[:, 1] > black)
+        return frozenset(name for name, pruned in zip(self.card_names, impossible) if pruned)
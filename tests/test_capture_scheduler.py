@@ -0,0 +1,24 @@
+from capture_scheduler import CaptureScheduler
+
+
+def test_idle_backoff_stops_at_idle_interval():
+    scheduler = CaptureScheduler(cpu_count=1)
+    for _ in range(50):
+        scheduler.observe(False, 0.001)
+    # Eski sabit 100 ms'den daha seyrek yakalanmalı
+    assert scheduler.idle_interval > 0.1
+    assert scheduler.interval == scheduler.idle_interval
+
+
+def test_change_returns_to_sustainable_interval():
+    scheduler = CaptureScheduler(cpu_count=1)
+    for _ in range(50):
+        scheduler.observe(False, 0.001)
+    scheduler.observe(True, 0.001)
+    assert scheduler.interval == scheduler.min_interval
+
+
+def test_interval_waits_for_slow_detection():
+    scheduler = CaptureScheduler(cpu_count=1)
+    scheduler.observe(True, 0.05)
+    assert scheduler.interval == 0.05
@@ -0,0 +1,24 @@
+import os
+
+from card_detector import CardDetector
+from synthetic_scenes import SyntheticSceneSource
+
+CARDS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "CROPPEDCARDS")
+
+
+def stream_detections(color_mode, frame_count=15):
+    """seed=0 akışında frame başına raporlanan kart adları"""
+    card_detector = CardDetector(cards_folder=CARDS_FOLDER, template_bank_path=None, color_mode=color_mode)
+    source = SyntheticSceneSource(cards_folder=CARDS_FOLDER, seed=0)
+    try:
+        return [sorted(card['name'] for card in card_detector.detect_cards(frame))
+                for frame, _ in source.frames(frame_count)]
+    finally:
+        card_detector.shutdown()
+
+
+def test_gray_mode_reports_cards_on_the_same_frames_as_bgr():
+    """Değişiklik kontrolü BGR'de yapılır; gri dönüşüm yeni kartı içeren frame'i atlatmamalı"""
+    bgr = stream_detections("bgr")
+    assert "Hearts Eight" in bgr[4] and "Diamonds Six" in bgr[10]
+    assert stream_detections("gray") == bgr
@@ -0,0 +1,23 @@
+import os
+
+from card_detector import CardDetector
+from synthetic_scenes import SyntheticSceneSource
+
+CARDS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "CROPPEDCARDS")
+
+
+def test_hot_zone_scan_falls_back_when_zones_hold_only_known_cards(tmp_path):
+    """Önbellekteki bölgeler bilinen kartları gösterse de yeni kart tam taramayla bulunmalı"""
+    card_detector = CardDetector(cards_folder=CARDS_FOLDER, template_bank_path=None,
+                                 hot_zones_path=str(tmp_path / "hot_zones.json"))
+    source = SyntheticSceneSource(cards_folder=CARDS_FOLDER, seed=0)
+    shown = set()
+    reported = set()
+    try:
+        for frame, table in source.frames(40):
+            shown.update(name for name, _ in table)
+            reported.update(card['name'] for card in card_detector.detect_cards(frame))
+    finally:
+        card_detector.shutdown()
+    assert {"Clubs Nine", "Hearts Jack"} <= shown
+    assert reported == shown
@@ -0,0 +1,20 @@
+import numpy as np
+
+from patch_cache import PatchCache
+
+
+def test_complete_entry_drops_cards_detected_since():
+    cache = PatchCache()
+    key = cache.fingerprint(np.zeros((10, 10, 3), dtype=np.uint8))
+    peaks = [("Clubs Ace", 0.995, (1, 2)), ("Hearts Two", 0.993, (5, 6))]
+    cache.put(key, peaks, frozenset())
+    assert cache.get(key, frozenset()) == peaks
+    assert cache.get(key, frozenset({"Clubs Ace"})) == [("Hearts Two", 0.993, (5, 6))]
+
+
+def test_incomplete_entry_needs_the_same_skip_set():
+    cache = PatchCache()
+    key = cache.fingerprint(np.zeros((10, 10, 3), dtype=np.uint8))
+    cache.put(key, [("Clubs Ace", 0.995, (1, 2))], frozenset(), complete=False)
+    assert cache.get(key, frozenset({"Hearts Two"})) is None
+    assert cache.get(key, frozenset()) == [("Clubs Ace", 0.995, (1, 2))]
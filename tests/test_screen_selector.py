@@ -0,0 +1,56 @@
+import json
+
+from screen_selector import ScreenSelector
+
+
+class HeadlessSelector(ScreenSelector):
+    """Tk penceresi olmadan kayıt yükleme/kaydetme yolunu çalıştıran ScreenSelector"""
+
+    def __init__(self, settings_file):
+        self.settings_file = settings_file
+        self.main_region_name = "Masa 1"
+        self.extra_regions = []
+        self.capture_pipeline = None
+        self.card_detector = None
+        self.template_scale = 1.0
+        self.match_threshold = 0.99
+
+    def add_region(self, name, coords):
+        self.extra_regions.append({'name': name, 'coords': tuple(coords), 'detector': None,
+                                   'display': None, 'frame': None})
+
+    def remove_region(self, name, save=True):
+        self.extra_regions = [region for region in self.extra_regions if region['name'] != name]
+        if save:
+            self.save_selected_area(*self.selection_coords)
+
+
+def saved_region_names(path):
+    with open(path) as f:
+        return [region['name'] for region in json.load(f).get('regions', [])]
+
+
+def test_saved_regions_survive_repeated_loads(tmp_path):
+    settings_file = str(tmp_path / "selected_area.json")
+    selector = HeadlessSelector(settings_file)
+    selector.update_selection_info(0, 0, 300, 140)
+    selector.add_region("Masa 2", (400, 0, 700, 140))
+    selector.save_selected_area(*selector.selection_coords)
+
+    for _ in range(2):
+        selector = HeadlessSelector(settings_file)
+        selector.load_saved_area()
+        assert selector.selection_coords == (0, 0, 300, 140)
+        assert [region['name'] for region in selector.extra_regions] == ["Masa 2"]
+        assert selector.extra_regions[0]['coords'] == (400, 0, 700, 140)
+        assert saved_region_names(settings_file) == ["Masa 2"]
+
+
+def test_old_settings_load_as_single_table(tmp_path):
+    settings_file = tmp_path / "selected_area.json"
+    settings_file.write_text(json.dumps({'x1': 1, 'y1': 2, 'x2': 301, 'y2': 142, 'timestamp': 0}))
+    selector = HeadlessSelector(str(settings_file))
+    selector.load_saved_area()
+    assert selector.selection_coords == (1, 2, 301, 142)
+    assert selector.extra_regions == []
+    assert selector.template_scale == 1.0
@@ -0,0 +1,105 @@
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from card_detector import CardDetector
+from template_prefilter import TemplatePrefilter
+
+CARDS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "CROPPEDCARDS")
+
+
+def load_crops():
+    crops = {}
+    for filename in sorted(os.listdir(CARDS_FOLDER)):
+        if filename.lower().endswith('.png'):
+            crops[os.path.splitext(filename)[0]] = cv2.imread(os.path.join(CARDS_FOLDER, filename), cv2.IMREAD_COLOR)
+    return crops
+
+
+CROPS = load_crops()
+PREFILTER = TemplatePrefilter(CROPS)
+
+
+def adjust(image, gain, offset):
+    return np.clip(image.astype(np.float32) * gain + offset, 0, 255).astype(np.uint8)
+
+
+def test_all_crops_loaded():
+    assert len(CROPS) == 52
+
+
+@pytest.mark.parametrize("gain,offset", [(1.0, 0), (0.85, 0), (1.15, 0), (1.0, -20), (1.0, 20), (0.9, 15)])
+def test_prefilter_never_prunes_own_template(gain, offset):
+    """Kartın kendi kesiti (parlaklık/kontrast kaymasıyla da) kendi şablonunu elememeli"""
+    for name, crop in CROPS.items():
+        assert name not in PREFILTER.prune(adjust(crop, gain, offset)), name
+
+
+def test_prefilter_never_prunes_own_template_inside_larger_region():
+    for name, crop in CROPS.items():
+        h, w = crop.shape[:2]
+        region = np.full((h * 3, w * 3, 3), 255, dtype=np.uint8)
+        region[h:2 * h, w:2 * w] = crop
+        assert name not in PREFILTER.prune(region), name
+
+
+def test_prefilter_prunes_red_templates_on_black_only_region():
+    region = np.full((60, 40, 3), 255, dtype=np.uint8)
+    region[10:40, 10:30] = 0
+    pruned = PREFILTER.prune(region)
+    assert all(name in pruned for name in CROPS if name.startswith(("Hearts", "Diamonds")))
+
+
+@pytest.mark.parametrize("thread_count", [1, 3, 5, 8, 10, 12])
+def test_split_card_names_is_balanced(thread_count):
+    detector = SimpleNamespace(card_templates=CROPS)
+    slices = CardDetector.split_card_names(detector, thread_count)
+    sizes = [len(names) for names in slices]
+    assert len(slices) == thread_count
+    assert max(sizes) - min(sizes) <= 1
+    assert sorted(name for names in slices for name in names) == sorted(CROPS)
+
+
+def test_split_card_names_skips_excluded():
+    detector = SimpleNamespace(card_templates=CROPS)
+    excluded = frozenset(name for name in CROPS if name.startswith("Hearts"))
+    slices = CardDetector.split_card_names(detector, 4, excluded)
+    names = [name for names in slices for name in names]
+    assert len(names) == 52 - len(excluded)
+    assert not excluded.intersection(names)
+
+
+def faded_region(crop):
+    """Düşük kontrastlı ve bulanık kart: kendi şablonuyla ~0.97 skorlar ama mürekkebi azdır"""
+    h, w = crop.shape[:2]
+    region = np.full((h * 3, w * 3, 3), 255, dtype=np.uint8)
+    region[h:2 * h, w:2 * w] = cv2.addWeighted(crop, 0.1, np.full_like(crop, 255), 0.9, 0)
+    return cv2.GaussianBlur(region, (3, 3), 0)
+
+
+def test_prefilter_is_disabled_below_099_threshold():
+    strict = CardDetector(cards_folder=CARDS_FOLDER, template_bank_path=None)
+    relaxed = CardDetector(cards_folder=CARDS_FOLDER, template_bank_path=None, match_threshold=0.9)
+    try:
+        assert strict.prefilter is not None
+        assert relaxed.prefilter is None
+    finally:
+        strict.shutdown()
+        relaxed.shutdown()
+
+
+def test_faded_card_is_found_at_090_threshold():
+    region = faded_region(CROPS["Clubs Jack"])
+    score = cv2.matchTemplate(region, CROPS["Clubs Jack"], cv2.TM_CCOEFF_NORMED).max()
+    assert 0.9 <= score < 0.99
+    # Filtre açık olsaydı bu kart elenirdi
+    assert "Clubs Jack" in PREFILTER.prune(region)
+
+    card_detector = CardDetector(cards_folder=CARDS_FOLDER, template_bank_path=None, match_threshold=0.9)
+    try:
+        assert "Clubs Jack" in {card['name'] for card in card_detector.detect_cards(region)}
+    finally:
+        card_detector.shutdown()
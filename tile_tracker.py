@@ -0,0 +1,60 @@
+import cv2
+import numpy as np
+
+
+class TileChangeTracker:
+    """Frame'i karolara bölüp her karonun önceki frame'e göre değişimini izler.
+
+    Fark tüm kanallarda ölçülür; bir karonun herhangi bir kanalındaki
+    ortalama fark eşiği geçerse karo kirli sayılır. Bitişik kirli karolar
+    tek bir dikdörtgende birleştirilir.
+    """
+
+    def __init__(self, tile_size=32, change_threshold=5.0):
+        self.tile_size = tile_size
+        self.change_threshold = change_threshold
+
+    def tile_means(self, frame, reference):
+        """Her karo için kanal bazında ortalama mutlak farkı döndür (karo_y, karo_x, kanal)"""
+        diff = cv2.absdiff(frame, reference)
+        if diff.ndim == 2:
+            diff = diff[:, :, None]
+        height, width = diff.shape[:2]
+        row_starts = np.arange(0, height, self.tile_size)
+        col_starts = np.arange(0, width, self.tile_size)
+
+        sums = np.add.reduceat(np.add.reduceat(diff.astype(np.float32), row_starts, axis=0), col_starts, axis=1)
+        row_sizes = np.diff(np.append(row_starts, height))
+        col_sizes = np.diff(np.append(col_starts, width))
+        counts = row_sizes[:, None, None] * col_sizes[None, :, None]
+        return sums / counts
+
+    def dirty_mask(self, frame, reference):
+        """Kirli karoların maskesini döndür; boyutlar farklıysa None"""
+        if reference is None or frame.shape != reference.shape:
+            return None
+        return self.tile_means(frame, reference).max(axis=2) >= self.change_threshold
+
+    def dirty_rects(self, frame, reference):
+        """Kirli karo gruplarını frame koordinatlarında (x0, y0, x1, y1) olarak döndür.
+
+        Boyutlar farklıysa (karşılaştırma yapılamazsa) None döner.
+        """
+        mask = self.dirty_mask(frame, reference)
+        if mask is None:
+            return None
+        if not mask.any():
+            return []
+
+        height, width = frame.shape[:2]
+        count, labels, stats, centroids = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+        rects = []
+        for label in range(1, count):
+            tx, ty, tw, th = stats[label][:4]
+            rects.append((
+                int(tx * self.tile_size),
+                int(ty * self.tile_size),
+                int(min((tx + tw) * self.tile_size, width)),
+                int(min((ty + th) * self.tile_size, height))
+            ))
+        return rects